@@ -14,6 +14,12 @@ Example:
 'spam'
 """
 
+import contextlib
+import errno
+import io
+import json
+import os
+import shutil
 import tempfile
 
 import pyte
@@ -21,12 +27,32 @@ import pyte
 from . import (
     process,
     arguments,
-    runtimepath,
+    keys,
+    messages,
+    screen,
+    stats,
 )
 from ._version import * # flake8: noqa
+from .arguments import quote
+from .keys import KeyMacro
+from .messages import VimError
+from .stats import Stats
+from .timeout import AdaptiveTimeout
+from .trace import Trace
+from .watchdog import LimitExceeded, Watchdog
 
 
-__all__ = ['Vim', 'open']
+__all__ = ['Vim', 'AdaptiveTimeout', 'KeyMacro', 'LimitExceeded', 'Monitor',
+           'Pool', 'Stats', 'Trace', 'VimError', 'Watchdog', 'map_files',
+           'open', 'replay']
+
+
+#: *Vim* script defining functions used by ``Vim``
+FUNCTIONS = os.path.join(os.path.dirname(__file__), 'autoload',
+                         'headlessvim.vim')
+
+# the default deadline of functions called in *Vim* in units of timeout
+_CALL_TIMEOUT_FACTOR = 240
 
 
 def open(**kwargs):
@@ -37,6 +63,39 @@ def open(**kwargs):
     return Vim(**kwargs)
 
 
+# modules not necessary to run Vim are imported when they are used
+def map_files(*args, **kwargs):
+    """
+    Run commands on files by workers. See ``batch.map_files``.
+    """
+    from .batch import map_files
+    return map_files(*args, **kwargs)
+
+
+def replay(*args, **kwargs):
+    """
+    Open a log recorded by ``Vim``. See ``record.replay``.
+    """
+    from .record import replay
+    return replay(*args, **kwargs)
+
+
+def Pool(*args, **kwargs):
+    """
+    A factory function to open new ``pool.Pool`` object.
+    """
+    from .pool import Pool
+    return Pool(*args, **kwargs)
+
+
+def Monitor(*args, **kwargs):
+    """
+    A factory function to open new ``monitor.Monitor`` object.
+    """
+    from .monitor import Monitor
+    return Monitor(*args, **kwargs)
+
+
 class Vim(object):
     """
     A class representing a headless *Vim*.
@@ -55,7 +114,15 @@ class Vim(object):
                  env=None,
                  encoding='utf-8',
                  size=(80, 24),
-                 timeout=0.25):
+                 timeout=0.25,
+                 stats=None,
+                 record=None,
+                 profile='default',
+                 adaptive_timeout=None,
+                 watchdog=None,
+                 monitor=None,
+                 raise_on_error=False,
+                 trace=True):
         """
         :param string executable: command name to execute *Vim*
         :param args: arguments to execute *Vim*
@@ -66,21 +133,89 @@ class Vim(object):
         :param size: (lines, columns) of a screen connected to *Vim*
         :type size: (int, int)
         :param float timeout: seconds to wait I/O
+        :param stats: ``True`` or ``Stats`` object to record counters
+        :type stats: None or boolean or Stats
+        :param record: path or binary file-like object to record
+                       the byte stream, see ``replay``
+        :type record: None or string or file-like object
+        :param string profile: name of a launch profile.
+                               ``'lean'`` reduces screen traffic
+                               for command driven sessions
+        :param adaptive_timeout: ``True`` or ``AdaptiveTimeout`` object
+                                 to learn timeouts bounded by ``timeout``
+        :type adaptive_timeout: None or boolean or AdaptiveTimeout
+        :param watchdog: ``True`` or ``Watchdog`` object
+                         to limit operations and resources
+        :type watchdog: None or boolean or Watchdog
+        :param monitor: ``True`` or ``monitor.Monitor`` object
+                        to sample resource usage of the process
+        :type monitor: None or boolean or monitor.Monitor
+        :param boolean raise_on_error: whether if raise ``VimError``
+                                       when *Vim* reports errors
+                                       during an operation
+        :param trace: ``Trace`` object to record recent operations,
+                      ``False`` to disable
+        :type trace: boolean or Trace
+        :raises ValueError: if ``profile`` is not supported
         """
+        # resources are released by close even if this fails on the way
+        self._process = None
+        self._monitor = None
+        self._events = None
+        self._tempfile = None
+        self._messages = None
+        self._recorder = None
+        profile_args, profile_env = arguments.profile(profile)
         parser = arguments.Parser(self.default_args)
         args = parser.parse(args)
-        self._process = process.Process(executable, args, env)
+        if stats is True:
+            stats = Stats()
+        elif stats is False:
+            stats = None
+        self._stats = stats
+        if trace is True:
+            trace = Trace()
+        elif trace is False:
+            trace = None
+        self._trace = trace
+        self._bytes_read = 0
+        if profile_env:
+            env = dict(os.environ if env is None else env, **profile_env)
+        self._term = (os.environ if env is None else env).get('TERM', 'xterm')
+        if watchdog is True:
+            watchdog = Watchdog()
+        elif watchdog is False:
+            watchdog = None
+        self._watchdog = watchdog
+        self._operation = None
         self._encoding = encoding
-        self._screen = pyte.Screen(*size)
-        self._stream = pyte.Stream()
-        self._stream.attach(self._screen)
         self._timeout = timeout
-        self._tempfile = tempfile.NamedTemporaryFile(mode='r')
+        if adaptive_timeout is True:
+            adaptive_timeout = AdaptiveTimeout(maximum=timeout)
+        elif adaptive_timeout is False:
+            adaptive_timeout = None
+        self._adaptive_timeout = adaptive_timeout
         self._runtimepath = None
-        self.wait()
+        self._initial_runtimepath = None
+        self._guarded = False
+        self._raise_on_error = False
+        try:
+            self._open(executable, args, profile_args, env, size, record)
+        except BaseException:
+            self.close()
+            raise
+        self._raise_on_error = raise_on_error
+        self._checked = self._messages.sequence
+        if monitor is True:
+            monitor = Monitor()
+        elif monitor is False:
+            monitor = None
+        self._monitor = monitor
+        if monitor is not None:
+            monitor.start(self)
 
     def __del__(self):
-        if self.is_alive():
+        if self._process is not None and self.is_alive():
             self.close()
 
     def __enter__(self):
@@ -99,11 +234,45 @@ class Vim(object):
         """
         Disconnect and close *Vim*.
         """
-        self._tempfile.close()
+        if self._monitor is not None:
+            self._monitor.stop()
+        if self._events is not None:
+            self._events.close(uninstall=False)
+        if self._tempfile is not None:
+            self._tempfile.close()
+        if self._messages is not None:
+            self._messages.close()
+        if self._recorder is not None:
+            self._recorder.close()
+        if self._process is None:
+            return
         self._process.terminate()
         if self._process.is_alive():
             self._process.kill()
 
+    def reset(self):
+        """
+        Reset *Vim* to the state as it is opened as far as possible.
+        Extra tab pages and windows are closed, all buffers are wiped out,
+        options are restored, registers and ``v:errmsg`` are cleared,
+        ``events`` stops and runtime path modified by ``install_plugin``
+        is restored.
+
+        .. note:: Variables, functions, commands, mappings, autocommands
+                  and histories defined are kept.
+                  Options of the terminal and the screen size are kept.
+        """
+        if self._trace is not None:
+            self._trace.record('reset')
+        self.set_mode('normal')
+        if self._events is not None:
+            self._events.close()
+        self.command('silent! tabonly! | silent! only! | silent! %bwipeout! | '
+                     'call headlessvim#reset()', False)
+        initial = self._initial_runtimepath
+        if initial is not None and list(self._runtimepath) != initial:
+            self._runtimepath[:] = initial
+
     def is_alive(self):
         """
         Check if the background *Vim* process is alive.
@@ -113,6 +282,141 @@ class Vim(object):
         """
         return self._process.is_alive()
 
+    def events(self, names=None, callback=None):
+        """
+        Start watching events of *Vim* by autocommands.
+        The same stream is returned on subsequent calls.
+
+        :param names: names of autocommand events,
+                      ``events.EVENTS`` is used if None
+        :type names: None or iterable of string
+        :param callback: a function called with each ``events.Event``
+        :return: the stream of events
+        :rtype: events.EventStream
+        """
+        from . import events
+        stream = self._events
+        if stream is None or stream.closed:
+            if names is None:
+                names = events.EVENTS
+            stream = events.EventStream(self, names)
+            stream.install()
+            self._events = stream
+        if callback is not None:
+            stream.subscribe(callback)
+        return stream
+
+    def run_script(self, script, pattern='^Test_', timeout=None):
+        """
+        Source a *Vim* script and run its test functions inside *Vim*
+        by a single command.
+        Tests are interrupted by ``CTRL-C`` if they do not finish in time.
+
+        :param string script: path to a script or source of a script
+        :param string pattern: regular expression of names of test functions
+        :param timeout: seconds to wait all tests,
+                        a multiple of ``self.timeout`` if None
+        :type timeout: None or float
+        :return: results and timings of the tests
+        :rtype: runner.Report
+        :raises RuntimeError: if tests do not finish in time
+        """
+        from . import runner
+        return runner.run(self, script, pattern, timeout)
+
+    def syntax_spans(self, buffer=None, start=1, end='$', translate=False):
+        """
+        Collect syntax highlight groups of lines by a single command.
+
+        :param buffer: buffer number, the current buffer if None
+        :type buffer: None or int
+        :param start: the first line number or a position such as ``'.'``
+        :type start: int or string
+        :param end: the last line number or a position such as ``'$'``
+        :type end: int or string
+        :param boolean translate: whether if translate groups by
+                                  ``synIDtrans``
+        :return: line numbers and spans of the lines
+        :rtype: list of (int, list of syntax.Span)
+        """
+        from . import syntax
+        return syntax.spans(self, buffer, start, end, translate)
+
+    def stream_command(self, command, shell=False):
+        """
+        Run a long-running command and yield lines of its output
+        as they are written. See ``stream.lines``.
+
+        Example:
+
+        >>> import headlessvim
+        >>> with headlessvim.open() as vim:
+        ...     for line in vim.stream_command('seq 1000000', shell=True):
+        ...         if line == '3':
+        ...             break
+        ...     vim.echo('"responsive"')
+        ...
+        'responsive'
+
+        :param string command: an Ex command, or a shell command if ``shell``
+        :param boolean shell: whether if run ``command`` by ``'shell'``
+        :return: a generator of lines, close it to interrupt the command
+        :rtype: generator of string
+        """
+        from . import stream
+        return stream.lines(self, command, shell)
+
+    def state(self, options=None, variables='g:', registers=True,
+              layout=True):
+        """
+        Collect options, variables, registers and the window layout
+        in a single round trip. See ``state.collect``.
+
+        :param options: names of options, the local values are collected
+        :type options: None or list of string
+        :param variables: scopes of variables such as ``'g:'`` or ``'b:'``
+        :type variables: None or string or list of string
+        :param registers: names of registers, ``state.REGISTERS`` if True
+        :type registers: boolean or string
+        :param boolean layout: whether if collect tab pages and windows
+        :return: the editor state
+        :rtype: dict
+        """
+        from . import state
+        return state.collect(self, options, variables, registers, layout)
+
+    def messages(self, since=0):
+        """
+        Messages and errors reported by *Vim*
+        such as ``:echomsg``, ``:echoerr`` and error messages.
+
+        :param int since: sequence number of the last known message
+        :return: messages after ``since``
+        :rtype: list of messages.Message
+        """
+        return self._messages.messages(since)
+
+    def errors(self, since=0):
+        """
+        Errors reported by *Vim*, including ones silenced by ``:silent!``.
+
+        :param int since: sequence number of the last known message
+        :return: errors and exceptions after ``since``
+        :rtype: list of messages.Message
+        """
+        return self._messages.errors(since)
+
+    def resource_usage(self):
+        """
+        Read resource usage of the background *Vim* process from ``/proc``.
+
+        :return: RSS, CPU time and number of open file descriptors
+        :rtype: monitor.Usage
+        :raises EnvironmentError: if ``/proc`` of the process is not readable
+        """
+        from . import monitor
+        return monitor.read_usage(self.pid)
+
     def display(self):
         """
         Shows the terminal screen connecting to *Vim*.
@@ -156,13 +460,98 @@ class Vim(object):
         """
         return self._screen.display
 
+    def screen_row(self, n):
+        """
+        Read a line of the screen without rendering the others.
+
+        :param int n: index of the line, negative index is allowed
+        :return: text of the line
+        :rtype: string
+        :raises IndexError: if ``n`` is out of range
+        """
+        return self._screen.line(n)
+
+    def screen_region(self, top, left, bottom, right):
+        """
+        Read a rectangle of the screen.
+        ``bottom`` and ``right`` are exclusive as slices.
+
+        Example:
+
+        >>> import headlessvim
+        >>> with headlessvim.open() as vim:
+        ...     vim.screen_region(1, 0, 3, 1)
+        ...
+        ['~', '~']
+
+        :param int top: index of the first line
+        :param int left: index of the first column
+        :param int bottom: index of the line after the last
+        :param int right: index of the column after the last
+        :return: text of each line in the rectangle
+        :rtype: list of string
+        """
+        return self._screen.region(top, left, bottom, right)
+
+    def screen_find(self, pattern):
+        """
+        Search a regular expression in each line of the screen.
+
+        :param pattern: a regular expression
+        :type pattern: string or compiled regular expression
+        :return: (line, column, matched text) of each match
+        :rtype: list of (int, int, string)
+        """
+        return self._screen.find(pattern)
+
+    def screen_hash(self):
+        """
+        Calculate a fingerprint of the screen.
+        Only lines changed since the last call are hashed again.
+
+        :return: fingerprint of the screen
+        :rtype: int
+        """
+        return self._screen.fingerprint()
+
+    def screen_line_hashes(self):
+        """
+        Calculate hashes of each line of the screen.
+
+        :return: hash of each line
+        :rtype: list of int
+        """
+        return self._screen.line_hashes()
+
+    def screen_array(self, use_numpy=None):
+        """
+        Export characters, colors and attributes of the screen as arrays.
+        NumPy is used if available, else ``array`` module.
+
+        Example:
+
+        >>> import headlessvim
+        >>> with headlessvim.open() as vim:
+        ...     array = vim.screen_array(use_numpy=False)
+        ...     array.chars[80] == ord('~')
+        ...
+        True
+
+        :param use_numpy: whether if use NumPy, use it if available when None
+        :type use_numpy: None or boolean
+        :return: arrays of the screen
+        :rtype: screen.ScreenArray
+        """
+        return screen.to_array(self._screen, use_numpy)
+
     def send_keys(self, keys, wait=True):
         """
         Send a raw key sequence to *Vim*.
 
         .. note:: *Vim* style key sequence notation (like ``<Esc>``)
                   is not recognized.
-                  Use escaped characters (like ``'\033'``) instead.
+                  Use escaped characters (like ``'\033'``) or ``feed``
+                  instead.
 
         Example:
 
@@ -176,22 +565,52 @@ class Vim(object):
         :param strgin keys: key sequence to send
         :param boolean wait: whether if wait a response
         """
-        self._process.stdin.write(bytearray(keys, self._encoding))
-        self._process.stdin.flush()
-        if wait:
-            self.wait()
+        with stats.measure(self._stats, 'send_keys'):
+            self._write(bytearray(keys, self._encoding), wait)
+
+    def feed(self, notation, wait=True):
+        """
+        Send keys in *Vim* style key notation (like ``<Esc>``) to *Vim*.
+        Special keys are sent as sequences of the terminal of *Vim*.
+
+        Example:
+
+        >>> import headlessvim
+        >>> with headlessvim.open() as vim:
+        ...     vim.feed('ispam<CR>ham<Esc>')
+        ...     vim.feed('<Up>$x')
+        ...     vim.echo('getline(1, 2)')
+        ...
+        "['spa', 'ham']"
+
+        :param notation: key notation or compiled keys
+        :type notation: string or keys.KeyMacro
+        :param boolean wait: whether if wait a response
+        """
+        with stats.measure(self._stats, 'feed'):
+            self._write(self.compile_keys(notation).data, wait)
+
+    def compile_keys(self, notation):
+        """
+        Compile keys in *Vim* style key notation to send repeatedly.
+
+        :param string notation: key notation
+        :return: compiled keys for the terminal of *Vim*
+        :rtype: keys.KeyMacro
+        """
+        return keys.compile(notation, self._term, self._encoding)
 
     def wait(self, timeout=None):
         """
         Wait for response until timeout.
-        If timeout is specified to None, ``self.timeout`` is used.
+        If timeout is specified to None, ``self.timeout`` is used,
+        or timeouts are learned if ``adaptive_timeout`` is enabled.
 
         :param float timeout: seconds to wait I/O
         """
-        if timeout is None:
-            timeout = self._timeout
-        while self._process.check_readable(timeout):
-            self._flush()
+        with stats.measure(self._stats, 'wait'):
+            with self._guard():
+                self._wait(timeout)
 
     def install_plugin(self, dir, entry_script=None):
         """
@@ -232,13 +651,11 @@ class Vim(object):
         :return: the output of the given command
         :rtype: string
         """
-        if capture:
-            self.command('redir! >> {0}'.format(self._tempfile.name), False)
-        self.set_mode('command')
-        self.send_keys('{0}\n'.format(command))
-        if capture:
-            self.command('redir END', False)
-            return self._tempfile.read().strip('\n')
+        if self._trace is not None:
+            self._trace.record('command', text=command)
+        with stats.measure(self._stats, 'command'):
+            with self._guard(responsive=True):
+                return self._command(command, capture)
 
     def echo(self, expr):
         """
@@ -263,7 +680,11 @@ class Vim(object):
         :return: the result of ``:echo`` command
         :rtype: string
         """
-        return self.command('echo {0}'.format(expr))
+        if self._trace is not None:
+            self._trace.record('echo', text=expr)
+        with stats.measure(self._stats, 'echo'):
+            with self._guard(responsive=True):
+                return self._command('echo {0}'.format(expr))
 
     def set_mode(self, mode):
         """
@@ -313,6 +734,22 @@ class Vim(object):
         """
         return self._process.executable
 
+    @property
+    def pid(self):
+        """
+        :return: process id of *Vim*
+        :rtype: int
+        """
+        return self._process.pid
+
+    @property
+    def monitor(self):
+        """
+        :return: sampler of resource usage if enabled
+        :rtype: None or monitor.Monitor
+        """
+        return self._monitor
+
     @property
     def args(self):
         """
@@ -340,11 +777,18 @@ class Vim(object):
     @screen_size.setter
     def screen_size(self, size):
         """
+        The size is also propagated to *Vim*
+        and this waits for *Vim* to redraw the screen.
+
         :param size: (lines, columns) tuple of a screen connected to *Vim*.
         :type size: (int, int)
         """
         if self.screen_size != size:
             self._screen.resize(*self._swap(size))
+            if self._recorder is not None:
+                self._recorder.resize(size)
+            self._process.set_window_size(size)
+            self._wait_redraw()
 
     @property
     def timeout(self):
@@ -361,6 +805,34 @@ class Vim(object):
         """
         self._timeout = timeout
 
+    @property
+    def stats(self):
+        """
+        :return: counters of this object if enabled
+        :rtype: None or Stats
+        """
+        return self._stats
+
+    @property
+    def adaptive_timeout(self):
+        """
+        :return: learned timeouts if enabled
+        :rtype: None or AdaptiveTimeout
+        """
+        return self._adaptive_timeout
+
+    @property
+    def capabilities(self):
+        """
+        Capabilities of the executable probed once and cached
+        by its path and modification time.
+
+        :return: version, features and functions of *Vim*
+        :rtype: capabilities.Capabilities
+        """
+        from . import capabilities
+        return capabilities.detect(self)
+
     @property
     def runtimepath(self):
         """
@@ -368,12 +840,242 @@ class Vim(object):
         :rtype: runtimepath.RuntimePath
         """
         if self._runtimepath is None:
+            from . import runtimepath
             self._runtimepath = runtimepath.RuntimePath(self)
+            self._initial_runtimepath = list(self._runtimepath)
         return self._runtimepath
 
+    @property
+    def trace(self):
+        """
+        :return: recent operations if enabled
+        :rtype: None or trace.Trace
+        """
+        return self._trace
+
+    @property
+    def watchdog(self):
+        """
+        :return: limits of operations and resources if enabled
+        :rtype: None or Watchdog
+        """
+        return self._watchdog
+
+    def _open(self, executable, args, profile_args, env, size, record):
+        if record is not None:
+            from .record import Recorder
+            self._recorder = Recorder(record, size, self._encoding)
+        self._messages = messages.MessageLog(self._encoding)
+        # put them after the program name and before arguments of users,
+        # which may end with '--', in a single --cmd out of 10 at most
+        command = ('execute "source" fnameescape({0}) | '
+                   'call headlessvim#watch_messages({1}) | '
+                   'call headlessvim#watch_options()'.format(
+                       quote(FUNCTIONS), quote(self._messages.path)))
+        args = args[:1] + ['--cmd', command] + profile_args + args[1:]
+        self._tempfile = tempfile.NamedTemporaryFile(mode='r')
+        rlimits = None
+        if self._watchdog is not None:
+            rlimits = self._watchdog.rlimits()
+        self._spawn_args = (executable, args, env, rlimits)
+        self._process = process.Process(executable, args, env, self._stats,
+                                        size, rlimits)
+        if self._trace is not None:
+            self._trace.record('spawn',
+                               text='pid {0}'.format(self._process.pid))
+        self._screen = screen.Screen(*size)
+        self._stream = pyte.Stream()
+        self._stream.attach(self._screen)
+        self.wait()
+
+    def _write(self, data, wait):
+        if self._trace is not None:
+            self._trace.record_keys(bytes(data))
+        with self._guard():
+            self._process.stdin.write(data)
+            self._process.stdin.flush()
+            if self._recorder is not None:
+                self._recorder.write(data)
+            if self._stats is not None:
+                self._stats.bytes_written += len(data)
+                self._stats.writes += 1
+            if wait:
+                self.wait()
+
+    def _command(self, command, capture=True):
+        if capture:
+            self._command('redir! >> {0}'.format(self._tempfile.name), False)
+        self.set_mode('command')
+        self.send_keys('{0}\n'.format(command))
+        if capture:
+            self._command('redir END', False)
+            return self._tempfile.read().strip('\n')
+
+    def _call_json(self, function, *args, **kwargs):
+        # the deadline is long enough for heavy functions,
+        # but an endless one like getchar() never blocks forever
+        timeout = kwargs.pop('timeout', None)
+        if timeout is None:
+            timeout = max(self._timeout * _CALL_TIMEOUT_FACTOR, 1.0)
+        directory = tempfile.mkdtemp(prefix='headlessvim-')
+        path = os.path.join(directory, 'result')
+        args = [str(arg) for arg in args] + [quote(path)]
+        try:
+            self.command('try | call {0}({1}) | catch | '
+                         'call writefile([v:exception], {2}) | '
+                         'endtry'.format(function, ', '.join(args),
+                                         quote(path)), False)
+            # the function may be still running after the command returns
+            deadline = stats.clock() + timeout
+            while not os.path.exists(path):
+                if not self.is_alive():
+                    raise RuntimeError('Vim exited while calling '
+                                       '{0}'.format(function))
+                if stats.clock() > deadline:
+                    self._interrupt(path)
+                    raise RuntimeError('{0} timed out after {1} '
+                                       'seconds'.format(function, timeout))
+                self.wait()
+            with io.open(path, encoding=self._encoding) as f:
+                payload = f.read()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        if not payload.startswith('{'):
+            raise RuntimeError('{0} failed: {1}'.format(function,
+                                                        payload.strip()))
+        return json.loads(payload)
+
+    def _interrupt(self, path):
+        # CTRL-C stops the function and the catch clause writes the file
+        deadline = stats.clock() + max(self._timeout * 4, 1.0)
+        while (not os.path.exists(path) and self.is_alive() and
+               stats.clock() < deadline):
+            self._write(bytearray(b'\x03'), True)
+
+    def _wait(self, timeout):
+        start = stats.clock()
+        bytes_read = self._bytes_read
+        if timeout is None and self._adaptive_timeout is not None:
+            self._wait_adaptive(self._adaptive_timeout)
+        else:
+            if timeout is None:
+                timeout = self._timeout
+            while self._check_readable(timeout):
+                self._flush()
+        if self._trace is not None:
+            self._trace.record('wait', duration=stats.clock() - start,
+                               bytes_read=self._bytes_read - bytes_read)
+
+    @contextlib.contextmanager
+    def _guard(self, responsive=False):
+        if self._guarded:
+            yield
+            return
+        self._guarded = True
+        try:
+            if self._watchdog is None:
+                yield
+            else:
+                with self._watch(responsive):
+                    yield
+        finally:
+            self._guarded = False
+        if self._raise_on_error:
+            errors = self._messages.errors(self._checked)
+            self._checked = self._messages.sequence
+            if errors:
+                error = VimError(errors)
+                if self._trace is not None:
+                    self._trace.record('error', text=str(error))
+                raise error
+
+    @contextlib.contextmanager
+    def _watch(self, responsive):
+        operation = self._watchdog.start(responsive)
+        self._operation = operation
+        try:
+            yield
+            self._watchdog.inspect(operation, self._process, self._screen)
+        except LimitExceeded as e:
+            self._operation = None
+            if self._trace is not None:
+                self._trace.record('limit_exceeded', text=str(e))
+            self._recover(e)
+            raise
+        finally:
+            self._operation = None
+
+    def _recover(self, error):
+        self._process.kill()
+        if not self._watchdog.respawn:
+            return
+        executable, args, env, rlimits = self._spawn_args
+        size = self.screen_size
+        self._process = process.Process(executable, args, env, self._stats,
+                                        size, rlimits)
+        if self._trace is not None:
+            self._trace.record('spawn', text='pid {0}'.format(
+                self._process.pid))
+        self._screen = screen.Screen(*size)
+        self._stream = pyte.Stream()
+        self._stream.attach(self._screen)
+        self._runtimepath = None
+        self._initial_runtimepath = None
+        self._wait(None)
+        if self._events is not None and not self._events.closed:
+            self._events.install()
+        error.respawned = True
+
+    def _check_readable(self, timeout):
+        # records of events are read as *Vim* output
+        fds = ()
+        if self._events is not None and not self._events.closed:
+            fds = (self._events.fileno(),)
+        return self._process.check_readable(timeout, fds)
+
+    def _wait_adaptive(self, adaptive):
+        start = stats.clock()
+        if not self._check_readable(adaptive.first_byte):
+            adaptive.observe_timeout()
+            return
+        adaptive.observe_first_byte(stats.clock() - start)
+        self._flush()
+        last = stats.clock()
+        while self._check_readable(adaptive.quiescence):
+            adaptive.observe_gap(stats.clock() - last)
+            self._flush()
+            last = stats.clock()
+
+    def _wait_redraw(self):
+        if self._check_readable(max(self._timeout * 4, 1.0)):
+            self._flush()
+            self.wait()
+
     def _flush(self):
-        buf = self._process.stdout.read()
+        try:
+            buf = self._process.stdout.read() or b''
+        except IOError as e:
+            # only the FIFO of events is readable
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+            buf = b''
+        if self._events is not None:
+            self._events.read()
+        if not buf:
+            return
+        self._bytes_read += len(buf)
+        if self._recorder is not None:
+            self._recorder.read(buf)
+        if self._operation is not None:
+            self._operation.feed(len(buf))
+        if self._stats is None:
+            self._stream.feed(buf.decode(self._encoding))
+            return
+        start = stats.clock()
         self._stream.feed(buf.decode(self._encoding))
+        self._stats.parse_time += stats.clock() - start
+        self._stats.bytes_read += len(buf)
+        self._stats.reads += 1
 
     def _swap(self, size):
         return (size[1], size[0])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Command line interface of ``headlessvim``.
+
+Usage: ``python -m headlessvim serve --socket PATH [--pool N]``
+"""
+
+import optparse
+import sys
+
+from . import server
+
+
+def serve(argv):
+    """
+    Serve a pool of ``Vim`` objects on a Unix domain socket.
+
+    :param argv: command line arguments
+    :type argv: list of string
+    :return: exit status
+    :rtype: int
+    """
+    parser = optparse.OptionParser(usage='%prog serve --socket PATH [options]')
+    parser.add_option('-s', '--socket', metavar='PATH',
+                      help='path to the socket to listen')
+    parser.add_option('-p', '--pool', type='int', default=1,
+                      help='number of Vim processes to keep warm')
+    parser.add_option('-e', '--executable', default='vim',
+                      help='command name to execute Vim')
+    parser.add_option('-a', '--args',
+                      help='arguments to execute Vim')
+    parser.add_option('-t', '--timeout', type='float', default=0.25,
+                      help='seconds to wait I/O')
+    parser.add_option('--profile', default='default',
+                      help='launch profile of Vim')
+    options, args = parser.parse_args(argv)
+    if not options.socket:
+        parser.error('--socket is required')
+    instance = server.Server(options.socket,
+                             options.pool,
+                             executable=options.executable,
+                             args=options.args,
+                             timeout=options.timeout,
+                             profile=options.profile)
+    try:
+        instance.pool.fill()
+        instance.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        instance.server_close()
+    return 0
+
+
+#: subcommands as a dict of (name, function)
+COMMANDS = {
+    'serve': serve,
+}
+
+
+def main(argv=None):
+    """
+    Entry point of ``python -m headlessvim``.
+
+    :param argv: command line arguments
+    :type argv: None or list of string
+    :return: exit status
+    :rtype: int
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS:
+        sys.stderr.write('usage: python -m headlessvim {{{0}}} ...\n'.format(
+            ','.join(sorted(COMMANDS))))
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
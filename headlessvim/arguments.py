@@ -10,6 +10,55 @@ import shlex
 import six
 
 
+#: *Vim* options to reduce screen traffic, available since *Vim* 7.4
+LEAN_OPTIONS = ('lazyredraw', 'noshowcmd', 'noruler', 'noshowmode',
+                'visualbell', 't_vb=', 't_Co=0', 't_ti=', 't_te=',
+                't_ks=', 't_ke=', 't_vi=', 't_ve=', 't_vs=',
+                't_SI=', 't_EI=', 't_fs=', 't_ts=')
+
+#: *Vim* options to reduce screen traffic, unavailable on older *Vim*
+LEAN_OPTIONAL_OPTIONS = ('belloff=all', 't_SR=', 't_BE=', 't_TI=', 't_TE=',
+                         't_RV=', 't_u7=', 't_RC=', 't_RS=', 't_RB=',
+                         't_RF=', 't_VS=')
+
+#: launch profiles as a dict of
+#: (name, (additional arguments, additional environment variables))
+PROFILES = {
+    'default': ([], {}),
+    'lean': (['--cmd', 'set ' + ' '.join(LEAN_OPTIONS),
+              '--cmd', ' | '.join('silent! set ' + option
+                                  for option in LEAN_OPTIONAL_OPTIONS)],
+             {'TERM': 'ansi'}),
+}
+
+
+def quote(string):
+    """
+    Quote a string as a *Vim* literal string.
+
+    :param string string: a string to quote
+    :return: *Vim* expression of ``string``
+    :rtype: string
+    """
+    return "'{0}'".format(string.replace("'", "''"))
+
+
+def profile(name):
+    """
+    Look up a launch profile.
+
+    :param string name: name of the profile
+    :return: additional arguments and environment variables
+    :rtype: (list of string, dict of (string, string))
+    :raises ValueError: if ``name`` is not in ``PROFILES``
+    """
+    try:
+        args, env = PROFILES[name]
+    except KeyError:
+        raise ValueError('profile {0} is not supported'.format(name))
+    return list(args), dict(env)
+
+
 class Parser(object):
     """
     A class to parse launch arguments for *Vim*.
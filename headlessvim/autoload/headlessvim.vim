@@ -0,0 +1,256 @@
+" Functions used by headlessvim.
+" Each function writes the result as JSON into a:path at once.
+
+function! s:write(path, result) abort
+  call writefile([json_encode(a:result)], a:path . '.tmp')
+  call rename(a:path . '.tmp', a:path)
+endfunction
+
+function! headlessvim#syntax_spans(buffer, start, end, translate, path) abort
+  let current = bufnr('%')
+  let buffer = a:buffer ? a:buffer : current
+  if buffer != current
+    let view = winsaveview()
+    execute 'noautocmd keepalt keepjumps buffer!' buffer
+  endif
+  try
+    let first = type(a:start) == type('') ? line(a:start) : a:start
+    let last = type(a:end) == type('') ? line(a:end) : a:end
+    let lines = []
+    for lnum in range(first, last)
+      let spans = []
+      let group = 0
+      let begin = 1
+      let length = col([lnum, '$'])
+      for column in range(1, length)
+        let id = 0
+        if column < length
+          let id = synID(lnum, column, 1)
+          if a:translate
+            let id = synIDtrans(id)
+          endif
+        endif
+        if id != group
+          if group
+            call add(spans, [begin, column - begin, synIDattr(group, 'name')])
+          endif
+          let group = id
+          let begin = column
+        endif
+      endfor
+      call add(lines, spans)
+    endfor
+  finally
+    if buffer != current
+      execute 'noautocmd keepalt keepjumps buffer!' current
+      call winrestview(view)
+    endif
+  endtry
+  call s:write(a:path, {'start': first, 'lines': lines})
+endfunction
+
+let s:messages = []
+let s:errmsg = ''
+
+function! headlessvim#watch_messages(path) abort
+  if !exists('##SafeState') || !exists('*execute') || !exists('*json_encode')
+    return
+  endif
+  let s:messages_path = a:path
+  let s:messages = []
+  let s:errmsg = v:errmsg
+  augroup headlessvim_messages
+    autocmd!
+    autocmd SafeState * call headlessvim#poll_messages()
+  augroup END
+endfunction
+
+function! headlessvim#poll_messages() abort
+  " not to run on every key in Insert mode,
+  " messages are still in the history after leaving it
+  if mode() =~# '^[iR]'
+    return
+  endif
+  let messages = split(execute('messages', 'silent!'), "\n")
+  let added = []
+  if messages !=# s:messages
+    let start = 0
+    for overlap in range(min([len(s:messages), len(messages)]), 1, -1)
+      if s:messages[-overlap :] ==# messages[: overlap - 1]
+        let start = overlap
+        break
+      endif
+    endfor
+    let added = messages[start :]
+    let s:messages = messages
+  endif
+  let records = []
+  for text in added
+    let exception = matchstr(text, '^E605: [^:]*: \zs.*')
+    if exception !=# ''
+      " v:exception of an uncaught exception
+      call add(records, {'kind': 'exception', 'text': exception})
+    else
+      let kind = text =~# '^E\d\+:' ? 'error' : 'message'
+      call add(records, {'kind': kind, 'text': text})
+    endif
+  endfor
+  if v:errmsg !=# s:errmsg
+    let s:errmsg = v:errmsg
+    let index = index(added, v:errmsg)
+    if index >= 0
+      " such as :echoerr
+      if records[index].kind ==# 'message'
+        let records[index].kind = 'error'
+      endif
+    elseif v:errmsg !=# ''
+      " errors suppressed by :silent! are not in the message history
+      call add(records, {'kind': 'error', 'text': v:errmsg})
+    endif
+  endif
+  if !empty(records)
+    call writefile(map(records, 'json_encode(v:val)'), s:messages_path, 'a')
+  endif
+endfunction
+
+" options depending on the terminal, the screen or buffers
+let s:volatile_options = ['columns', 'compatible', 'encoding', 'lines']
+let s:volatile_options += ['modified', 'scroll', 'term', 'ttytype', 'window']
+let s:options = {}
+
+function! headlessvim#watch_options() abort
+  if !exists('*getcompletion')
+    return
+  endif
+  augroup headlessvim_options
+    autocmd!
+    autocmd VimEnter * call headlessvim#save_options()
+  augroup END
+endfunction
+
+function! headlessvim#save_options() abort
+  let s:options = {}
+  for name in getcompletion('', 'option')
+    if name =~# '^t_' || index(s:volatile_options, name) >= 0
+      continue
+    endif
+    if exists('&' . name)
+      let s:options[name] = [eval('&g:' . name), eval('&l:' . name)]
+    endif
+  endfor
+endfunction
+
+function! headlessvim#reset() abort
+  for name in keys(s:options)
+    let [global, local] = s:options[name]
+    if eval('&g:' . name) !=# global
+      silent! execute 'let &g:' . name . ' = global'
+    endif
+    if eval('&l:' . name) !=# local
+      silent! execute 'let &l:' . name . ' = local'
+    endif
+    unlet global local
+  endfor
+  for name in split('abcdefghijklmnopqrstuvwxyz0123456789-"/', '\zs')
+    call setreg(name, '')
+  endfor
+  let v:errmsg = ''
+endfunction
+
+function! headlessvim#run_tests(script, pattern, path) abort
+  execute 'source' fnameescape(a:script)
+  let names = []
+  for line in split(execute('function /' . a:pattern), "\n")
+    call add(names, matchstr(line, '^function \zs[^(]\+'))
+  endfor
+  let results = []
+  let start = reltime()
+  for name in sort(names)
+    let v:errors = []
+    let test_start = reltime()
+    try
+      if exists('*SetUp')
+        call SetUp()
+      endif
+      call call(name, [])
+    catch
+      call add(v:errors, v:throwpoint . ': ' . v:exception)
+    finally
+      try
+        if exists('*TearDown')
+          call TearDown()
+        endif
+      catch
+        call add(v:errors, v:throwpoint . ': ' . v:exception)
+      endtry
+    endtry
+    let time = reltimefloat(reltime(test_start))
+    call add(results, {'name': name, 'errors': v:errors, 'time': time})
+  endfor
+  let v:errors = []
+  call s:write(a:path, {'tests': results, 'time': reltimefloat(reltime(start))})
+endfunction
+
+function! s:encodable(value) abort
+  try
+    call json_encode(a:value)
+    return 1
+  catch
+    return 0
+  endtry
+endfunction
+
+function! headlessvim#state(request, path) abort
+  let request = json_decode(a:request)
+  let result = {}
+  let options = {}
+  for name in request.options
+    let options[name] = exists('&' . name) ? eval('&' . name) : v:null
+  endfor
+  let result.options = options
+  let variables = {}
+  for scope in request.variables
+    let values = {}
+    for [name, Value] in items(eval(scope))
+      " such as Funcref
+      if s:encodable(Value)
+        let values[name] = Value
+      endif
+      unlet Value
+    endfor
+    let variables[scope] = values
+  endfor
+  let result.variables = variables
+  let registers = {}
+  for name in split(request.registers, '\zs')
+    let value = getreg(name)
+    if value !=# ''
+      let registers[name] = {'value': value, 'type': getregtype(name)}
+    endif
+  endfor
+  let result.registers = registers
+  if request.layout
+    let tabs = gettabinfo()
+    let windows = getwininfo()
+    for info in tabs + windows
+      if has_key(info, 'variables')
+        call remove(info, 'variables')
+      endif
+    endfor
+    let layout = {'tabs': tabs, 'windows': windows}
+    let layout.tree = exists('*winlayout') ? winlayout() : v:null
+    let layout.tab = tabpagenr()
+    let layout.window = win_getid()
+    let layout.buffer = bufnr('%')
+    let layout.mode = mode(1)
+    let result.layout = layout
+  endif
+  call s:write(a:path, result)
+endfunction
+
+function! headlessvim#time(command, path) abort
+  let start = reltime()
+  silent execute a:command
+  let time = reltimefloat(reltime(start))
+  call s:write(a:path, {'time': time, 'lines': line('$')})
+endfunction
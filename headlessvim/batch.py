@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Batch editing of files with a process pool of ``Vim`` objects.
+
+Example:
+
+>>> import headlessvim
+>>> results = headlessvim.map_files(paths, ['%s/spam/ham/g']) # doctest: +SKIP
+>>> for result in results: # doctest: +SKIP
+...     if result.error:
+...         print(result.path, result.error)
+...
+"""
+
+import collections
+import multiprocessing
+import multiprocessing.util
+
+from .arguments import quote
+
+
+__all__ = ['Result', 'map_files']
+
+
+#: A result of ``map_files`` for each file.
+#: ``output`` is a list of captured outputs of commands and
+#: ``error`` is None if succeeded else an error message.
+Result = collections.namedtuple('Result', 'path output error')
+
+_vim = None
+_kwargs = None
+
+
+def map_files(files, commands, workers=None, write=True, **kwargs):
+    """
+    Open each file, execute commands and write it back in parallel.
+    Results are yielded as they complete, not in order of ``files``.
+
+    A file is not written if any error occurred on it.
+
+    :param files: paths to edit
+    :type files: iterable of string
+    :param commands: commands to execute on each file
+    :type commands: list of string
+    :param int workers: number of processes, the number of CPUs if None
+    :param boolean write: whether if write files back
+    :param kwargs: arguments passed to ``headlessvim.open``
+    :return: results of each file
+    :rtype: iterator of Result
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(workers, _initialize, (kwargs,))
+    tasks = ((path, list(commands), write) for path in files)
+    try:
+        for result in pool.imap_unordered(_edit, tasks):
+            yield result
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+
+def _initialize(kwargs):
+    global _kwargs
+    _kwargs = kwargs
+    _open()
+
+
+def _open():
+    global _vim
+    from . import open
+    _vim = open(**_kwargs)
+    multiprocessing.util.Finalize(_vim, _vim.close, exitpriority=10)
+    return _vim
+
+
+def _edit(task):
+    path, commands, write = task
+    output = []
+    try:
+        vim = _vim if _vim.is_alive() else _open()
+        vim.reset()
+        vim.command("let v:errmsg = ''", False)
+        vim.command("execute 'edit!' fnameescape({0})".format(quote(path)),
+                    False)
+        for command in commands:
+            output.append(vim.command(command))
+        error = vim.echo('v:errmsg') or None
+        if write and error is None:
+            vim.command('update', False)
+            error = vim.echo('v:errmsg') or None
+    except Exception as e:
+        error = '{0}: {1}'.format(type(e).__name__, e)
+    return Result(path, output, error)
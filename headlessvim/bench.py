@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Benchmarks of ``headlessvim`` itself.
+
+Run ``python -m headlessvim.bench`` to print results as JSON.
+The output can be saved by ``--output`` and compared across commits.
+
+Example:
+
+>>> from headlessvim import bench
+>>> result = bench.run(['echo'], repeat=1)
+>>> result['benchmarks']['echo']['count']
+1
+"""
+
+import json
+import optparse
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from . import process, stats
+from ._version import __version__
+
+
+__all__ = ['BENCHMARKS', 'benchmark', 'main', 'run', 'summarize']
+
+
+#: registered benchmarks as a list of (name, function)
+BENCHMARKS = []
+
+#: screen sizes used by ``display`` benchmark as (columns, lines)
+DISPLAY_SIZES = ((80, 24), (160, 48), (300, 100))
+
+
+def benchmark(name):
+    """
+    A decorator to register a benchmark function.
+
+    The function takes ``repeat`` and ``kwargs`` for ``headlessvim.open``,
+    and returns a list of samples in seconds or a dict of such lists.
+
+    :param string name: name of the benchmark
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+def summarize(samples):
+    """
+    Summarize samples.
+
+    :param samples: samples in seconds
+    :type samples: list of float
+    :return: count, min, median, mean, max and samples
+    :rtype: dict
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    if count % 2:
+        median = ordered[count // 2]
+    else:
+        median = (ordered[count // 2 - 1] + ordered[count // 2]) / 2.0
+    return {
+        'count': count,
+        'min': ordered[0],
+        'median': median,
+        'mean': sum(ordered) / count,
+        'max': ordered[-1],
+        'samples': samples,
+    }
+
+
+def run(names=None, repeat=10, **kwargs):
+    """
+    Run benchmarks.
+
+    :param names: names of benchmarks to run, None to run all
+    :type names: None or list of string
+    :param int repeat: number of samples for each benchmark
+    :param kwargs: arguments passed to ``headlessvim.open``
+    :return: JSON serializable results
+    :rtype: dict
+    :raises ValueError: if unknown name is given
+    """
+    registered = dict(BENCHMARKS)
+    if names is None:
+        names = [name for name, func in BENCHMARKS]
+    for name in names:
+        if name not in registered:
+            raise ValueError('benchmark {0} is not found'.format(name))
+    results = {}
+    for name in names:
+        samples = registered[name](repeat, kwargs)
+        if isinstance(samples, dict):
+            for key, value in samples.items():
+                results['{0}[{1}]'.format(name, key)] = summarize(value)
+        else:
+            results[name] = summarize(samples)
+    return {
+        'meta': {
+            'headlessvim': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.time(),
+            'repeat': repeat,
+        },
+        'benchmarks': results,
+    }
+
+
+def main(argv=None):
+    """
+    Entry point of ``python -m headlessvim.bench``.
+
+    :param argv: command line arguments
+    :type argv: None or list of string
+    :return: exit status
+    :rtype: int
+    """
+    parser = optparse.OptionParser(usage='%prog [options] [benchmark ...]')
+    parser.add_option('-n', '--repeat', type='int', default=10,
+                      help='number of samples for each benchmark')
+    parser.add_option('-o', '--output', metavar='PATH',
+                      help='write JSON to PATH instead of stdout')
+    parser.add_option('-e', '--executable', default='vim',
+                      help='command name to execute Vim')
+    parser.add_option('-t', '--timeout', type='float', default=0.25,
+                      help='seconds to wait I/O')
+    parser.add_option('-p', '--profile', default='default',
+                      help='launch profile of Vim')
+    parser.add_option('-a', '--adaptive-timeout', action='store_true',
+                      help='learn timeouts bounded by --timeout')
+    parser.add_option('-l', '--list', action='store_true',
+                      help='list benchmarks and exit')
+    options, names = parser.parse_args(argv)
+    if options.list:
+        for name, func in BENCHMARKS:
+            print(name)
+        return 0
+    env = dict(os.environ, LANG='C')
+    try:
+        result = run(names or None,
+                     repeat=options.repeat,
+                     executable=options.executable,
+                     timeout=options.timeout,
+                     profile=options.profile,
+                     adaptive_timeout=options.adaptive_timeout,
+                     env=env)
+    except ValueError as e:
+        parser.error(str(e))
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+    else:
+        json.dump(result, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    return 0
+
+
+def _open(kwargs):
+    from . import open
+    return open(**kwargs)
+
+
+def _time(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = stats.clock()
+        func()
+        samples.append(stats.clock() - start)
+    return samples
+
+
+@benchmark('startup')
+def _bench_startup(repeat, kwargs):
+    samples = _time(lambda: _open(kwargs).close(), repeat + 1)
+    return {'cold': samples[:1], 'warm': samples[1:]}
+
+
+@benchmark('spawn')
+def _bench_spawn(repeat, kwargs):
+    def spawn():
+        processes.append(process.Process(kwargs.get('executable', 'vim'),
+                                         ['vim', '-N', '-i', 'NONE', '-n',
+                                          '-u', 'NONE'],
+                                         kwargs.get('env')))
+    results = {}
+    methods = [('popen', None)]
+    if process._posix_spawn is not None:
+        methods.append(('posix_spawn', process._posix_spawn))
+    original = process._posix_spawn
+    try:
+        for name, method in methods:
+            process._posix_spawn = method
+            processes = []
+            try:
+                results[name] = _time(spawn, repeat)
+            finally:
+                for instance in processes:
+                    instance.kill()
+    finally:
+        process._posix_spawn = original
+    return results
+
+
+@benchmark('import')
+def _bench_import(repeat, kwargs):
+    def python(source):
+        return lambda: subprocess.check_call([sys.executable, '-c', source])
+    return {
+        'python': _time(python('pass'), repeat),
+        'headlessvim': _time(python('import headlessvim'), repeat),
+    }
+
+
+@benchmark('command')
+def _bench_command(repeat, kwargs):
+    with _open(kwargs) as vim:
+        return _time(lambda: vim.command('let g:spam = 0', False), repeat)
+
+
+@benchmark('command_capture')
+def _bench_command_capture(repeat, kwargs):
+    with _open(kwargs) as vim:
+        return _time(lambda: vim.command('echo 0'), repeat)
+
+
+@benchmark('echo')
+def _bench_echo(repeat, kwargs):
+    with _open(kwargs) as vim:
+        return _time(lambda: vim.echo('"spam"'), repeat)
+
+
+@benchmark('send_keys')
+def _bench_send_keys(repeat, kwargs):
+    keys = 'spam ham egg\n' * 256
+    with _open(kwargs) as vim:
+        vim.set_mode('insert')
+        samples = _time(lambda: vim.send_keys(keys), repeat)
+    return [sample / len(keys) for sample in samples]
+
+
+@benchmark('display')
+def _bench_display(repeat, kwargs):
+    results = {}
+    with _open(kwargs) as vim:
+        for size in DISPLAY_SIZES:
+            vim.screen_size = size
+            results['{0}x{1}'.format(*size)] = _time(vim.display, repeat)
+    return results
+
+
+@benchmark('runtimepath')
+def _bench_runtimepath(repeat, kwargs):
+    def sync():
+        vim.runtimepath.append(os.curdir)
+        del vim.runtimepath[-1]
+    with _open(kwargs) as vim:
+        vim.runtimepath
+        return _time(sync, repeat)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
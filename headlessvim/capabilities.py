@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Version, features and functions supported by a *Vim* executable.
+
+Capabilities are probed by a single command,
+and cached in the process and on disk
+by the path and the modification time of the executable.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     vim.capabilities.version >= 700
+...     vim.capabilities.exists('strlen')
+...
+True
+True
+
+The cache is stored in ``HEADLESSVIM_CACHE_DIR``
+or ``$XDG_CACHE_HOME/headlessvim``.
+Set ``HEADLESSVIM_CACHE_DIR`` to an empty string to disable it.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import six
+
+
+__all__ = ['FEATURES', 'Capabilities', 'cache_directory', 'clear', 'detect',
+           'probe']
+
+
+#: features probed by ``has()``
+FEATURES = (
+    'autocmd', 'channel', 'clipboard', 'conceal', 'eval', 'float', 'folding',
+    'job', 'lambda', 'lua', 'multi_byte', 'packages', 'perl', 'popupwin',
+    'python', 'python3', 'reltime', 'ruby', 'syntax', 'terminal', 'textprop',
+    'timers', 'unix', 'vim9script',
+)
+
+_PROBE = (
+    "silent echo join(["
+    "v:version, "
+    "exists('v:versionlong') ? v:versionlong % 10000"
+    " : max(filter(range(1, 9999), 'has(\"patch\" . v:val)')), "
+    "join(filter({features}, 'has(v:val)')), "
+    "exists('*getcompletion')"
+    # builtin functions are lowercase and have neither # nor <SNR>
+    " ? join(map(filter(getcompletion('', 'function'),"
+    " 'v:val =~# \"^[a-z]\\\\w*(\"'), 'matchstr(v:val, \"^\\\\w\\\\+\")'))"
+    " : ''"
+    "], \"\\n\")"
+)
+
+_CACHE = {}
+
+# version of the format of the cache on disk
+_FORMAT = 2
+
+
+class Capabilities(object):
+    """
+    A class representing capabilities of a *Vim* executable.
+    """
+    def __init__(self, version, patch, features, functions):
+        """
+        :param int version: ``v:version`` such as 801 for *Vim* 8.1
+        :param int patch: the highest included patch
+        :param features: names of supported features
+        :type features: iterable of string
+        :param functions: names of builtin functions,
+                          empty if *Vim* cannot list them
+        :type functions: iterable of string
+        """
+        self._version = version
+        self._patch = patch
+        self._features = frozenset(features)
+        self._functions = frozenset(functions)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        :param dict data: a dict made by ``as_dict``
+        :return: capabilities
+        :rtype: Capabilities
+        """
+        return cls(data['version'], data['patch'],
+                   data['features'], data['functions'])
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of capabilities
+        :rtype: dict
+        """
+        return {
+            'version': self._version,
+            'patch': self._patch,
+            'features': sorted(self._features),
+            'functions': sorted(self._functions),
+        }
+
+    def has(self, feature):
+        """
+        :param string feature: a name in ``FEATURES``
+        :return: True if the feature is supported
+        :rtype: boolean
+        """
+        return feature in self._features
+
+    def exists(self, function):
+        """
+        :param string function: a name of a builtin function
+        :return: True if the function is available
+        :rtype: boolean
+        """
+        return function in self._functions
+
+    def at_least(self, version, patch=0):
+        """
+        :param int version: ``v:version`` to compare
+        :param int patch: patch number to compare
+        :return: True if *Vim* is the given version or later
+        :rtype: boolean
+        """
+        return (self._version, self._patch) >= (version, patch)
+
+    @property
+    def version(self):
+        """
+        :return: ``v:version``
+        :rtype: int
+        """
+        return self._version
+
+    @property
+    def patch(self):
+        """
+        :return: the highest included patch
+        :rtype: int
+        """
+        return self._patch
+
+    @property
+    def features(self):
+        """
+        :return: names of supported features
+        :rtype: frozenset of string
+        """
+        return self._features
+
+    @property
+    def functions(self):
+        """
+        :return: names of builtin functions
+        :rtype: frozenset of string
+        """
+        return self._functions
+
+    @property
+    def channel(self):
+        """
+        :return: True if ``+channel`` is supported
+        :rtype: boolean
+        """
+        return self.has('channel')
+
+    @property
+    def job(self):
+        """
+        :return: True if ``+job`` is supported
+        :rtype: boolean
+        """
+        return self.has('job')
+
+    @property
+    def terminal(self):
+        """
+        :return: True if ``+terminal`` is supported
+        :rtype: boolean
+        """
+        return self.has('terminal')
+
+
+def cache_directory():
+    """
+    :return: directory to cache capabilities, None if disabled
+    :rtype: None or string
+    """
+    directory = os.environ.get('HEADLESSVIM_CACHE_DIR')
+    if directory is None:
+        base = os.environ.get('XDG_CACHE_HOME',
+                              os.path.join(os.path.expanduser('~'), '.cache'))
+        directory = os.path.join(base, 'headlessvim')
+    return directory or None
+
+
+def probe(vim):
+    """
+    Probe capabilities of a running *Vim* by a single command.
+
+    :param Vim vim: ``Vim`` object to probe
+    :return: capabilities
+    :rtype: Capabilities
+    """
+    features = '[{0}]'.format(', '.join("'{0}'".format(feature)
+                                        for feature in FEATURES))
+    output = vim.command(_PROBE.format(features=features))
+    version, patch, features, functions = (output.split('\n') + [''] * 4)[:4]
+    return Capabilities(int(version), int(patch or 0),
+                        features.split(), functions.split())
+
+
+def detect(vim):
+    """
+    Return capabilities of the executable of ``vim``,
+    probing it only if not cached in the process or on disk.
+
+    :param Vim vim: ``Vim`` object to probe
+    :return: capabilities
+    :rtype: Capabilities
+    """
+    executable = vim.executable
+    key = (executable, os.stat(executable).st_mtime)
+    if key not in _CACHE:
+        capabilities = _load(key)
+        if capabilities is None:
+            capabilities = probe(vim)
+            _save(key, capabilities)
+        _CACHE[key] = capabilities
+    return _CACHE[key]
+
+
+def clear():
+    """
+    Clear capabilities cached in the process.
+    """
+    _CACHE.clear()
+
+
+def _path(executable):
+    directory = cache_directory()
+    if directory is None:
+        return None
+    digest = hashlib.sha1(executable.encode('utf-8')).hexdigest()
+    return os.path.join(directory, 'capabilities-{0}.json'.format(digest))
+
+
+def _load(key):
+    executable, mtime = key
+    path = _path(executable)
+    if path is None:
+        return None
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if (data.get('format') != _FORMAT or
+            data.get('executable') != executable or
+            data.get('mtime') != mtime):
+        return None
+    return Capabilities.from_dict(data)
+
+
+def _save(key, capabilities):
+    executable, mtime = key
+    path = _path(executable)
+    if path is None:
+        return
+    data = dict(capabilities.as_dict(), executable=executable, mtime=mtime,
+                format=_FORMAT)
+    temp = '{0}.{1}'.format(path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(temp, 'w', encoding='utf-8') as f:
+            f.write(six.text_type(json.dumps(data)))
+        os.rename(temp, path)
+    except (IOError, OSError):
+        pass
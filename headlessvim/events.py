@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A stream of events of *Vim* delivered through a FIFO.
+
+Autocommands write a record for each event into a FIFO
+and ``Vim`` reads it whenever it reads the screen.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     events = vim.events(['TextChanged'])
+...     vim.send_keys('ispam\\nham\\033')
+...     event = events.poll()[-1]
+...     event.name, event.first, event.last, event.cursor
+...
+('TextChanged', 1, 2, (2, 3))
+
+.. note:: Keys sent by ``Vim`` itself (such as ``command``)
+          also cause events, especially ``ModeChanged``.
+"""
+
+import collections
+import errno
+import os
+import shutil
+import tempfile
+
+from .arguments import quote
+
+
+__all__ = ['EVENTS', 'Event', 'EventStream']
+
+
+#: autocommand events watched by default
+EVENTS = ('TextChanged', 'TextChangedI', 'CursorMoved', 'BufEnter',
+          'ModeChanged')
+
+#: an event of *Vim*.
+#: ``first`` and ``last`` are the changed lines of ``TextChanged`` events,
+#: ``cursor`` is (line, column) starting from 1
+#: and ``detail`` is ``<amatch>``,
+#: such as ``'n:i'`` for ``ModeChanged`` or a file name for ``BufEnter``
+Event = collections.namedtuple('Event', ['name', 'buffer', 'first', 'last',
+                                         'cursor', 'mode', 'detail'])
+
+_GROUP = 'headlessvim_events'
+
+_RECORD = ("[join(['{name}', bufnr('%'), {marks}, line('.'), col('.'), "
+           "mode(1), expand('<amatch>')], \"\\t\")]")
+
+
+class EventStream(object):
+    """
+    A class receiving events of a ``Vim`` object.
+    Use ``Vim.events`` to get the stream.
+    """
+    def __init__(self, vim, names=EVENTS, maxlen=10000):
+        """
+        :param Vim vim: ``Vim`` object to watch
+        :param names: names of autocommand events to watch
+        :type names: iterable of string
+        :param int maxlen: number of pending events to keep
+        """
+        self._vim = vim
+        self._names = tuple(names)
+        self._pending = collections.deque(maxlen=maxlen)
+        self._callbacks = []
+        self._buffer = b''
+        self._directory = tempfile.mkdtemp(prefix='headlessvim-')
+        self._path = os.path.join(self._directory, 'events')
+        os.mkfifo(self._path)
+        self._fd = os.open(self._path, os.O_RDONLY | os.O_NONBLOCK)
+        # keep a writer not to make the FIFO readable at EOF
+        # after *Vim* closes it
+        self._writer = os.open(self._path, os.O_WRONLY | os.O_NONBLOCK)
+
+    def __iter__(self):
+        """
+        Iterate over pending events and discard them.
+        """
+        self.read()
+        while self._pending:
+            yield self._pending.popleft()
+
+    def install(self):
+        """
+        Define autocommands writing events into the FIFO.
+        """
+        path = quote(self._path)
+        commands = ['augroup {0} | augroup END'.format(_GROUP),
+                    'execute {0}'.format(quote('autocmd! ' + _GROUP))]
+        for name in self._names:
+            if name.startswith('TextChanged'):
+                marks = "line(\"'[\"), line(\"']\")"
+            else:
+                marks = '0, 0'
+            record = _RECORD.format(name=name, marks=marks)
+            autocmd = 'autocmd {0} {1} * call writefile({2}, {3}, {4})'
+            autocmd = autocmd.format(_GROUP, name, record, path, quote('a'))
+            commands.append("if exists('##{0}') | execute {1} | endif"
+                            .format(name, quote(autocmd)))
+        self._vim.command(' | '.join(commands), False)
+
+    def subscribe(self, callback):
+        """
+        Call ``callback`` with each ``Event`` as soon as it is read.
+        Do not operate ``Vim`` in the callback.
+
+        :param callback: a function takes an ``Event``
+        """
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        :param callback: a function given to ``subscribe``
+        """
+        self._callbacks.remove(callback)
+
+    def poll(self):
+        """
+        Read and discard pending events.
+
+        :return: pending events in order of occurrence
+        :rtype: list of Event
+        """
+        return list(self)
+
+    def fileno(self):
+        """
+        :return: file descriptor to read the FIFO, None if closed
+        :rtype: None or int
+        """
+        return self._fd
+
+    def read(self):
+        """
+        Read records from the FIFO without blocking,
+        and deliver them to callbacks and pending events.
+        ``Vim`` calls this whenever it waits for *Vim*,
+        so that *Vim* is never blocked by the full FIFO.
+        """
+        if self._fd is None:
+            return
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+            self._buffer += data
+        lines = self._buffer.split(b'\n')
+        self._buffer = lines.pop()
+        for line in lines:
+            event = self._parse(line.decode(self._vim.encoding))
+            self._pending.append(event)
+            for callback in self._callbacks:
+                callback(event)
+
+    def close(self, uninstall=True):
+        """
+        Stop watching events.
+
+        :param boolean uninstall: whether if remove autocommands from *Vim*
+        """
+        if self._fd is None:
+            return
+        if uninstall and self._vim.is_alive():
+            self._vim.command('execute {0}'.format(
+                quote('autocmd! ' + _GROUP)), False)
+        os.close(self._fd)
+        os.close(self._writer)
+        self._fd = None
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    @property
+    def names(self):
+        """
+        :return: names of autocommand events to watch
+        :rtype: tuple of string
+        """
+        return self._names
+
+    @property
+    def path(self):
+        """
+        :return: path to the FIFO
+        :rtype: string
+        """
+        return self._path
+
+    @property
+    def closed(self):
+        """
+        :return: True if the stream is closed
+        :rtype: boolean
+        """
+        return self._fd is None
+
+    def _parse(self, line):
+        fields = line.split('\t', 7)
+        first = int(fields[2]) or None
+        last = int(fields[3]) or None
+        return Event(fields[0], int(fields[1]), first, last,
+                     (int(fields[4]), int(fields[5])), fields[6], fields[7])
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A compiler of *Vim* style key notation into bytes sent to a terminal.
+
+Special keys such as ``<Up>`` or ``<F5>`` are looked up in the terminfo
+database for ``TERM`` and compiled results are cached,
+so that ``KeyMacro`` objects sent repeatedly cost nothing to encode.
+
+Example:
+
+>>> from headlessvim import keys
+>>> keys.compile('ispam<Esc>').data == b'ispam\\x1b'
+True
+>>> keys.compile('<C-w>j').data == b'\\x17j'
+True
+>>> macro = keys.compile('dd') * 2 + '<CR>'
+>>> macro.notation
+'dddd<CR>'
+>>> macro.data == b'dddd\\r'
+True
+
+Unknown keys are kept as they are like *Vim* does.
+
+>>> keys.compile('<spam>').data == b'<spam>'
+True
+"""
+
+import os
+import re
+import struct
+import threading
+
+import six
+
+
+__all__ = ['KeyMacro', 'clear', 'compile', 'terminal_keys']
+
+
+#: key sequences used if the terminfo database does not define them.
+#: they are those of xterm
+DEFAULT_KEYS = {
+    'bs': b'\x7f',
+    'del': b'\x1b[3~',
+    'up': b'\x1bOA',
+    'down': b'\x1bOB',
+    'right': b'\x1bOC',
+    'left': b'\x1bOD',
+    'home': b'\x1bOH',
+    'end': b'\x1bOF',
+    'pageup': b'\x1b[5~',
+    'pagedown': b'\x1b[6~',
+    'insert': b'\x1b[2~',
+    's-tab': b'\x1b[Z',
+    'f1': b'\x1bOP',
+    'f2': b'\x1bOQ',
+    'f3': b'\x1bOR',
+    'f4': b'\x1bOS',
+    'f5': b'\x1b[15~',
+    'f6': b'\x1b[17~',
+    'f7': b'\x1b[18~',
+    'f8': b'\x1b[19~',
+    'f9': b'\x1b[20~',
+    'f10': b'\x1b[21~',
+    'f11': b'\x1b[23~',
+    'f12': b'\x1b[24~',
+}
+
+# keys independent of terminals
+_LITERAL_KEYS = {
+    'nul': b'\x00',
+    'esc': b'\x1b',
+    'cr': b'\r',
+    'return': b'\r',
+    'enter': b'\r',
+    'nl': b'\n',
+    'tab': b'\t',
+    'space': b' ',
+    'lt': b'<',
+    'bar': b'|',
+    'bslash': b'\\',
+}
+
+# indices of string capabilities in compiled terminfo entries (term.h)
+_CAPABILITIES = {
+    'bs': 55,  # kbs
+    'del': 59,  # kdch1
+    'down': 61,  # kcud1
+    'f1': 66,
+    'f10': 67,
+    'f2': 68,
+    'f3': 69,
+    'f4': 70,
+    'f5': 71,
+    'f6': 72,
+    'f7': 73,
+    'f8': 74,
+    'f9': 75,
+    'home': 76,  # khome
+    'insert': 77,  # kich1
+    'left': 79,  # kcub1
+    'pagedown': 81,  # knp
+    'pageup': 82,  # kpp
+    'right': 83,  # kcuf1
+    'up': 87,  # kcuu1
+    's-tab': 148,  # kcbt
+    'end': 164,  # kend
+    'f11': 216,
+    'f12': 217,
+}
+
+_NOTATION = re.compile(r'<((?:[CcMmAaSs]-)*)([0-9A-Za-z]+|[^\s<>])>')
+
+_CACHE_SIZE = 256
+
+_lock = threading.Lock()
+_terminals = {}
+_cache = {}
+_ticks = [0]
+
+
+class KeyMacro(object):
+    """
+    A class representing compiled key notation.
+    Macros are concatenated by ``+`` and repeated by ``*``.
+    """
+    def __init__(self, notation, data, term=None, encoding='utf-8'):
+        """
+        :param string notation: *Vim* style key notation
+        :param bytes data: key sequence to send
+        :param string term: name of the terminal
+        :param string encoding: encoding of characters
+        """
+        self._notation = notation
+        self._data = data
+        self._term = term
+        self._encoding = encoding
+
+    def __add__(self, other):
+        if not isinstance(other, KeyMacro):
+            other = compile(other, self._term, self._encoding)
+        return KeyMacro(self._notation + other._notation,
+                        self._data + other._data, self._term, self._encoding)
+
+    def __mul__(self, count):
+        return KeyMacro(self._notation * count, self._data * count,
+                        self._term, self._encoding)
+
+    __rmul__ = __mul__
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        return isinstance(other, KeyMacro) and self._data == other._data
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __repr__(self):
+        return 'KeyMacro({0!r})'.format(self._notation)
+
+    @property
+    def notation(self):
+        """
+        :return: *Vim* style key notation
+        :rtype: string
+        """
+        return self._notation
+
+    @property
+    def data(self):
+        """
+        :return: key sequence to send
+        :rtype: bytes
+        """
+        return self._data
+
+    @property
+    def term(self):
+        """
+        :return: name of the terminal
+        :rtype: string
+        """
+        return self._term
+
+
+def compile(notation, term=None, encoding='utf-8'):
+    """
+    Compile *Vim* style key notation.
+    Results are cached by the notation.
+
+    :param string notation: *Vim* style key notation such as ``'<C-w>j'``
+    :param string term: name of the terminal, ``$TERM`` if None
+    :param string encoding: encoding of characters
+    :return: compiled keys
+    :rtype: KeyMacro
+    """
+    if isinstance(notation, KeyMacro):
+        return notation
+    if term is None:
+        term = os.environ.get('TERM', 'xterm')
+    key = (notation, term, encoding)
+    with _lock:
+        _ticks[0] += 1
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache[key] = (entry[0], _ticks[0])
+            return entry[0]
+    keys = terminal_keys(term)
+    chunks = []
+    position = 0
+    for match in _NOTATION.finditer(notation):
+        chunks.append(notation[position:match.start()].encode(encoding))
+        data = _compile_key(match.group(1), match.group(2), keys,
+                            encoding)
+        if data is None:
+            data = match.group(0).encode(encoding)
+        chunks.append(data)
+        position = match.end()
+    chunks.append(notation[position:].encode(encoding))
+    macro = KeyMacro(notation, b''.join(chunks), term, encoding)
+    with _lock:
+        if len(_cache) >= _CACHE_SIZE and key not in _cache:
+            # evict the least recently used
+            del _cache[min(_cache, key=lambda k: _cache[k][1])]
+        _cache[key] = (macro, _ticks[0])
+    return macro
+
+
+def terminal_keys(term):
+    """
+    Read key sequences of a terminal from the terminfo database.
+
+    :param string term: name of the terminal
+    :return: key sequences by lowercase names such as ``'up'`` or ``'f5'``
+    :rtype: dict of (string, bytes)
+    """
+    with _lock:
+        keys = _terminals.get(term)
+    if keys is None:
+        keys = dict(DEFAULT_KEYS)
+        try:
+            keys.update(_read_terminfo(term))
+        except (EnvironmentError, ValueError, struct.error):
+            pass
+        with _lock:
+            _terminals[term] = keys
+    return keys
+
+
+def clear():
+    """
+    Clear cached terminals and compiled keys.
+    """
+    with _lock:
+        _terminals.clear()
+        _cache.clear()
+
+
+def _compile_key(modifiers, name, keys, encoding):
+    modifiers = modifiers.lower().replace('a-', 'm-')
+    lower = name.lower()
+    shifted = 's-' in modifiers
+    if shifted:
+        if lower == 'tab':
+            lower = 's-tab'
+        elif len(name) == 1 and name.isalpha():
+            name = name.upper()
+        else:
+            return None
+        modifiers = modifiers.replace('s-', '')
+    if len(name) == 1:
+        if not modifiers and not shifted:
+            return None
+        data = name
+    elif lower in _LITERAL_KEYS:
+        data = _LITERAL_KEYS[lower]
+    elif lower in keys:
+        data = keys[lower]
+    else:
+        return None
+    if 'c-' in modifiers:
+        data = _control(data)
+        if data is None:
+            return None
+    if not isinstance(data, bytes):
+        data = data.encode(encoding)
+    if 'm-' in modifiers:
+        data = b'\x1b' + data
+    return data
+
+
+def _control(data):
+    if not isinstance(data, six.text_type):
+        data = data.decode('latin-1')
+    if len(data) != 1:
+        return None
+    if data == '?':
+        return b'\x7f'
+    if data == ' ':
+        return b'\x00'
+    code = ord(data.upper())
+    if 0x40 <= code <= 0x5f:
+        return six.int2byte(code & 0x1f)
+    return None
+
+
+def _terminfo_directories():
+    directories = []
+    if os.environ.get('TERMINFO'):
+        directories.append(os.environ['TERMINFO'])
+    directories.append(os.path.expanduser('~/.terminfo'))
+    for directory in os.environ.get('TERMINFO_DIRS', '').split(':'):
+        if directory:
+            directories.append(directory)
+    directories.extend(['/etc/terminfo', '/lib/terminfo',
+                        '/usr/share/terminfo', '/usr/lib/terminfo'])
+    return directories
+
+
+def _read_terminfo(term):
+    for directory in _terminfo_directories():
+        for initial in (term[0], '{0:02x}'.format(ord(term[0]))):
+            path = os.path.join(directory, initial, term)
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return _parse_terminfo(f.read())
+    return {}
+
+
+def _parse_terminfo(data):
+    magic, names, booleans, numbers, strings, size = struct.unpack(
+        '<6h', data[:12])
+    if magic == 0o432:
+        number_size = 2
+    elif magic == 0o1036:
+        number_size = 4
+    else:
+        raise ValueError('not a terminfo entry')
+    offset = 12 + names + booleans
+    offset += offset % 2
+    offset += numbers * number_size
+    offsets = struct.unpack('<{0}h'.format(strings),
+                            data[offset:offset + strings * 2])
+    table = data[offset + strings * 2:offset + strings * 2 + size]
+    keys = {}
+    for name, index in _CAPABILITIES.items():
+        if index < strings and offsets[index] >= 0:
+            start = offsets[index]
+            keys[name] = table[start:table.index(b'\0', start)]
+    return keys
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Messages and errors of *Vim* collected without extra commands.
+
+*Vim* compares ``:messages`` and ``v:errmsg``
+with the previous ones whenever it becomes idle (``SafeState``)
+and appends new entries into a file read by ``Vim``.
+Uncaught exceptions are reported with their ``v:exception``.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     vim.command('echomsg "spam"', False)
+...     vim.command('nosuchcommand', False)
+...     [message.text for message in vim.messages()]
+...     [error.text for error in vim.errors()]
+...
+['spam', 'E492: Not an editor command: nosuchcommand']
+['E492: Not an editor command: nosuchcommand']
+
+.. note:: Messages are collected only if *Vim* supports ``SafeState``
+          (8.1.2047 or later). A message shown at a hit-enter prompt
+          is collected after the prompt is dismissed.
+          The comparison costs a ``:messages`` call for each key
+          in Normal mode, and messages in Insert mode are collected
+          after leaving it.
+"""
+
+import collections
+import io
+import json
+import os
+import shutil
+import tempfile
+
+
+__all__ = ['Message', 'MessageLog', 'VimError']
+
+
+#: a message of *Vim*.
+#: ``sequence`` starts from 1 and ``kind`` is ``'message'``, ``'error'``
+#: or ``'exception'``, whose ``text`` is ``v:exception``
+Message = collections.namedtuple('Message', ['sequence', 'kind', 'text'])
+
+
+class VimError(RuntimeError):
+    """
+    An error raised when *Vim* reports errors during an operation.
+
+    :ivar list errors: ``Message`` objects of the errors
+    """
+    def __init__(self, errors):
+        super(VimError, self).__init__('\n'.join(error.text
+                                                 for error in errors))
+        self.errors = errors
+
+
+class MessageLog(object):
+    """
+    A class reading messages appended by *Vim* into a file.
+    """
+    def __init__(self, encoding='utf-8', maxlen=1000):
+        """
+        :param string encoding: encoding of the file
+        :param int maxlen: number of recent messages to keep
+        """
+        self._encoding = encoding
+        self._directory = tempfile.mkdtemp(prefix='headlessvim-')
+        self._path = os.path.join(self._directory, 'messages')
+        self._messages = collections.deque(maxlen=maxlen)
+        self._offset = 0
+        self._sequence = 0
+
+    def read(self):
+        """
+        Read messages appended since the last call.
+        """
+        try:
+            with io.open(self._path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except (IOError, OSError):
+            return
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        for line in data[:end].splitlines():
+            record = json.loads(line.decode(self._encoding))
+            self._sequence += 1
+            self._messages.append(Message(self._sequence, record['kind'],
+                                          record['text']))
+
+    def messages(self, since=0):
+        """
+        :param int since: sequence number of the last known message
+        :return: messages after ``since``
+        :rtype: list of Message
+        """
+        self.read()
+        return [message for message in self._messages
+                if message.sequence > since]
+
+    def errors(self, since=0):
+        """
+        :param int since: sequence number of the last known message
+        :return: errors and exceptions after ``since``
+        :rtype: list of Message
+        """
+        return [message for message in self.messages(since)
+                if message.kind in ('error', 'exception')]
+
+    def close(self):
+        """
+        Remove the file.
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    @property
+    def path(self):
+        """
+        :return: path to the file *Vim* writes
+        :rtype: string
+        """
+        return self._path
+
+    @property
+    def sequence(self):
+        """
+        :return: sequence number of the last message read
+        :rtype: int
+        """
+        return self._sequence
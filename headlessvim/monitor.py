@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Resource usage of the *Vim* process read from ``/proc``.
+
+``Monitor`` samples the usage in a background thread at an interval
+and keeps them as a time series.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open(monitor=True) as vim:
+...     usage = vim.resource_usage()
+...     usage.rss > 0
+...     len(vim.monitor.samples) >= 1
+...
+True
+True
+"""
+
+import collections
+import os
+import threading
+import weakref
+
+from . import stats
+
+
+__all__ = ['Monitor', 'Usage', 'read_usage']
+
+
+#: resource usage of a process.
+#: ``rss`` and ``peak_rss`` are in bytes, ``cpu_time`` is in seconds
+#: and ``time`` is the value of ``stats.clock`` at sampling
+Usage = collections.namedtuple('Usage', ['time', 'rss', 'peak_rss',
+                                         'cpu_time', 'fds'])
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def read_usage(pid):
+    """
+    Read resource usage of a process from ``/proc``.
+
+    :param int pid: process id
+    :return: resource usage
+    :rtype: Usage
+    :raises EnvironmentError: if ``/proc`` of the process is not readable
+    """
+    directory = '/proc/{0}'.format(pid)
+    now = stats.clock()
+    with open(os.path.join(directory, 'stat'), 'rb') as f:
+        stat = f.read()
+    # the command name may contain spaces and parentheses
+    fields = stat[stat.rindex(b')') + 2:].split()
+    cpu_time = float(int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    rss = int(fields[21]) * _PAGE_SIZE
+    peak_rss = rss
+    with open(os.path.join(directory, 'status'), 'rb') as f:
+        for line in f:
+            if line.startswith(b'VmHWM:'):
+                peak_rss = int(line.split()[1]) * 1024
+                break
+    fds = len(os.listdir(os.path.join(directory, 'fd')))
+    return Usage(now, rss, peak_rss, cpu_time, fds)
+
+
+class Monitor(object):
+    """
+    A class sampling resource usage of a ``Vim`` object
+    in a background thread.
+    """
+    def __init__(self, interval=1.0, maxlen=None):
+        """
+        :param float interval: seconds between samples
+        :param maxlen: number of recent samples to keep, None to keep all
+        :type maxlen: None or int
+        """
+        self._interval = interval
+        self._samples = collections.deque(maxlen=maxlen)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, vim):
+        """
+        Take a sample and start sampling ``vim`` until ``stop`` is called.
+        Samples are skipped while the process is not running.
+
+        :param Vim vim: ``Vim`` object to monitor
+        """
+        self.stop()
+        self._stopped.clear()
+        self.sample(vim)
+        self._thread = threading.Thread(target=self._run,
+                                        args=(weakref.ref(vim),))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self, vim):
+        """
+        Take a sample immediately.
+
+        :param Vim vim: ``Vim`` object to monitor
+        :return: resource usage
+        :rtype: Usage
+        """
+        usage = read_usage(vim.pid)
+        self._samples.append(usage)
+        return usage
+
+    def series(self, field):
+        """
+        :param string field: a field of ``Usage``
+        :return: (time, value) of samples
+        :rtype: list of (float, number)
+        """
+        return [(usage.time, getattr(usage, field))
+                for usage in list(self._samples)]
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of samples
+        :rtype: dict
+        """
+        samples = list(self._samples)
+        return dict((field, [getattr(usage, field) for usage in samples])
+                    for field in Usage._fields)
+
+    @property
+    def interval(self):
+        """
+        :return: seconds between samples
+        :rtype: float
+        """
+        return self._interval
+
+    @property
+    def samples(self):
+        """
+        :return: samples in order of time
+        :rtype: list of Usage
+        """
+        return list(self._samples)
+
+    def _run(self, ref):
+        while True:
+            self._stopped.wait(self._interval)
+            if self._stopped.is_set():
+                return
+            vim = ref()
+            if vim is None:
+                return
+            try:
+                self.sample(vim)
+            except EnvironmentError:
+                # the process exited or is being respawned
+                pass
+            del vim
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A harness measuring how a command scales with the size of a buffer.
+
+Synthetic buffers of increasing sizes are loaded into *Vim*
+and the command is timed by ``reltime()`` inside *Vim*
+to exclude overhead of ``headlessvim``.
+The complexity is fitted to the median times.
+
+Run ``python -m headlessvim.perf COMMAND`` to print results as JSON.
+
+Example:
+
+>>> from headlessvim import perf
+>>> scaling = perf.scale('%s/spam/ham/ge', sizes=[1000, 2000], repeat=1)
+>>> [point.size for point in scaling.points]
+[1000, 2000]
+>>> scaling.complexity in dict(perf.COMPLEXITIES)
+True
+"""
+
+import collections
+import io
+import json
+import math
+import optparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import six
+
+from .arguments import quote
+from .bench import summarize
+
+
+__all__ = ['COMPLEXITIES', 'GENERATORS', 'Point', 'Scaling', 'fit', 'main',
+           'scale']
+
+
+#: candidate complexities as a list of (name, function of the size)
+COMPLEXITIES = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log(n)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log(n)),
+    ('O(n^2)', lambda n: float(n) ** 2),
+    ('O(n^3)', lambda n: float(n) ** 3),
+]
+
+#: a point of the scaling curve.
+#: ``size`` is the number of lines and ``summary`` is seconds
+#: summarized by ``bench.summarize``
+Point = collections.namedtuple('Point', ['size', 'summary'])
+
+_WORDS = ('spam', 'ham', 'egg', 'bacon', 'sausage', 'lobster', 'thermidor',
+          'truffle', 'pate', 'brandy', 'fried', 'baked', 'beans', 'shallots',
+          'aubergines', 'crevettes', 'mornay', 'sauce', 'garnished', 'with')
+
+# times shorter than the resolution of reltime() are treated as this
+_EPSILON = 1e-6
+
+
+def _generate_text(size):
+    generator = random.Random(size)
+    return [' '.join(generator.choice(_WORDS)
+                     for _ in range(generator.randint(4, 16)))
+            for _ in range(size)]
+
+
+def _generate_code(size):
+    generator = random.Random(size)
+    lines = []
+    while len(lines) < size:
+        name = generator.choice(_WORDS)
+        value = generator.randint(0, 1000)
+        lines.extend([
+            'def {0}_{1}(spam, ham):'.format(name, len(lines)),
+            '    if spam > {0}:'.format(value),
+            '        return ham + {0!r}'.format(name),
+            '    return spam',
+            '',
+        ])
+    return lines[:size]
+
+
+def _generate_json(size):
+    generator = random.Random(size)
+    lines = ['[']
+    for index in range(size - 2):
+        item = {'id': index, 'name': generator.choice(_WORDS),
+                'value': generator.random()}
+        lines.append('  {0},'.format(json.dumps(item, sort_keys=True)))
+    lines.append('  null')
+    lines.append(']')
+    return lines[:size]
+
+
+#: generators of synthetic buffers as a dict of
+#: (name, function takes the number of lines and returns lines).
+#: buffers are same for same sizes
+GENERATORS = {
+    'text': _generate_text,
+    'code': _generate_code,
+    'json': _generate_json,
+}
+
+
+def fit(sizes, times):
+    """
+    Fit a complexity to times.
+
+    :param sizes: sizes of buffers
+    :type sizes: list of int
+    :param times: seconds taken for each size
+    :type times: list of float
+    :return: name of the complexity in ``COMPLEXITIES``
+             which has the least relative error,
+             and the exponent of the power law (slope in log-log scale)
+    :rtype: (string, float)
+    """
+    times = [max(time, _EPSILON) for time in times]
+    best = None
+    for name, function in COMPLEXITIES:
+        values = [function(size) for size in sizes]
+        if not any(values):
+            # such as O(log n) for buffers of a line
+            continue
+        coefficient = (sum(t * v for t, v in zip(times, values)) /
+                       sum(v * v for v in values))
+        error = sum(((coefficient * v - t) / t) ** 2
+                    for t, v in zip(times, values))
+        if best is None or error < best[1]:
+            best = (name, error)
+    exponent = 0.0
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(time) for time in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance:
+        exponent = sum((x - mean_x) * (y - mean_y)
+                       for x, y in zip(xs, ys)) / variance
+    return best[0], exponent
+
+
+class Scaling(object):
+    """
+    A class representing times of a command for sizes of buffers.
+    """
+    def __init__(self, command, points):
+        """
+        :param string command: the command measured
+        :param points: times for each size in order of size
+        :type points: list of Point
+        """
+        self._command = command
+        self._points = points
+        self._complexity, self._exponent = fit(
+            [point.size for point in points],
+            [point.summary['median'] for point in points])
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of the scaling
+        :rtype: dict
+        """
+        return {
+            'command': self._command,
+            'points': [point._asdict() for point in self._points],
+            'complexity': self._complexity,
+            'exponent': self._exponent,
+        }
+
+    @property
+    def command(self):
+        """
+        :return: the command measured
+        :rtype: string
+        """
+        return self._command
+
+    @property
+    def points(self):
+        """
+        :return: times for each size in order of size
+        :rtype: list of Point
+        """
+        return list(self._points)
+
+    @property
+    def complexity(self):
+        """
+        :return: the fitted complexity such as ``'O(n)'``
+        :rtype: string
+        """
+        return self._complexity
+
+    @property
+    def exponent(self):
+        """
+        :return: the exponent of the power law fitted to median times,
+                 about 2 for quadratic commands
+        :rtype: float
+        """
+        return self._exponent
+
+
+def scale(command, sizes=(1000, 10000, 100000), generator='text', repeat=3,
+          suffix='.txt', vim=None, timeout=None, **kwargs):
+    """
+    Measure a command for buffers of sizes.
+    The buffer is reloaded before each run of the command.
+
+    :param string command: an Ex command to measure
+    :param sizes: numbers of lines of buffers
+    :type sizes: list of number
+    :param generator: name in ``GENERATORS`` or a function
+                      takes the number of lines and returns lines
+    :type generator: string or function
+    :param int repeat: number of runs for each size
+    :param string suffix: suffix of files of buffers to detect filetypes
+    :param vim: ``Vim`` object to use, a new one is opened if None
+    :type vim: None or Vim
+    :param timeout: seconds to wait each run of the command,
+                    a multiple of ``vim.timeout`` if None
+    :type timeout: None or float
+    :param kwargs: arguments passed to ``headlessvim.open``
+    :return: the scaling
+    :rtype: Scaling
+    :raises ValueError: if ``generator`` is unknown
+    :raises RuntimeError: if the command fails or does not finish in time
+    """
+    if isinstance(generator, six.string_types):
+        if generator not in GENERATORS:
+            raise ValueError('generator {0} is not found'.format(generator))
+        generator = GENERATORS[generator]
+    opened = vim is None
+    if opened:
+        from . import open
+        vim = open(**kwargs)
+    directory = tempfile.mkdtemp(prefix='headlessvim-')
+    try:
+        points = []
+        for size in sorted(int(size) for size in sizes):
+            path = os.path.join(directory, 'buffer{0}{1}'.format(size, suffix))
+            with io.open(path, 'w', encoding=vim.encoding) as f:
+                for line in generator(size):
+                    f.write(six.text_type(line) + u'\n')
+            samples = []
+            for _ in range(repeat):
+                vim.command('execute "edit!" fnameescape({0})'.format(
+                    quote(path)), False)
+                result = vim._call_json('headlessvim#time', quote(command),
+                                        timeout=timeout)
+                samples.append(result['time'])
+            vim.command('silent! bwipeout!', False)
+            points.append(Point(size, summarize(samples)))
+        return Scaling(command, points)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        if opened:
+            vim.close()
+
+
+def main(argv=None):
+    """
+    Entry point of ``python -m headlessvim.perf``.
+
+    :param argv: command line arguments
+    :type argv: None or list of string
+    :return: exit status
+    :rtype: int
+    """
+    parser = optparse.OptionParser(usage='%prog [options] COMMAND')
+    parser.add_option('-s', '--sizes', default='1000,10000,100000',
+                      help='comma separated numbers of lines of buffers')
+    parser.add_option('-g', '--generator', default='text',
+                      help='generator of buffers: {0}'.format(
+                          ', '.join(sorted(GENERATORS))))
+    parser.add_option('-n', '--repeat', type='int', default=3,
+                      help='number of runs for each size')
+    parser.add_option('--suffix', default='.txt',
+                      help='suffix of files of buffers')
+    parser.add_option('-o', '--output', metavar='PATH',
+                      help='write JSON to PATH instead of stdout')
+    parser.add_option('-e', '--executable', default='vim',
+                      help='command name to execute Vim')
+    parser.add_option('-a', '--args',
+                      help='arguments to execute Vim')
+    options, args = parser.parse_args(argv)
+    if len(args) != 1:
+        parser.error('COMMAND is required')
+    try:
+        sizes = [int(float(size)) for size in options.sizes.split(',')]
+    except ValueError:
+        parser.error('invalid --sizes: {0}'.format(options.sizes))
+    env = dict(os.environ, LANG='C')
+    try:
+        scaling = scale(args[0], sizes,
+                        generator=options.generator,
+                        repeat=options.repeat,
+                        suffix=options.suffix,
+                        executable=options.executable,
+                        args=options.args,
+                        env=env)
+    except ValueError as e:
+        parser.error(str(e))
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(scaling.as_dict(), f, indent=2, sort_keys=True)
+    else:
+        json.dump(scaling.as_dict(), sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A pool of warm ``Vim`` objects.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.Pool(size=1) as pool:
+...     with pool.vim() as vim:
+...         vim.echo('"spam"')
+...
+'spam'
+"""
+
+import contextlib
+import threading
+
+
+__all__ = ['Pool']
+
+
+class Pool(object):
+    """
+    A class keeping opened ``Vim`` objects to reuse.
+
+    A ``Vim`` object released to the pool is reset by ``Vim.reset``.
+    At most ``size`` objects are kept, the others are closed on release.
+    At most ``limit`` objects are taken at the same time,
+    ``acquire`` waits for a release if there are already.
+    ``Pool`` object behaves as ``contextmanager``.
+    """
+    def __init__(self, size=1, limit=None, **kwargs):
+        """
+        :param int size: maximum number of idle ``Vim`` objects to keep
+        :param limit: maximum number of ``Vim`` objects taken at a time,
+                      unlimited if None
+        :type limit: None or int
+        :param kwargs: arguments passed to ``headlessvim.open``
+        """
+        self._size = size
+        self._limit = limit
+        self._kwargs = kwargs
+        self._idle = []
+        self._acquired = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def acquire(self):
+        """
+        Take an idle ``Vim`` object or open a new one.
+        Wait until another one is released if ``self.limit`` is reached.
+
+        :return: a ``Vim`` object
+        :rtype: Vim
+        :raises ValueError: if the pool is closed
+        """
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise ValueError('acquire from closed pool')
+                if self._limit is None or self._acquired < self._limit:
+                    break
+                self._released.wait()
+            self._acquired += 1
+        try:
+            return self._take()
+        except BaseException:
+            self._leave()
+            raise
+
+    def release(self, vim):
+        """
+        Reset ``vim`` and give it back to the pool.
+        ``vim`` is closed if the pool is full or resetting failed.
+
+        :param Vim vim: a ``Vim`` object taken by ``acquire``
+        """
+        try:
+            self._put(vim)
+        finally:
+            self._leave()
+
+    @contextlib.contextmanager
+    def vim(self):
+        """
+        Take a ``Vim`` object during ``with`` statement.
+        """
+        vim = self.acquire()
+        try:
+            yield vim
+        finally:
+            self.release(vim)
+
+    def fill(self, count=None):
+        """
+        Open ``Vim`` objects in advance.
+
+        :param int count: number of idle objects to reach,
+                          ``self.size`` if None
+        """
+        if count is None:
+            count = self._size
+        count = min(count, self._size)
+        while len(self._idle) < count:
+            vim = self._open()
+            with self._lock:
+                self._idle.append(vim)
+
+    def close(self):
+        """
+        Close all idle ``Vim`` objects.
+        ``Vim`` objects released after this are closed immediately.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._released.notify_all()
+        for vim in idle:
+            vim.close()
+
+    @property
+    def size(self):
+        """
+        :return: maximum number of idle ``Vim`` objects to keep
+        :rtype: int
+        """
+        return self._size
+
+    @property
+    def limit(self):
+        """
+        :return: maximum number of ``Vim`` objects taken at a time,
+                 None if unlimited
+        :rtype: None or int
+        """
+        return self._limit
+
+    @property
+    def acquired(self):
+        """
+        :return: number of ``Vim`` objects taken and not released
+        :rtype: int
+        """
+        return self._acquired
+
+    @property
+    def idle(self):
+        """
+        :return: number of idle ``Vim`` objects
+        :rtype: int
+        """
+        return len(self._idle)
+
+    @property
+    def kwargs(self):
+        """
+        :return: arguments passed to ``headlessvim.open``
+        :rtype: dict
+        """
+        return dict(self._kwargs)
+
+    def _take(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                vim = self._idle.pop()
+            if vim.is_alive():
+                return vim
+            vim.close()
+        return self._open()
+
+    def _put(self, vim):
+        if not vim.is_alive():
+            vim.close()
+            return
+        try:
+            vim.reset()
+        except Exception:
+            vim.close()
+            raise
+        with self._lock:
+            if not self._closed and len(self._idle) < self._size:
+                self._idle.append(vim)
+                return
+        vim.close()
+
+    def _leave(self):
+        with self._lock:
+            self._acquired -= 1
+            self._released.notify()
+
+    def _open(self):
+        from . import open
+        return open(**self._kwargs)
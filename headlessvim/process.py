@@ -6,29 +6,75 @@
 """
 
 import contextlib
-import distutils.spawn
 import fcntl
 import os
 import pty
 import select
+import signal
+import struct
 import subprocess
+import termios
+
+import six
+
+from . import stats as _stats
+
+
+#: resolved executables as a dict of ((name, PATH), path)
+_EXECUTABLES = {}
+
+
+def find_executable(name):
+    """
+    Find the absolute path to an executable on ``PATH``.
+    Results are cached per pair of ``name`` and ``PATH``.
+
+    :param string name: command name or path to the executable
+    :return: absolute path to the executable, None if not found
+    :rtype: None or string
+    """
+    key = (name, os.environ.get('PATH', os.defpath))
+    if key not in _EXECUTABLES:
+        path = _which(name)
+        if path is not None:
+            path = os.path.abspath(path)
+        _EXECUTABLES[key] = path
+    return _EXECUTABLES[key]
+
+
+def _which(name):
+    try:
+        from shutil import which
+    except ImportError:
+        from distutils.spawn import find_executable as which
+    return which(name)
 
 
 class Process(object):
     """
     A class representing a background *Vim* process.
     """
-    def __init__(self, executable, args, env):
+    def __init__(self, executable, args, env, stats=None, size=None,
+                 rlimits=None):
         """
         :param str executable: command name to execute *Vim*
         :param args: arguments to execute *Vim*
         :type args: None or string or list of string
         :param env: environment variables to execute *Vim*
         :type env: None or dict of (string, string)
+        :param stats: where to record counters
+        :type stats: None or stats.Stats
+        :param size: (columns, lines) of the terminal
+        :type size: None or (int, int)
+        :param rlimits: resource limits set by ``setrlimit`` in the process
+        :type rlimits: None or list of (int, (int, int))
         """
-        self._executable = distutils.spawn.find_executable(executable)
+        self._executable = find_executable(executable)
         self._args = args
         self._env = env
+        self._stats = stats
+        self._size = size
+        self._rlimits = rlimits
         self._open_process()
 
     def terminate(self):
@@ -47,17 +93,37 @@ class Process(object):
         with self._close():
             self._process.kill()
 
-    def check_readable(self, timeout):
+    def check_readable(self, timeout, fds=()):
         """
-        Poll ``self.stdout`` and return True if it is readable.
+        Poll ``self.stdout`` and ``fds``,
+        and return True if any of them is readable.
 
         :param float timeout: seconds to wait I/O
+        :param fds: other file descriptors to poll together
+        :type fds: iterable of int
         :return: True if readable, else False
         :rtype: boolean
         """
-        rlist, wlist, xlist = select.select([self._stdout], [], [], timeout)
+        start = _stats.clock()
+        rlist, wlist, xlist = select.select([self._stdout] + list(fds), [], [],
+                                            timeout)
+        if self._stats is not None:
+            self._stats.selects += 1
+            self._stats.idle_time += _stats.clock() - start
         return bool(len(rlist))
 
+    def set_window_size(self, size):
+        """
+        Set the window size of the terminal.
+        The terminal notifies the process by ``SIGWINCH``
+        because it is the controlling terminal of the process.
+
+        :param size: (columns, lines) of the terminal
+        :type size: (int, int)
+        """
+        self._size = size
+        self._set_window_size(self._stdout.fileno(), size)
+
     def is_alive(self):
         """
         Check if the process is alive.
@@ -75,6 +141,14 @@ class Process(object):
         """
         return self._executable
 
+    @property
+    def pid(self):
+        """
+        :return: process id
+        :rtype: int
+        """
+        return self._process.pid
+
     @property
     def args(self):
         """
@@ -83,6 +157,14 @@ class Process(object):
         """
         return self._args
 
+    @property
+    def window_size(self):
+        """
+        :return: (columns, lines) of the terminal if specified
+        :rtype: None or (int, int)
+        """
+        return self._size
+
     @property
     def stdin(self):
         """
@@ -102,14 +184,33 @@ class Process(object):
         return self._stdout
 
     def _open_process(self):
+        start = _stats.clock()
         master, slave = pty.openpty()
-        self._process = subprocess.Popen(self._args,
-                                         executable=self._executable,
-                                         stdin=slave,
-                                         stdout=slave,
-                                         stderr=subprocess.STDOUT,
-                                         env=self._env)
+        if self._size is not None:
+            self._set_window_size(slave, self._size)
+        if (_posix_spawn is not None and self._executable is not None
+                and not self._rlimits):
+            self._process = _SpawnedProcess(self._executable, self._args,
+                                            self._env, slave)
+        else:
+            kwargs = {}
+            if six.PY3:
+                # setsid by preexec_fn is not safe with threads
+                kwargs['start_new_session'] = True
+            self._process = subprocess.Popen(self._args,
+                                             executable=self._executable,
+                                             stdin=slave,
+                                             stdout=slave,
+                                             stderr=subprocess.STDOUT,
+                                             env=self._env,
+                                             preexec_fn=self._prepare,
+                                             **kwargs)
+        self._slave = slave
         self._open_stream(master)
+        if self._stats is not None:
+            elapsed = _stats.clock() - start
+            self._stats.spawn_time += elapsed
+            self._stats.record('spawn', elapsed)
 
     def _open_stream(self, fd):
         self._make_nonblock(fd)
@@ -121,6 +222,9 @@ class Process(object):
             self._stdout.close()
         if not self._stdin.closed:
             self._stdin.close()
+        if self._slave is not None:
+            os.close(self._slave)
+            self._slave = None
 
     @contextlib.contextmanager
     def _close(self):
@@ -128,5 +232,75 @@ class Process(object):
         yield
         self._process.wait()
 
+    def _prepare(self):
+        # only what subprocess cannot do is done here
+        if not six.PY3:
+            os.setsid()
+        # make the terminal controlling to deliver signals such as CTRL-C
+        fcntl.ioctl(0, termios.TIOCSCTTY, 0)
+        if self._rlimits:
+            import resource
+            for limit, value in self._rlimits:
+                resource.setrlimit(limit, value)
+
+    def _set_window_size(self, fd, size):
+        columns, lines = size
+        winsize = struct.pack('HHHH', lines, columns, 0, 0)
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, winsize)
+
     def _make_nonblock(self, fd):
         fcntl.fcntl(fd, fcntl.F_SETFL, os.O_NONBLOCK)
+
+
+_posix_spawn = getattr(os, 'posix_spawn', None)
+
+
+class _SpawnedProcess(object):
+    """
+    A minimal substitute of ``subprocess.Popen`` spawned by ``os.posix_spawn``
+    in a new session with the terminal of ``fd`` as the controlling terminal
+    and the standard input, output and error.
+    """
+    def __init__(self, executable, args, env, fd):
+        if isinstance(args, six.string_types):
+            args = [args]
+        if env is None:
+            env = os.environ
+        # opening the terminal after setsid makes it controlling
+        file_actions = [(os.POSIX_SPAWN_OPEN, 0, os.ttyname(fd), os.O_RDWR,
+                         0),
+                        (os.POSIX_SPAWN_DUP2, 0, 1),
+                        (os.POSIX_SPAWN_DUP2, 0, 2)]
+        self.pid = _posix_spawn(executable, list(args), env,
+                                file_actions=file_actions, setsid=True,
+                                setsigdef=(signal.SIGPIPE, signal.SIGXFSZ))
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid == self.pid:
+                self._set_returncode(status)
+        return self.returncode
+
+    def wait(self):
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, 0)
+            self._set_returncode(status)
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def _set_returncode(self, status):
+        if os.WIFSIGNALED(status):
+            self.returncode = -os.WTERMSIG(status)
+        else:
+            self.returncode = os.WEXITSTATUS(status)
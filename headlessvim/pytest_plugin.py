@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A `pytest <http://pytest.org>`_ plugin providing ``vim`` fixtures.
+
+The plugin is registered automatically when ``headlessvim`` is installed.
+
+* ``vim``: a warm ``Vim`` object reset after each test
+* ``vim_factory``: a function to take more ``Vim`` objects
+* ``vim_pool``: the ``Pool`` shared in the current process
+
+``Vim`` objects are reused within a process (an ``xdist`` worker).
+Recent operations of ``Vim`` objects taken by a failed test
+are attached to its report as a ``headlessvim trace`` section.
+The total number of idle ``Vim`` objects is limited by ``--vim-concurrency``
+and divided among ``xdist`` workers.
+Workers beyond the limit keep no idle objects
+and open a ``Vim`` object for each test instead.
+
+Example:
+
+.. code:: python
+
+    def test_spam(vim):
+        assert vim.echo('"spam"') == 'spam'
+"""
+
+import os
+
+import pytest
+
+from . import stats
+from .pool import Pool
+
+
+#: the name of ``user_properties`` recording harness overhead
+OVERHEAD_PROPERTY = 'headlessvim_overhead'
+
+#: the title of report sections of traces
+TRACE_SECTION = 'headlessvim trace'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('headlessvim')
+    group.addoption('--vim-executable',
+                    help='command name to execute Vim')
+    group.addoption('--vim-args',
+                    help='arguments to execute Vim')
+    group.addoption('--vim-timeout', type=float,
+                    help='seconds to wait I/O')
+    group.addoption('--vim-profile',
+                    help='launch profile of Vim')
+    group.addoption('--vim-concurrency', type=int,
+                    help='maximum number of idle Vim processes '
+                         'across all workers')
+    group.addoption('--vim-overhead', type=int, metavar='N',
+                    help='report N tests with the largest harness overhead')
+    parser.addini('vim_executable', 'command name to execute Vim',
+                  default='vim')
+    parser.addini('vim_args', 'arguments to execute Vim', default=None)
+    parser.addini('vim_timeout', 'seconds to wait I/O', default='0.25')
+    parser.addini('vim_profile', 'launch profile of Vim', default='default')
+    parser.addini('vim_concurrency',
+                  'maximum number of idle Vim processes across all workers',
+                  default='0')
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(OverheadReporter(config),
+                                  'headlessvim-overhead')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if not report.failed:
+        return
+    for vim, _ in getattr(item, '_headlessvim_taken', ()):
+        if vim.trace is not None:
+            report.sections.append((TRACE_SECTION, vim.trace.format()))
+
+
+def pool_size(concurrency, workers, worker=0):
+    """
+    Calculate the number of idle ``Vim`` objects kept by a worker.
+    The sum for all workers never exceeds ``concurrency``.
+
+    :param int concurrency: total number for all workers,
+                            0 or less means one for each worker
+    :param int workers: number of workers
+    :param int worker: index of the worker from 0
+    :return: number of idle ``Vim`` objects for the worker
+    :rtype: int
+    """
+    if concurrency <= 0:
+        return 1
+    workers = max(1, workers)
+    size = concurrency // workers
+    if worker < concurrency % workers:
+        size += 1
+    return size
+
+
+class OverheadReporter(object):
+    """
+    A plugin object summarizing harness overhead recorded by fixtures.
+    """
+    def __init__(self, config):
+        self._config = config
+        self._overheads = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != 'teardown':
+            return
+        overhead = sum(value
+                       for name, value in report.user_properties
+                       if name == OVERHEAD_PROPERTY)
+        if overhead:
+            self._overheads[report.nodeid] = overhead
+
+    def pytest_terminal_summary(self, terminalreporter):
+        count = _option(self._config, 'vim_overhead', None)
+        if not count or not self._overheads:
+            return
+        terminalreporter.write_sep('=', 'headlessvim overhead')
+        terminalreporter.write_line('{0:.3f}s total'.format(
+            sum(self._overheads.values())))
+        ordered = sorted(self._overheads.items(),
+                         key=lambda item: item[1], reverse=True)
+        for nodeid, overhead in ordered[:int(count)]:
+            terminalreporter.write_line('{0:.3f}s {1}'.format(overhead,
+                                                              nodeid))
+
+    @property
+    def overheads(self):
+        """
+        :return: harness overhead of each test in seconds
+        :rtype: dict of (string, float)
+        """
+        return dict(self._overheads)
+
+
+@pytest.fixture(scope='session')
+def vim_pool(request):
+    """
+    The ``Pool`` of ``Vim`` objects for the current process.
+    """
+    config = request.config
+    workers = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+    # such as gw0
+    worker = int(os.environ.get('PYTEST_XDIST_WORKER', 'gw0')[2:] or 0)
+    concurrency = int(_option(config, 'vim_concurrency', 'vim_concurrency'))
+    kwargs = {
+        'executable': _option(config, 'vim_executable', 'vim_executable'),
+        'args': _option(config, 'vim_args', 'vim_args'),
+        'timeout': float(_option(config, 'vim_timeout', 'vim_timeout')),
+        'profile': _option(config, 'vim_profile', 'vim_profile'),
+    }
+    pool = Pool(pool_size(concurrency, workers, worker), **kwargs)
+    request.addfinalizer(pool.close)
+    return pool
+
+
+@pytest.fixture
+def vim_factory(request, vim_pool):
+    """
+    A function to take ``Vim`` objects reset after the test.
+    If keyword arguments are given, a new ``Vim`` object is opened with them
+    and closed after the test instead of using the pool.
+    """
+    taken = []
+    request.node._headlessvim_taken = taken
+
+    def factory(**kwargs):
+        start = stats.clock()
+        if kwargs:
+            from . import open
+            vim = open(**dict(vim_pool.kwargs, **kwargs))
+            taken.append((vim, False))
+        else:
+            vim = vim_pool.acquire()
+            taken.append((vim, True))
+        _add_overhead(request, stats.clock() - start)
+        return vim
+
+    def finalize():
+        start = stats.clock()
+        try:
+            for vim, pooled in taken:
+                if pooled:
+                    vim_pool.release(vim)
+                else:
+                    vim.close()
+        finally:
+            _add_overhead(request, stats.clock() - start)
+
+    request.addfinalizer(finalize)
+    return factory
+
+
+@pytest.fixture
+def vim(request, vim_factory):
+    """
+    A warm ``Vim`` object reset after the test.
+    """
+    return vim_factory()
+
+
+def _option(config, name, ini):
+    value = config.getoption(name)
+    if value is None and ini is not None:
+        value = config.getini(ini)
+    return value
+
+
+def _add_overhead(request, elapsed):
+    request.node.user_properties.append((OVERHEAD_PROPERTY, elapsed))
@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Recording and replaying the raw byte stream between ``Vim`` and *Vim*.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open(record='vim.log') as vim: # doctest: +SKIP
+...     vim.send_keys('ispam\033')
+...
+>>> replay = headlessvim.replay('vim.log') # doctest: +SKIP
+>>> replay.seek(len(replay)) # doctest: +SKIP
+>>> replay.display_lines()[0].strip() # doctest: +SKIP
+'spam'
+
+A log consists of a header and records.
+The header is ``MAGIC`` followed by columns, lines and encoding of the screen.
+Each record is a kind (``READ``, ``WRITE`` or ``RESIZE``),
+seconds since the start of recording and a payload.
+"""
+
+import codecs
+import collections
+import struct
+import time
+
+import pyte
+import six
+
+from . import stats
+
+
+__all__ = ['Recorder', 'Record', 'Replay', 'replay',
+           'MAGIC', 'READ', 'WRITE', 'RESIZE']
+
+
+#: the first bytes of a log
+MAGIC = b'HVIMREC1'
+
+#: kind of a record read from *Vim*
+READ = b'r'
+
+#: kind of a record written to *Vim*
+WRITE = b'w'
+
+#: kind of a record of screen resizing, its payload is (columns, lines)
+RESIZE = b'z'
+
+_HEADER = struct.Struct('!HHB')
+_RECORD = struct.Struct('!cdI')
+_SIZE = struct.Struct('!HH')
+
+#: A record in a log.
+Record = collections.namedtuple('Record', 'kind time data')
+
+
+class Recorder(object):
+    """
+    A class writing a log.
+    """
+    def __init__(self, file, size, encoding):
+        """
+        :param file: path or binary file-like object to write
+        :type file: string or file-like object
+        :param size: (columns, lines) of the screen
+        :type size: (int, int)
+        :param string encoding: encoding of the stream
+        """
+        if isinstance(file, six.string_types):
+            self._file = open(file, 'wb')
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        encoded = encoding.encode('ascii')
+        self._file.write(MAGIC)
+        self._file.write(_HEADER.pack(size[0], size[1], len(encoded)))
+        self._file.write(encoded)
+        self._start = stats.clock()
+
+    def read(self, data):
+        """
+        Record bytes read from *Vim*.
+
+        :param bytes data: bytes read
+        """
+        self._record(READ, data)
+
+    def write(self, data):
+        """
+        Record bytes written to *Vim*.
+
+        :param bytes data: bytes written
+        """
+        self._record(WRITE, data)
+
+    def resize(self, size):
+        """
+        Record screen resizing.
+
+        :param size: (columns, lines) of the screen
+        :type size: (int, int)
+        """
+        self._record(RESIZE, _SIZE.pack(*size))
+
+    def close(self):
+        """
+        Flush the log and close it if it is opened by this object.
+        """
+        if self._file.closed:
+            return
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def _record(self, kind, data):
+        data = bytes(data)
+        elapsed = stats.clock() - self._start
+        self._file.write(_RECORD.pack(kind, elapsed, len(data)))
+        self._file.write(data)
+
+
+def replay(log):
+    """
+    Load a log to replay.
+
+    :param log: path or binary file-like object to read
+    :type log: string or file-like object
+    :return: a replay of the log
+    :rtype: Replay
+    """
+    return Replay(log)
+
+
+class Replay(object):
+    """
+    A class feeding a log into a screen offline.
+
+    A frame is the screen after a chunk of bytes read from *Vim*.
+    The frame 0 is the blank screen and ``len(replay)`` is the last one.
+    """
+    def __init__(self, log):
+        """
+        :param log: path or binary file-like object to read
+        :type log: string or file-like object
+        :raises ValueError: if ``log`` is not a valid log
+        """
+        if isinstance(log, six.string_types):
+            with open(log, 'rb') as f:
+                data = f.read()
+        else:
+            data = log.read()
+        self._parse(data)
+        self._frames = [index
+                        for index, record in enumerate(self._records)
+                        if record.kind == READ]
+        self._rewind()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __iter__(self):
+        return self.play()
+
+    def seek(self, frame):
+        """
+        Move to the given frame.
+
+        :param int frame: index of the frame, negative index is allowed
+        :raises IndexError: if ``frame`` is out of range
+        """
+        if frame < 0:
+            frame += len(self._frames) + 1
+        if not 0 <= frame <= len(self._frames):
+            raise IndexError('frame {0} is out of range'.format(frame))
+        if frame < self._frame:
+            self._rewind()
+        end = self._frames[frame - 1] + 1 if frame else 0
+        for record in self._records[self._position:end]:
+            self._apply(record)
+        self._position = end
+        self._frame = frame
+
+    def play(self, speed=None):
+        """
+        Replay frames from the current frame.
+
+        :param speed: ratio to the recorded speed, as fast as possible if None
+        :type speed: None or float
+        :return: index of each frame
+        :rtype: iterator of int
+        """
+        start = stats.clock()
+        offset = self.time
+        for frame in range(self._frame + 1, len(self._frames) + 1):
+            if speed:
+                record = self._records[self._frames[frame - 1]]
+                delay = (record.time - offset) / speed
+                delay -= stats.clock() - start
+                if delay > 0:
+                    time.sleep(delay)
+            self.seek(frame)
+            yield frame
+
+    def display(self):
+        """
+        :return: screen of the current frame as a text
+        :rtype: string
+        """
+        return '\n'.join(self.display_lines())
+
+    def display_lines(self):
+        """
+        :return: screen of the current frame as a list of strings
+        :rtype: list of string
+        """
+        return self._screen.display
+
+    @property
+    def frame(self):
+        """
+        :return: index of the current frame
+        :rtype: int
+        """
+        return self._frame
+
+    @property
+    def time(self):
+        """
+        :return: seconds since the start of recording of the current frame
+        :rtype: float
+        """
+        if not self._frame:
+            return 0.0
+        return self._records[self._frames[self._frame - 1]].time
+
+    @property
+    def records(self):
+        """
+        :return: all records in the log
+        :rtype: list of Record
+        """
+        return list(self._records)
+
+    @property
+    def screen(self):
+        """
+        :return: the screen of the current frame
+        :rtype: pyte.Screen
+        """
+        return self._screen
+
+    @property
+    def size(self):
+        """
+        :return: (columns, lines) of the screen at the start of recording
+        :rtype: (int, int)
+        """
+        return self._size
+
+    @property
+    def encoding(self):
+        """
+        :return: encoding of the stream
+        :rtype: string
+        """
+        return self._encoding
+
+    def _parse(self, data):
+        if not data.startswith(MAGIC):
+            raise ValueError('not a headlessvim log')
+        offset = len(MAGIC)
+        columns, lines, length = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        self._size = (columns, lines)
+        self._encoding = data[offset:offset + length].decode('ascii')
+        offset += length
+        self._records = []
+        while offset < len(data):
+            kind, elapsed, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            payload = data[offset:offset + length]
+            if len(payload) != length:
+                raise ValueError('truncated log')
+            offset += length
+            self._records.append(Record(kind, elapsed, payload))
+
+    def _rewind(self):
+        self._screen = pyte.Screen(*self._size)
+        self._stream = pyte.Stream()
+        self._stream.attach(self._screen)
+        self._decoder = codecs.getincrementaldecoder(self._encoding)('replace')
+        self._position = 0
+        self._frame = 0
+
+    def _apply(self, record):
+        if record.kind == READ:
+            self._stream.feed(self._decoder.decode(record.data))
+        elif record.kind == RESIZE:
+            columns, lines = _SIZE.unpack(record.data)
+            self._screen.resize(lines, columns)
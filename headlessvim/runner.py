@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A runner of tests written in *Vim* script.
+
+A script is sourced and its test functions are run inside *Vim*.
+Failures are collected from ``v:errors`` (``assert_*()`` functions)
+and uncaught exceptions, and reported back as a single JSON payload.
+``SetUp()`` and ``TearDown()`` are called around each test if defined.
+
+Example:
+
+>>> import headlessvim
+>>> source = '''
+... function! Test_spam()
+...   call assert_equal(4, 2 + 2)
+... endfunction
+... function! Test_ham()
+...   call assert_true(0)
+... endfunction
+... '''
+>>> with headlessvim.open() as vim:
+...     report = vim.run_script(source)
+...     report.passed
+...     [outcome.name for outcome in report.failures]
+...
+False
+['Test_ham']
+"""
+
+import collections
+import io
+import os
+import tempfile
+
+import six
+
+from .arguments import quote
+
+
+__all__ = ['Outcome', 'Report', 'run']
+
+
+#: a result of a test function, ``time`` is in seconds
+Outcome = collections.namedtuple('Outcome', ['name', 'errors', 'time'])
+
+
+class Report(object):
+    """
+    A class representing results of tests run by ``run``.
+    """
+    def __init__(self, outcomes, time):
+        """
+        :param outcomes: results of test functions
+        :type outcomes: list of Outcome
+        :param float time: seconds to run all tests
+        """
+        self._outcomes = outcomes
+        self._time = time
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of the report
+        :rtype: dict
+        """
+        return {
+            'tests': [outcome._asdict() for outcome in self._outcomes],
+            'time': self._time,
+        }
+
+    @property
+    def outcomes(self):
+        """
+        :return: results of test functions in order of name
+        :rtype: list of Outcome
+        """
+        return list(self._outcomes)
+
+    @property
+    def failures(self):
+        """
+        :return: results of failed test functions
+        :rtype: list of Outcome
+        """
+        return [outcome for outcome in self._outcomes if outcome.errors]
+
+    @property
+    def passed(self):
+        """
+        :return: True if all tests passed
+        :rtype: boolean
+        """
+        return not self.failures
+
+    @property
+    def time(self):
+        """
+        :return: seconds to run all tests measured in *Vim*
+        :rtype: float
+        """
+        return self._time
+
+
+def run(vim, script, pattern='^Test_', timeout=None):
+    """
+    Source a script and run its test functions inside *Vim*.
+
+    :param Vim vim: ``Vim`` object to run tests
+    :param string script: path to a script or source of a script
+    :param string pattern: regular expression of names of test functions
+    :param timeout: seconds to wait all tests,
+                    a multiple of ``vim.timeout`` if None
+    :type timeout: None or float
+    :return: the report
+    :rtype: Report
+    :raises RuntimeError: if tests do not finish in time
+    """
+    path = None
+    if not os.path.isfile(script):
+        fd, path = tempfile.mkstemp(prefix='headlessvim-', suffix='.vim')
+        with io.open(fd, 'w', encoding=vim.encoding) as f:
+            f.write(six.text_type(script))
+        script = path
+    try:
+        result = vim._call_json('headlessvim#run_tests',
+                                quote(os.path.abspath(script)),
+                                quote(pattern), timeout=timeout)
+    finally:
+        if path is not None:
+            os.unlink(path)
+    outcomes = [Outcome(test['name'], test['errors'], test['time'])
+                for test in result['tests']]
+    return Report(outcomes, result['time'])
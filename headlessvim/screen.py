@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Fast access to the screen buffer connected to *Vim*.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     array = vim.screen_array()
+...     array.size
+...
+(80, 24)
+"""
+
+import array
+import collections
+import operator
+import re
+import struct
+import sys
+import zlib
+
+import pyte
+import six
+
+#: NumPy module imported on the first call of ``to_array``,
+#: None if unavailable
+numpy = False
+
+
+__all__ = ['COLORS', 'BOLD', 'ITALICS', 'UNDERSCORE', 'STRIKETHROUGH',
+           'REVERSE', 'Screen', 'ScreenArray', 'fingerprint', 'line_hash',
+           'to_array']
+
+
+#: color names in the order of indices,
+#: the last index is used for unknown colors
+COLORS = ('default', 'black', 'red', 'green', 'brown',
+          'blue', 'magenta', 'cyan', 'white', 'unknown')
+
+#: attribute bit flag of bold
+BOLD = 1
+
+#: attribute bit flag of italics
+ITALICS = 2
+
+#: attribute bit flag of underscore
+UNDERSCORE = 4
+
+#: attribute bit flag of strikethrough
+STRIKETHROUGH = 8
+
+#: attribute bit flag of reverse
+REVERSE = 16
+
+#: Arrays of the screen.
+#: ``chars``, ``fg``, ``bg`` and ``attrs`` are code points,
+#: color indices in ``COLORS`` and bit flags of attributes of each cell.
+#: They are ``numpy.ndarray`` shaped (lines, columns) if NumPy is available,
+#: else flat ``array.array`` in row-major order.
+#: ``cursor`` is (line, column) and ``size`` is (columns, lines).
+ScreenArray = collections.namedtuple('ScreenArray',
+                                     'chars fg bg attrs cursor size')
+
+
+class _Index(dict):
+    def __missing__(self, key):
+        return len(COLORS) - 1
+
+
+class _Flags(dict):
+    def __missing__(self, key):
+        bold, italics, underscore, strikethrough, reverse = key
+        value = self[key] = ((bold and BOLD) |
+                             (italics and ITALICS) |
+                             (underscore and UNDERSCORE) |
+                             (strikethrough and STRIKETHROUGH) |
+                             (reverse and REVERSE))
+        return value
+
+
+_COLOR_INDEX = _Index((name, index) for index, name in enumerate(COLORS))
+_FLAGS = _Flags()
+_DATA = operator.attrgetter('data')
+_FG = operator.attrgetter('fg')
+_BG = operator.attrgetter('bg')
+_ATTRS = operator.attrgetter('bold', 'italics', 'underscore',
+                             'strikethrough', 'reverse')
+_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+_CODE = 'I' if array.array('I').itemsize == 4 else 'L'
+
+
+def line_hash(text):
+    """
+    Calculate a hash of a line.
+
+    :param string text: text of a line
+    :return: the hash
+    :rtype: int
+    """
+    return zlib.crc32(text.encode('utf-8')) & 0xffffffff
+
+
+def fingerprint(hashes):
+    """
+    Combine hashes of lines into a fingerprint of a screen.
+
+    :param hashes: hashes of each line by ``line_hash``
+    :type hashes: list of int
+    :return: the fingerprint
+    :rtype: int
+    """
+    packed = struct.pack('!{0}I'.format(len(hashes)), *hashes)
+    return zlib.crc32(packed) & 0xffffffff
+
+
+class Screen(pyte.DiffScreen):
+    """
+    A screen caching text and hash of each line.
+    Caches are updated lazily only for dirty lines.
+    """
+    def __init__(self, columns, lines):
+        """
+        :param int columns: number of columns
+        :param int lines: number of lines
+        """
+        self._texts = []
+        self._hashes = []
+        super(Screen, self).__init__(columns, lines)
+
+    @property
+    def display(self):
+        """
+        :return: lines as a list of strings
+        :rtype: list of string
+        """
+        self._refresh()
+        return list(self._texts)
+
+    def resize(self, lines=None, columns=None):
+        super(Screen, self).resize(lines, columns)
+        self.dirty.update(range(self.lines))
+
+    def erase_in_display(self, type_of=0, private=False):
+        self.dirty.update(range(self.lines))
+        pyte.Screen.erase_in_display(self, type_of, private)
+
+    def line(self, y):
+        """
+        Read a line without refreshing other lines.
+
+        :param int y: index of the line, negative index is allowed
+        :return: text of the line
+        :rtype: string
+        :raises IndexError: if ``y`` is out of range
+        """
+        if len(self._texts) != self.lines:
+            self._refresh()
+        if y < 0:
+            y += self.lines
+        if not 0 <= y < self.lines:
+            raise IndexError('line {0} is out of range'.format(y))
+        if y in self.dirty:
+            self._refresh_line(y)
+            self.dirty.discard(y)
+        return self._texts[y]
+
+    def region(self, top, left, bottom, right):
+        """
+        Read a rectangle ``top <= y < bottom`` and ``left <= x < right``.
+
+        :param int top: index of the first line
+        :param int left: index of the first column
+        :param int bottom: index of the line after the last
+        :param int right: index of the column after the last
+        :return: text of each line in the rectangle
+        :rtype: list of string
+        """
+        top, bottom, _ = slice(top, bottom).indices(self.lines)
+        return [self.line(y)[left:right] for y in range(top, bottom)]
+
+    def find(self, pattern):
+        """
+        Search a regular expression in each line.
+
+        :param pattern: a regular expression
+        :type pattern: string or compiled regular expression
+        :return: (line, column, matched text) of each match
+        :rtype: list of (int, int, string)
+        """
+        regex = re.compile(pattern)
+        self._refresh()
+        return [(y, match.start(), match.group())
+                for y, text in enumerate(self._texts)
+                for match in regex.finditer(text)]
+
+    def line_hashes(self):
+        """
+        :return: hash of each line by ``line_hash``
+        :rtype: list of int
+        """
+        self._refresh()
+        return list(self._hashes)
+
+    def fingerprint(self):
+        """
+        :return: fingerprint of the screen by ``fingerprint``
+        :rtype: int
+        """
+        self._refresh()
+        return fingerprint(self._hashes)
+
+    def _refresh(self):
+        if len(self._texts) != self.lines:
+            self._texts = [u''] * self.lines
+            self._hashes = [0] * self.lines
+            self.dirty.update(range(self.lines))
+        if not self.dirty:
+            return
+        for y in self.dirty:
+            if y < self.lines:
+                self._refresh_line(y)
+        self.dirty.clear()
+
+    def _refresh_line(self, y):
+        text = u''.join(map(_DATA, self.buffer[y]))
+        self._texts[y] = text
+        self._hashes[y] = line_hash(text)
+
+
+def to_array(screen, use_numpy=None):
+    """
+    Export characters and attributes of ``screen`` as arrays.
+
+    :param pyte.Screen screen: the screen to export
+    :param use_numpy: whether if use NumPy, use it if available when None
+    :type use_numpy: None or boolean
+    :return: arrays of the screen
+    :rtype: ScreenArray
+    :raises ImportError: if ``use_numpy`` is True and NumPy is unavailable
+    """
+    numpy = _import_numpy()
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError('NumPy is not available')
+    chars = array.array(_CODE)
+    fg = bytearray()
+    bg = bytearray()
+    attrs = bytearray()
+    for line in screen.buffer:
+        _extend_chars(chars, line)
+        fg.extend(map(_COLOR_INDEX.__getitem__, map(_FG, line)))
+        bg.extend(map(_COLOR_INDEX.__getitem__, map(_BG, line)))
+        attrs.extend(map(_FLAGS.__getitem__, map(_ATTRS, line)))
+    cursor = (screen.cursor.y, screen.cursor.x)
+    size = (screen.columns, screen.lines)
+    if use_numpy:
+        shape = (screen.lines, screen.columns)
+        return ScreenArray(numpy.frombuffer(chars, numpy.uint32)
+                           .reshape(shape),
+                           numpy.frombuffer(fg, numpy.uint8).reshape(shape),
+                           numpy.frombuffer(bg, numpy.uint8).reshape(shape),
+                           numpy.frombuffer(attrs, numpy.uint8)
+                           .reshape(shape),
+                           cursor, size)
+    return ScreenArray(chars,
+                       array.array('B', fg),
+                       array.array('B', bg),
+                       array.array('B', attrs),
+                       cursor, size)
+
+
+def _import_numpy():
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
+
+
+def _extend_chars(chars, line):
+    data = u''.join(map(_DATA, line)).encode(_UTF32)
+    if len(data) != len(line) * chars.itemsize:
+        chars.extend(ord(char.data[0]) if char.data else 0 for char in line)
+    elif six.PY3:
+        chars.frombytes(data)
+    else:
+        chars.fromstring(data)
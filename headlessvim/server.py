@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A server sharing warm ``Vim`` objects over a Unix domain socket.
+
+Start a server by ``python -m headlessvim serve --socket PATH --pool N``.
+
+The protocol is JSON lines. Each request is a JSON object in a line
+(wrapped here):
+
+.. code:: json
+
+    {"id": 1, "method": "command",
+     "params": {"session": 0, "command": "echo 0"}}
+
+and each response is one of:
+
+.. code:: json
+
+    {"id": 1, "result": "0"}
+    {"id": 1, "error": {"type": "ValueError", "message": "..."}}
+
+Methods:
+
+* ``open()``: take a ``Vim`` and return its session id
+* ``close(session)``: give the ``Vim`` back to the pool
+* ``send_keys(session, keys, wait=true)``
+* ``command(session, command, capture=true)``
+* ``eval(session, expr)``: the result of ``:echo``
+* ``display(session)``: the screen as a list of lines
+
+Sessions are closed when the connection is closed.
+
+Example:
+
+>>> from headlessvim.server import Client
+>>> with Client('/tmp/headlessvim.sock') as client: # doctest: +SKIP
+...     with client.open() as vim:
+...         vim.eval('"spam"')
+...
+'spam'
+"""
+
+import itertools
+import json
+import os
+import socket
+import stat
+import threading
+
+from six.moves import socketserver
+
+from .pool import Pool
+
+
+__all__ = ['Client', 'RemoteVim', 'Server', 'ServerError']
+
+
+class ServerError(RuntimeError):
+    """
+    An error raised on the server.
+
+    :ivar string type: name of the exception class raised on the server
+    """
+    def __init__(self, type, message):
+        super(ServerError, self).__init__('{0}: {1}'.format(type, message))
+        self.type = type
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    A server sharing a ``Pool`` of ``Vim`` objects.
+    """
+    daemon_threads = True
+
+    def __init__(self, path, pool_size=1, **kwargs):
+        """
+        :param string path: path to the socket to listen
+        :param int pool_size: number of ``Vim`` objects to keep warm
+        :param kwargs: arguments passed to ``headlessvim.open``
+        """
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        socketserver.UnixStreamServer.__init__(self, path, _Handler)
+        self._pool = Pool(pool_size, **kwargs)
+        self._sessions = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for vim in sessions.values():
+            vim.close()
+        self._pool.close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+    def dispatch(self, method, params, owned):
+        """
+        Call a method of the protocol.
+
+        :param string method: name of the method
+        :param dict params: parameters of the method
+        :param set owned: session ids opened by the connection
+        :return: JSON serializable result
+        :raises ValueError: if the method or the session is unknown
+        """
+        if method == 'open':
+            session = self.open()
+            owned.add(session)
+            return session
+        session = params.pop('session', None)
+        if session not in owned:
+            raise ValueError('session {0} is not open'.format(session))
+        if method == 'close':
+            owned.discard(session)
+            return self.close(session)
+        vim = self._sessions[session]
+        if method == 'send_keys':
+            return vim.send_keys(**params)
+        elif method == 'command':
+            return vim.command(**params)
+        elif method == 'eval':
+            return vim.echo(**params)
+        elif method == 'display':
+            return vim.display_lines()
+        raise ValueError('method {0} is not supported'.format(method))
+
+    def open(self):
+        """
+        Take a ``Vim`` object from the pool.
+
+        :return: session id
+        :rtype: int
+        """
+        vim = self._pool.acquire()
+        with self._lock:
+            session = next(self._counter)
+            self._sessions[session] = vim
+        return session
+
+    def close(self, session):
+        """
+        Give a ``Vim`` object back to the pool.
+
+        :param int session: session id
+        """
+        with self._lock:
+            vim = self._sessions.pop(session, None)
+        if vim is not None:
+            self._pool.release(vim)
+
+    @property
+    def pool(self):
+        """
+        :return: the pool of ``Vim`` objects
+        :rtype: Pool
+        """
+        return self._pool
+
+
+class Client(object):
+    """
+    A client of ``Server``.
+    ``Client`` object behaves as ``contextmanager``.
+    """
+    def __init__(self, path):
+        """
+        :param string path: path to the socket of the server
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+        self._file = self._socket.makefile('rwb')
+        self._counter = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def call(self, method, **params):
+        """
+        Call a method on the server.
+
+        :param string method: name of the method
+        :param params: parameters of the method
+        :return: the result of the method
+        :raises ServerError: if the method raised an error on the server
+        """
+        request = {'id': next(self._counter),
+                   'method': method,
+                   'params': params}
+        self._file.write(json.dumps(request).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ServerError('EOFError', 'connection closed by server')
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            error = response['error']
+            raise ServerError(error['type'], error['message'])
+        return response.get('result')
+
+    def open(self):
+        """
+        Take a ``Vim`` object on the server.
+
+        :return: a proxy of ``Vim`` object
+        :rtype: RemoteVim
+        """
+        return RemoteVim(self, self.call('open'))
+
+    def close(self):
+        """
+        Disconnect from the server.
+        """
+        self._file.close()
+        self._socket.close()
+
+
+class RemoteVim(object):
+    """
+    A proxy of ``Vim`` object on ``Server``.
+    ``RemoteVim`` object behaves as ``contextmanager``.
+    """
+    def __init__(self, client, session):
+        """
+        :param Client client: a connected client
+        :param int session: session id
+        """
+        self._client = client
+        self._session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Give the ``Vim`` object back to the server.
+        """
+        self._call('close')
+
+    def send_keys(self, keys, wait=True):
+        """
+        See ``Vim.send_keys``.
+        """
+        self._call('send_keys', keys=keys, wait=wait)
+
+    def command(self, command, capture=True):
+        """
+        See ``Vim.command``.
+        """
+        return self._call('command', command=command, capture=capture)
+
+    def eval(self, expr):
+        """
+        See ``Vim.echo``.
+        """
+        return self._call('eval', expr=expr)
+
+    def display_lines(self):
+        """
+        See ``Vim.display_lines``.
+        """
+        return self._call('display')
+
+    def display(self):
+        """
+        See ``Vim.display``.
+        """
+        return '\n'.join(self.display_lines())
+
+    @property
+    def session(self):
+        """
+        :return: session id
+        :rtype: int
+        """
+        return self._session
+
+    def _call(self, method, **params):
+        return self._client.call(method, session=self._session, **params)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        owned = set()
+        try:
+            for line in iter(self.rfile.readline, b''):
+                response = self._respond(line, owned)
+                self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        finally:
+            for session in owned:
+                self.server.close(session)
+
+    def _respond(self, line, owned):
+        id = None
+        try:
+            request = json.loads(line.decode('utf-8'))
+            id = request.get('id')
+            result = self.server.dispatch(request['method'],
+                                          dict(request.get('params') or {}),
+                                          owned)
+            return {'id': id, 'result': result}
+        except Exception as e:
+            return {'id': id,
+                    'error': {'type': type(e).__name__, 'message': str(e)}}
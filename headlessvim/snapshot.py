@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Golden snapshots of the screen stored on disk.
+
+A snapshot is compared by the fingerprint of the screen first
+and lines are compared only if it does not match.
+
+Example:
+
+>>> import headlessvim
+>>> from headlessvim.snapshot import Snapshots
+>>> snapshots = Snapshots('tests/snapshots') # doctest: +SKIP
+>>> with headlessvim.open() as vim: # doctest: +SKIP
+...     snapshots.assert_match(vim, 'startup')
+...
+
+A missing snapshot is saved on the first run.
+Set ``HEADLESSVIM_UPDATE_SNAPSHOTS=1`` to overwrite existing snapshots.
+"""
+
+import difflib
+import io
+import json
+import os
+
+import six
+
+from . import screen
+
+
+__all__ = ['SnapshotMismatch', 'Snapshots']
+
+
+class SnapshotMismatch(AssertionError):
+    """
+    An error raised when the screen does not match the snapshot.
+
+    :ivar list rows: indices of mismatched lines
+    """
+    def __init__(self, name, rows, diff):
+        message = 'screen does not match snapshot {0!r}\n{1}'.format(
+            name, '\n'.join(diff))
+        super(SnapshotMismatch, self).__init__(message)
+        self.rows = rows
+
+
+class Snapshots(object):
+    """
+    A class managing snapshots in a directory.
+    """
+    def __init__(self, directory, update=None):
+        """
+        :param string directory: directory to store snapshots
+        :param update: whether if overwrite snapshots,
+                       ``HEADLESSVIM_UPDATE_SNAPSHOTS`` is used if None
+        :type update: None or boolean
+        """
+        if update is None:
+            update = bool(os.environ.get('HEADLESSVIM_UPDATE_SNAPSHOTS'))
+        self._directory = directory
+        self._update = update
+        self._cache = {}
+
+    def path(self, name):
+        """
+        :param string name: name of the snapshot
+        :return: path to the snapshot
+        :rtype: string
+        """
+        return os.path.join(self._directory, name + '.json')
+
+    def load(self, name):
+        """
+        Load a snapshot.
+
+        :param string name: name of the snapshot
+        :return: a dict contains ``size``, ``hash``, ``hashes`` and ``lines``,
+                 None if not found
+        :rtype: None or dict
+        """
+        if name in self._cache:
+            return self._cache[name]
+        path = self.path(name)
+        if not os.path.exists(path):
+            return None
+        with io.open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data['hashes'] = [screen.line_hash(line) for line in data['lines']]
+        data['hash'] = screen.fingerprint(data['hashes'])
+        self._cache[name] = data
+        return data
+
+    def save(self, vim, name):
+        """
+        Save the screen of ``vim`` as a snapshot.
+
+        :param Vim vim: ``Vim`` object to take a snapshot
+        :param string name: name of the snapshot
+        """
+        lines = vim.display_lines()
+        data = {'size': list(vim.screen_size), 'lines': lines}
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+        with io.open(self.path(name), 'w', encoding='utf-8') as f:
+            f.write(six.text_type(json.dumps(data, indent=2,
+                                             ensure_ascii=False)))
+        self._cache.pop(name, None)
+
+    def assert_match(self, vim, name):
+        """
+        Assert that the screen of ``vim`` matches a snapshot.
+        The snapshot is saved if it does not exist or updating is enabled.
+
+        :param Vim vim: ``Vim`` object to compare
+        :param string name: name of the snapshot
+        :raises SnapshotMismatch: if the screen does not match
+        """
+        data = None if self._update else self.load(name)
+        if data is None:
+            self.save(vim, name)
+            return
+        if vim.screen_hash() == data['hash']:
+            return
+        hashes = vim.screen_line_hashes()
+        expected = data['hashes']
+        rows = [y for y in range(max(len(hashes), len(expected)))
+                if y >= len(hashes) or y >= len(expected)
+                or hashes[y] != expected[y]]
+        if not rows:
+            return
+        lines = vim.display_lines()
+        diff = []
+        for y in rows:
+            for line in difflib.ndiff(data['lines'][y:y + 1],
+                                      lines[y:y + 1]):
+                diff.append('{0:>4} {1}'.format(y, line.rstrip()))
+        raise SnapshotMismatch(name, rows, diff)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A snapshot of the editor state collected at once.
+
+Options, variables, registers and the window layout are collected
+by a function in *Vim* and transferred as a single JSON payload,
+instead of a round trip for each value.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     vim.command('let g:spam = 1 | set shiftwidth=4', False)
+...     vim.send_keys('yy')
+...     state = vim.state(options=['shiftwidth'])
+...     state['options'], state['variables']['g:']['spam']
+...     state['registers']['"']['type']
+...     len(state['layout']['windows'])
+...
+({'shiftwidth': 4}, 1)
+'V'
+1
+"""
+
+import json
+
+import six
+
+from .arguments import quote
+
+
+__all__ = ['REGISTERS', 'collect']
+
+
+#: registers collected by default
+REGISTERS = '"0123456789abcdefghijklmnopqrstuvwxyz-.:/'
+
+
+def collect(vim, options=None, variables='g:', registers=True, layout=True):
+    """
+    Collect the editor state.
+
+    :param Vim vim: ``Vim`` object to query
+    :param options: names of options, the local values are collected
+    :type options: None or list of string
+    :param variables: scopes of variables such as ``'g:'`` or ``'b:'``
+    :type variables: None or string or list of string
+    :param registers: names of registers, ``REGISTERS`` if True
+    :type registers: boolean or string
+    :param boolean layout: whether if collect tab pages and windows
+    :return: a dict with keys ``'options'`` (None for unknown options),
+             ``'variables'`` by scope (values not serializable such as
+             ``Funcref`` are omitted), ``'registers'``
+             (``'value'`` and ``'type'`` of non-empty registers)
+             and ``'layout'`` (``gettabinfo()``, ``getwininfo()``,
+             ``winlayout()`` as ``'tree'`` and the current
+             ``'tab'``, ``'window'``, ``'buffer'`` and ``'mode'``)
+    :rtype: dict
+    """
+    if variables is None:
+        variables = []
+    elif isinstance(variables, six.string_types):
+        variables = [variables]
+    if registers is True:
+        registers = REGISTERS
+    request = {
+        'options': list(options or []),
+        'variables': list(variables),
+        'registers': registers or '',
+        'layout': bool(layout),
+    }
+    return vim._call_json('headlessvim#state', quote(json.dumps(request)))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Opt-in instrumentation of the harness itself.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open(stats=True) as vim:
+...     vim.echo('"spam"')
+...     vim.stats.histogram('echo').count
+...
+'spam'
+1
+"""
+
+import bisect
+import contextlib
+import time
+
+
+__all__ = ['Histogram', 'Stats', 'clock', 'measure']
+
+
+#: monotonic clock if available, else wall clock
+clock = getattr(time, 'monotonic', time.time)
+
+
+@contextlib.contextmanager
+def measure(stats, operation):
+    """
+    Measure elapsed time of the ``with`` block
+    and record it to ``stats`` as ``operation``.
+    Nothing is measured if ``stats`` is None.
+
+    :param stats: where to record
+    :type stats: None or Stats
+    :param string operation: name of the operation
+    """
+    if stats is None:
+        yield
+        return
+    start = clock()
+    try:
+        yield
+    finally:
+        stats.record(operation, clock() - start)
+
+
+class Histogram(object):
+    """
+    A latency histogram with fixed buckets.
+
+    :cvar Histogram.bounds: upper bounds of buckets in seconds
+    :vartype Histogram.bounds: tuple of float
+    """
+    bounds = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+              0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.reset()
+
+    def add(self, value):
+        """
+        Add a sample.
+
+        :param float value: seconds
+        """
+        self._counts[bisect.bisect_left(self.bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def reset(self):
+        """
+        Discard all samples.
+        """
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min = None
+        self._max = None
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation
+        :rtype: dict
+        """
+        return {
+            'count': self._count,
+            'total': self._total,
+            'min': self._min,
+            'max': self._max,
+            'bounds': list(self.bounds),
+            'counts': list(self._counts),
+        }
+
+    @property
+    def counts(self):
+        """
+        :return: number of samples for each bucket,
+                 the last one is for samples over ``self.bounds[-1]``
+        :rtype: list of int
+        """
+        return list(self._counts)
+
+    @property
+    def count(self):
+        """
+        :return: number of samples
+        :rtype: int
+        """
+        return self._count
+
+    @property
+    def total(self):
+        """
+        :return: sum of samples
+        :rtype: float
+        """
+        return self._total
+
+    @property
+    def mean(self):
+        """
+        :return: mean of samples, None if empty
+        :rtype: None or float
+        """
+        if not self._count:
+            return None
+        return self._total / self._count
+
+    @property
+    def min(self):
+        """
+        :return: the minimum sample, None if empty
+        :rtype: None or float
+        """
+        return self._min
+
+    @property
+    def max(self):
+        """
+        :return: the maximum sample, None if empty
+        :rtype: None or float
+        """
+        return self._max
+
+
+class Stats(object):
+    """
+    A class collecting counters and latencies of ``Vim`` and ``Process``.
+
+    A ``Stats`` object can be shared between multiple ``Vim`` objects.
+
+    :ivar int bytes_read: bytes read from *Vim*
+    :ivar int bytes_written: bytes written to *Vim*
+    :ivar int reads: number of reads from *Vim*
+    :ivar int writes: number of writes to *Vim*
+    :ivar int selects: number of ``select`` calls
+    :ivar float idle_time: seconds spent in ``select``
+    :ivar float parse_time: seconds spent in parsing the screen
+    :ivar float spawn_time: seconds spent in spawning processes
+    """
+    def __init__(self):
+        self._hooks = []
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters and histograms. Hooks are kept.
+        """
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.reads = 0
+        self.writes = 0
+        self.selects = 0
+        self.idle_time = 0.0
+        self.parse_time = 0.0
+        self.spawn_time = 0.0
+        self._histograms = {}
+
+    def add_hook(self, hook):
+        """
+        Add a callback called on every recorded operation
+        as ``hook(operation, elapsed)``.
+
+        :param hook: callback
+        :type hook: callable
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Remove a callback added by ``add_hook``.
+
+        :param hook: callback
+        :type hook: callable
+        :raises ValueError: if ``hook`` is not added
+        """
+        self._hooks.remove(hook)
+
+    def record(self, operation, elapsed):
+        """
+        Record latency of an operation.
+
+        :param string operation: name of the operation
+        :param float elapsed: seconds
+        """
+        self.histogram(operation).add(elapsed)
+        for hook in self._hooks:
+            hook(operation, elapsed)
+
+    def histogram(self, operation):
+        """
+        :param string operation: name of the operation
+        :return: the histogram of ``operation``
+        :rtype: Histogram
+        """
+        histogram = self._histograms.get(operation)
+        if histogram is None:
+            histogram = self._histograms[operation] = Histogram()
+        return histogram
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation
+        :rtype: dict
+        """
+        return {
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'reads': self.reads,
+            'writes': self.writes,
+            'selects': self.selects,
+            'idle_time': self.idle_time,
+            'parse_time': self.parse_time,
+            'spawn_time': self.spawn_time,
+            'operations': dict((name, histogram.as_dict())
+                               for name, histogram
+                               in self._histograms.items()),
+        }
+
+    @property
+    def operations(self):
+        """
+        :return: names of recorded operations
+        :rtype: list of string
+        """
+        return sorted(self._histograms)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Output of long-running commands streamed while *Vim* runs them.
+
+*Vim* writes the output into a file instead of the screen,
+so that it never causes hit-enter prompts,
+and lines are yielded as the file grows.
+Closing the generator interrupts the command by ``CTRL-C``.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     list(vim.stream_command('echo "spam" | echo "ham"'))
+...     list(vim.stream_command('printf "egg\\\\nbacon\\\\n"', shell=True))
+...
+['spam', 'ham']
+['egg', 'bacon']
+
+.. note:: Output of Ex commands is captured by ``:redir``
+          and *Vim* writes it in blocks,
+          while output of shell commands is written line by line.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+import six
+
+from .arguments import quote
+
+
+__all__ = ['lines']
+
+
+def lines(vim, command, shell=False):
+    """
+    Run a command and yield lines of its output as they are written.
+
+    :param Vim vim: ``Vim`` object to run the command
+    :param string command: an Ex command, or a shell command if ``shell``
+    :param boolean shell: whether if run ``command`` by ``'shell'``
+    :return: a generator of lines, close it to interrupt the command
+    :rtype: generator of string
+    """
+    directory = tempfile.mkdtemp(prefix='headlessvim-')
+    output = os.path.join(directory, 'output')
+    done = os.path.join(directory, 'done')
+    finish = 'call writefile([], {0})'.format(quote(done))
+    if shell:
+        script = os.path.join(directory, 'command.sh')
+        with io.open(script, 'w', encoding=vim.encoding) as f:
+            f.write(six.text_type(command))
+        run = ("execute 'silent !' . &shell . ' ' . shellescape({0}) . "
+               "' > ' . shellescape({1}) . ' 2>&1'".format(
+                   quote(script), quote(output)))
+        line = 'try | {0} | finally | {1} | redraw! | endtry'.format(run,
+                                                                     finish)
+    else:
+        line = ("try | execute 'redir! >' fnameescape({0}) | execute {1} | "
+                "finally | redir END | {2} | endtry".format(
+                    quote(output), quote('silent ' + command), finish))
+    finished = False
+    try:
+        vim.set_mode('command')
+        vim.send_keys(line + '\n')
+        reader = _Reader(output, vim.encoding, skip_blank=not shell)
+        while not finished:
+            finished = os.path.exists(done)
+            for text in reader.read(finished):
+                yield text
+            if not finished:
+                if not vim.is_alive():
+                    raise RuntimeError('Vim exited while running '
+                                       '{0}'.format(command))
+                vim.wait()
+    finally:
+        if not finished and vim.is_alive():
+            vim.send_keys('\x03')
+            while not os.path.exists(done) and vim.is_alive():
+                vim.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class _Reader(object):
+    def __init__(self, path, encoding, skip_blank):
+        self._path = path
+        self._encoding = encoding
+        self._offset = 0
+        self._buffer = b''
+        # output of :redir starts with a newline
+        self._skip_blank = skip_blank
+
+    def read(self, finished):
+        try:
+            with io.open(self._path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except (IOError, OSError):
+            data = b''
+        self._offset += len(data)
+        self._buffer += data
+        chunks = self._buffer.split(b'\n')
+        self._buffer = chunks.pop()
+        if finished and self._buffer:
+            chunks.append(self._buffer)
+            self._buffer = b''
+        for chunk in chunks:
+            if self._skip_blank:
+                self._skip_blank = False
+                if not chunk:
+                    continue
+            yield chunk.decode(self._encoding, 'replace')
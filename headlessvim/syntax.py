@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Syntax highlight groups of a buffer exported at once.
+
+Highlight groups are collected by a function in *Vim*
+as run-length-encoded spans for each line,
+and transferred as a single JSON payload.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     vim.command('syntax on | setfiletype vim', False)
+...     vim.send_keys('ilet g:spam = 1\\033')
+...     vim.syntax_spans()[0][1][0]
+...
+Span(column=1, length=3, group='vimLet')
+"""
+
+import collections
+
+from .arguments import quote
+
+
+__all__ = ['Span', 'spans']
+
+
+#: a run of characters highlighted by the same group.
+#: ``column`` is a byte index starting from 1
+Span = collections.namedtuple('Span', ['column', 'length', 'group'])
+
+
+def spans(vim, buffer=None, start=1, end='$', translate=False):
+    """
+    Collect highlight groups of lines of a buffer.
+
+    :param Vim vim: ``Vim`` object to query
+    :param buffer: buffer number, the current buffer if None
+    :type buffer: None or int
+    :param start: the first line number or a position such as ``'.'``
+    :type start: int or string
+    :param end: the last line number or a position such as ``'$'``
+    :type end: int or string
+    :param boolean translate: whether if translate groups by ``synIDtrans``
+                              (``vimLet`` becomes ``Statement``)
+    :return: line numbers and spans of the lines,
+             text without highlight is omitted
+    :rtype: list of (int, list of Span)
+    """
+    result = vim._call_json('headlessvim#syntax_spans',
+                            buffer or 0,
+                            _position(start),
+                            _position(end),
+                            int(bool(translate)))
+    first = result['start']
+    return [(first + index, [Span(*span) for span in line])
+            for index, line in enumerate(result['lines'])]
+
+
+def _position(position):
+    if isinstance(position, int):
+        return str(position)
+    return quote(position)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Timeouts learned from observed response latencies of *Vim*.
+
+``Vim.wait`` waits the first byte of a response
+and then waits until *Vim* becomes quiet.
+``AdaptiveTimeout`` learns both of them and
+sets the timeouts to a percentile of recent samples times a factor,
+within the given bounds.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open(adaptive_timeout=True) as vim:
+...     vim.echo('"spam"')
+...     0 < vim.adaptive_timeout.quiescence <= vim.timeout
+...
+'spam'
+True
+"""
+
+import collections
+
+
+__all__ = ['AdaptiveTimeout']
+
+
+class AdaptiveTimeout(object):
+    """
+    A class learning timeouts from moving percentiles of latencies.
+
+    Until ``warmup`` samples are observed, ``maximum`` is used.
+    """
+    def __init__(self,
+                 minimum=0.02,
+                 maximum=0.25,
+                 percentile=0.95,
+                 factor=3.0,
+                 window=64,
+                 warmup=8):
+        """
+        :param float minimum: lower bound of timeouts in seconds
+        :param float maximum: upper bound of timeouts in seconds
+        :param float percentile: percentile of samples in (0, 1]
+        :param float factor: ratio of timeouts to the percentile
+        :param int window: number of recent samples to keep
+        :param int warmup: number of samples required to learn
+        :raises ValueError: if bounds or percentile are invalid
+        """
+        if not 0 < minimum <= maximum:
+            raise ValueError('bounds must be 0 < minimum <= maximum')
+        if not 0 < percentile <= 1:
+            raise ValueError('percentile must be in (0, 1]')
+        self._minimum = minimum
+        self._maximum = maximum
+        self._percentile = percentile
+        self._factor = factor
+        self._warmup = warmup
+        self._first_bytes = collections.deque(maxlen=window)
+        self._gaps = collections.deque(maxlen=window)
+        self._first_byte = maximum
+        self._quiescence = maximum
+
+    def observe_first_byte(self, latency):
+        """
+        Observe seconds until the first byte of a response.
+
+        :param float latency: seconds
+        """
+        self._first_bytes.append(latency)
+        self._first_byte = self._learn(self._first_bytes)
+
+    def observe_timeout(self):
+        """
+        Observe that no response arrived within ``self.first_byte``.
+        The timeout is recorded as a sample so that it can grow again.
+        """
+        self.observe_first_byte(self._first_byte)
+
+    def observe_gap(self, gap):
+        """
+        Observe seconds between chunks of a response.
+
+        :param float gap: seconds
+        """
+        self._gaps.append(gap)
+        self._quiescence = self._learn(self._gaps)
+
+    def reset(self):
+        """
+        Discard all samples and use ``maximum`` again.
+        """
+        self._first_bytes.clear()
+        self._gaps.clear()
+        self._first_byte = self._maximum
+        self._quiescence = self._maximum
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of learned values
+        :rtype: dict
+        """
+        return {
+            'first_byte': self._first_byte,
+            'quiescence': self._quiescence,
+            'first_byte_samples': len(self._first_bytes),
+            'gap_samples': len(self._gaps),
+            'minimum': self._minimum,
+            'maximum': self._maximum,
+        }
+
+    @property
+    def first_byte(self):
+        """
+        :return: seconds to wait the first byte of a response
+        :rtype: float
+        """
+        return self._first_byte
+
+    @property
+    def quiescence(self):
+        """
+        :return: seconds of silence to regard *Vim* as quiet
+        :rtype: float
+        """
+        return self._quiescence
+
+    @property
+    def minimum(self):
+        """
+        :return: lower bound of timeouts in seconds
+        :rtype: float
+        """
+        return self._minimum
+
+    @property
+    def maximum(self):
+        """
+        :return: upper bound of timeouts in seconds
+        :rtype: float
+        """
+        return self._maximum
+
+    def _learn(self, samples):
+        if len(samples) < self._warmup:
+            return self._maximum
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self._percentile))
+        value = ordered[index] * self._factor
+        return min(self._maximum, max(self._minimum, value))
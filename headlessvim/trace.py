@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+A bounded trace of operations of ``Vim`` for post-mortem analysis.
+
+Every ``Vim`` keeps recent operations in a ring buffer by default.
+Key sequences are recorded as their sizes and CRC-32 digests
+instead of their contents to keep the overhead negligible.
+The trace is attached to reports of failed tests by the ``pytest`` plugin,
+and dumped by a signal if ``install_signal_handler`` is called.
+
+Example:
+
+>>> import headlessvim
+>>> with headlessvim.open() as vim:
+...     vim.command('let g:spam = 1', False)
+...     [entry.operation for entry in vim.trace.entries][-5:]
+...
+['command', 'send_keys', 'wait', 'send_keys', 'wait']
+"""
+
+import collections
+import signal
+import sys
+import weakref
+import zlib
+
+from . import stats
+
+
+__all__ = ['Entry', 'Trace', 'dump_all', 'install_signal_handler']
+
+
+#: an operation of ``Vim``.
+#: ``time`` is the value of ``stats.clock``, ``digest`` is CRC-32 of
+#: the key sequence and ``duration`` is in seconds.
+#: fields not related to the operation are None
+Entry = collections.namedtuple('Entry', ['time', 'operation', 'size',
+                                         'digest', 'duration', 'bytes_read',
+                                         'text'])
+
+_traces = weakref.WeakValueDictionary()
+
+
+class Trace(object):
+    """
+    A ring buffer of recent operations of a ``Vim`` object.
+    """
+    def __init__(self, maxlen=1000):
+        """
+        :param int maxlen: number of recent operations to keep
+        """
+        self._entries = collections.deque(maxlen=maxlen)
+        _traces[id(self)] = self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, operation, text=None, duration=None, bytes_read=None):
+        """
+        Record an operation.
+
+        :param string operation: name of the operation
+        :param text: text of the operation such as a command
+        :type text: None or string
+        :param duration: seconds taken by the operation
+        :type duration: None or float
+        :param bytes_read: bytes read from *Vim* during the operation
+        :type bytes_read: None or int
+        """
+        self._entries.append(Entry(stats.clock(), operation, None, None,
+                                   duration, bytes_read, text))
+
+    def record_keys(self, data):
+        """
+        Record a key sequence sent to *Vim*.
+
+        :param bytes data: the key sequence
+        """
+        self._entries.append(Entry(stats.clock(), 'send_keys', len(data),
+                                   zlib.crc32(data) & 0xffffffff, None, None,
+                                   None))
+
+    def clear(self):
+        """
+        Discard all operations.
+        """
+        self._entries.clear()
+
+    def format(self):
+        """
+        :return: human readable operations, one for each line
+        :rtype: string
+        """
+        lines = []
+        for entry in list(self._entries):
+            fields = ['{0:.6f}'.format(entry.time), entry.operation]
+            if entry.size is not None:
+                fields.append('size={0}'.format(entry.size))
+            if entry.digest is not None:
+                fields.append('crc32={0:08x}'.format(entry.digest))
+            if entry.duration is not None:
+                fields.append('duration={0:.6f}'.format(entry.duration))
+            if entry.bytes_read is not None:
+                fields.append('bytes_read={0}'.format(entry.bytes_read))
+            if entry.text is not None:
+                fields.append(repr(entry.text))
+            lines.append(' '.join(fields))
+        return '\n'.join(lines)
+
+    def dump(self, file=None):
+        """
+        Write operations to a file.
+
+        :param file: text file-like object, ``sys.stderr`` if None
+        """
+        if file is None:
+            file = sys.stderr
+        file.write(self.format() + '\n')
+        file.flush()
+
+    def as_dict(self):
+        """
+        :return: JSON serializable representation of operations
+        :rtype: dict
+        """
+        return {'entries': [entry._asdict() for entry in self._entries]}
+
+    @property
+    def entries(self):
+        """
+        :return: operations in order of time
+        :rtype: list of Entry
+        """
+        return list(self._entries)
+
+    @property
+    def maxlen(self):
+        """
+        :return: number of recent operations to keep
+        :rtype: int
+        """
+        return self._entries.maxlen
+
+
+def dump_all(file=None):
+    """
+    Write operations of all living traces to a file.
+
+    :param file: text file-like object, ``sys.stderr`` if None
+    """
+    if file is None:
+        file = sys.stderr
+    for index, trace in enumerate(list(_traces.values())):
+        file.write('headlessvim trace #{0}\n'.format(index))
+        trace.dump(file)
+
+
+def install_signal_handler(signum=signal.SIGUSR1, file=None):
+    """
+    Dump all living traces when the process receives a signal.
+
+    :param int signum: the signal number
+    :param file: text file-like object, ``sys.stderr`` if None
+    :return: the previous handler
+    """
+    def handler(signum, frame):
+        dump_all(file)
+    return signal.signal(signum, handler)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+"""
+Limits of resources used by *Vim* and detection of hung *Vim*.
+
+``Watchdog`` limits each operation of ``Vim``
+(such as ``command``, ``echo``, ``send_keys`` and ``wait``)
+and the resources of the process.
+When a limit is exceeded, the process is killed
+(and respawned if ``respawn`` is enabled)
+and ``LimitExceeded`` is raised.
+
+Example:
+
+>>> import headlessvim
+>>> from headlessvim.watchdog import LimitExceeded, Watchdog
+>>> watchdog = Watchdog(operation_time=5, respawn=True)
+>>> with headlessvim.open(watchdog=watchdog) as vim:
+...     try:
+...         vim.command('echo "spam\\\\nham"', False)
+...     except LimitExceeded as e:
+...         print(e.reason, e.respawned, vim.is_alive())
+...
+prompt True True
+"""
+
+import re
+
+from . import stats
+
+
+__all__ = ['PROMPTS', 'LimitExceeded', 'Operation', 'Watchdog']
+
+
+#: patterns of the last line of the screen waiting for user input
+PROMPTS = (
+    re.compile(r'^Press ENTER or type command to continue'),
+    re.compile(r'^-- More --'),
+)
+
+
+class LimitExceeded(RuntimeError):
+    """
+    An error raised when *Vim* exceeds a limit of ``Watchdog``.
+
+    :ivar string reason: ``'operation_time'``, ``'output_bytes'``,
+                         ``'prompt'``, ``'exited'`` or ``'unresponsive'``
+    :ivar boolean respawned: True if the process was respawned
+    """
+    def __init__(self, reason, message):
+        super(LimitExceeded, self).__init__(message)
+        self.reason = reason
+        self.respawned = False
+
+
+class Watchdog(object):
+    """
+    A class representing limits applied to a ``Vim`` object.
+    It can be shared among ``Vim`` objects.
+    """
+    def __init__(self,
+                 operation_time=None,
+                 cpu_time=None,
+                 address_space=None,
+                 output_bytes=None,
+                 detect_prompts=True,
+                 respawn=False):
+        """
+        :param operation_time: wall time of an operation in seconds
+        :type operation_time: None or float
+        :param cpu_time: CPU time of the process in seconds
+        :type cpu_time: None or int
+        :param address_space: address space of the process in bytes
+        :type address_space: None or int
+        :param output_bytes: bytes read in an operation
+        :type output_bytes: None or int
+        :param boolean detect_prompts: whether if regard prompts
+                                       in ``PROMPTS`` as hangs
+        :param boolean respawn: whether if respawn killed process
+        """
+        self._operation_time = operation_time
+        self._cpu_time = cpu_time
+        self._address_space = address_space
+        self._output_bytes = output_bytes
+        self._detect_prompts = detect_prompts
+        self._respawn = respawn
+
+    def rlimits(self):
+        """
+        :return: resource limits to set in the process
+        :rtype: list of (int, (int, int))
+        """
+        import resource
+        limits = []
+        if self._cpu_time is not None:
+            cpu_time = int(self._cpu_time)
+            limits.append((resource.RLIMIT_CPU, (cpu_time, cpu_time)))
+        if self._address_space is not None:
+            address_space = int(self._address_space)
+            limits.append((resource.RLIMIT_AS, (address_space,
+                                                address_space)))
+        return limits
+
+    def start(self, responsive=False):
+        """
+        Start an operation.
+
+        :param boolean responsive: whether if the operation always
+                                   makes *Vim* write something
+        :return: the state of the operation
+        :rtype: Operation
+        """
+        return Operation(self, responsive)
+
+    def inspect(self, operation, process, screen):
+        """
+        Check the state of *Vim* after an operation.
+
+        :param Operation operation: the finished operation
+        :param process.Process process: the process of *Vim*
+        :param screen.Screen screen: the screen of *Vim*
+        :raises LimitExceeded: if *Vim* exited, hangs or waits at a prompt
+        """
+        if not process.is_alive():
+            raise LimitExceeded('exited', 'Vim exited unexpectedly')
+        if operation.responsive and operation.bytes_read == 0:
+            raise LimitExceeded('unresponsive',
+                                'Vim did not respond to the operation')
+        if self._detect_prompts:
+            line = screen.line(-1).rstrip()
+            for prompt in PROMPTS:
+                if prompt.match(line):
+                    raise LimitExceeded('prompt',
+                                        'Vim waits at a prompt: '
+                                        '{0!r}'.format(line))
+
+    @property
+    def operation_time(self):
+        """
+        :return: wall time of an operation in seconds
+        :rtype: None or float
+        """
+        return self._operation_time
+
+    @property
+    def cpu_time(self):
+        """
+        :return: CPU time of the process in seconds
+        :rtype: None or int
+        """
+        return self._cpu_time
+
+    @property
+    def address_space(self):
+        """
+        :return: address space of the process in bytes
+        :rtype: None or int
+        """
+        return self._address_space
+
+    @property
+    def output_bytes(self):
+        """
+        :return: bytes read in an operation
+        :rtype: None or int
+        """
+        return self._output_bytes
+
+    @property
+    def detect_prompts(self):
+        """
+        :return: whether if prompts are regarded as hangs
+        :rtype: boolean
+        """
+        return self._detect_prompts
+
+    @property
+    def respawn(self):
+        """
+        :return: whether if killed process is respawned
+        :rtype: boolean
+        """
+        return self._respawn
+
+
+class Operation(object):
+    """
+    A class representing the state of an operation watched by ``Watchdog``.
+    """
+    def __init__(self, watchdog, responsive=False):
+        """
+        :param Watchdog watchdog: limits of the operation
+        :param boolean responsive: whether if the operation always
+                                   makes *Vim* write something
+        """
+        self._watchdog = watchdog
+        self._responsive = responsive
+        self._bytes_read = 0
+        self._deadline = None
+        if watchdog.operation_time is not None:
+            self._deadline = stats.clock() + watchdog.operation_time
+
+    def feed(self, size):
+        """
+        Count bytes read from *Vim* and check limits.
+
+        :param int size: bytes read
+        :raises LimitExceeded: if a limit is exceeded
+        """
+        self._bytes_read += size
+        limit = self._watchdog.output_bytes
+        if limit is not None and self._bytes_read > limit:
+            raise LimitExceeded('output_bytes',
+                                'Vim wrote more than {0} bytes '
+                                'in an operation'.format(limit))
+        if self._deadline is not None and stats.clock() > self._deadline:
+            raise LimitExceeded('operation_time',
+                                'Vim exceeded {0} seconds '
+                                'in an operation'.format(
+                                    self._watchdog.operation_time))
+
+    @property
+    def bytes_read(self):
+        """
+        :return: bytes read in the operation
+        :rtype: int
+        """
+        return self._bytes_read
+
+    @property
+    def responsive(self):
+        """
+        :return: whether if the operation always makes *Vim* write something
+        :rtype: boolean
+        """
+        return self._responsive
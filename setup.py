@@ -49,7 +49,11 @@ setup(
     author_email=__email__,
     license='MIT',
     packages=['headlessvim'],
+    package_data={'headlessvim': ['autoload/*.vim']},
     install_requires=read('requirements.txt').splitlines(),
     tests_require=['pytest', 'mock'],
     cmdclass={'test': PyTest},
+    entry_points={
+        'pytest11': ['headlessvim = headlessvim.pytest_plugin'],
+    },
 )
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+
+import pytest
+
+import headlessvim
+
+
+@pytest.fixture
+def env(request):
+    return dict(os.environ, LANG='C')
+
+
+@pytest.yield_fixture
+def vim(request, env):
+    vim = headlessvim.open(env=env)
+    yield vim
+    vim.close()
@@ -3,7 +3,7 @@
 
 import pytest
 
-from headlessvim.arguments import Parser
+from headlessvim.arguments import Parser, profile, quote
 
 
 @pytest.fixture
@@ -29,3 +29,19 @@ def test_parse(parser, default_args, args):
 
 def test_default_args(parser, default_args):
     assert parser.default_args == default_args
+
+
+def test_profile():
+    assert profile('default') == ([], {})
+    args, env = profile('lean')
+    assert '--cmd' in args
+    assert env['TERM'] == 'ansi'
+
+
+def test_profile_invalid():
+    with pytest.raises(ValueError):
+        profile('invalid-profile')
+
+
+def test_quote():
+    assert quote("spam's") == "'spam''s'"
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from headlessvim import map_files
+
+
+@pytest.fixture
+def files(request, tmpdir):
+    paths = []
+    for i in range(3):
+        path = tmpdir.join("spam's {0}.txt".format(i))
+        path.write('spam\nspam egg\n')
+        paths.append(str(path))
+    return paths
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_map_files(files, env):
+    commands = ['%s/spam/ham/g', "echo line('$')"]
+    results = list(map_files(files, commands, workers=2, env=env))
+    assert sorted(result.path for result in results) == sorted(files)
+    for result in results:
+        assert result.error is None
+        assert result.output[1] == '2'
+        assert read(result.path) == 'ham\nham egg\n'
+
+
+def test_map_files_no_write(files, env):
+    results = list(map_files(files[:1], ['%s/spam/ham/g'],
+                             workers=1, write=False, env=env))
+    assert results[0].error is None
+    assert read(files[0]) == 'spam\nspam egg\n'
+
+
+def test_map_files_error(files, env):
+    commands = ['%s/spam/ham/g', 'NoSuchCommand']
+    results = list(map_files(files[:1], commands, workers=1, env=env))
+    assert 'E492' in results[0].error
+    assert read(files[0]) == 'spam\nspam egg\n'
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import json
+
+import pytest
+
+from headlessvim import bench
+
+
+@pytest.fixture
+def output(request, tmpdir):
+    return str(tmpdir.join('bench.json'))
+
+
+def test_summarize():
+    summary = bench.summarize([3.0, 1.0, 2.0, 4.0])
+    assert summary['count'] == 4
+    assert summary['min'] == 1.0
+    assert summary['max'] == 4.0
+    assert summary['median'] == 2.5
+    assert summary['mean'] == 2.5
+
+
+def test_registered():
+    names = [name for name, func in bench.BENCHMARKS]
+    for name in ('startup', 'spawn', 'import', 'command', 'echo',
+                 'send_keys', 'display', 'runtimepath'):
+        assert name in names
+
+
+def test_run():
+    result = bench.run(['startup', 'display'], repeat=1)
+    benchmarks = result['benchmarks']
+    assert benchmarks['startup[cold]']['count'] == 1
+    assert benchmarks['startup[warm]']['count'] == 1
+    for size in bench.DISPLAY_SIZES:
+        assert 'display[{0}x{1}]'.format(*size) in benchmarks
+    assert result['meta']['repeat'] == 1
+
+
+def test_run_spawn():
+    benchmarks = bench.run(['spawn'], repeat=1)['benchmarks']
+    assert benchmarks['spawn[popen]']['count'] == 1
+
+
+def test_run_unknown():
+    with pytest.raises(ValueError):
+        bench.run(['unknown'])
+
+
+def test_main(output):
+    assert bench.main(['-n', '1', '-o', output, 'command']) == 0
+    with open(output) as f:
+        result = json.load(f)
+    assert result['benchmarks']['command']['count'] == 1
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import json
+import os
+
+import pytest
+
+from headlessvim import capabilities
+from headlessvim.capabilities import Capabilities
+
+
+@pytest.yield_fixture
+def cache(request, tmpdir, monkeypatch):
+    monkeypatch.setenv('HEADLESSVIM_CACHE_DIR', str(tmpdir))
+    capabilities.clear()
+    yield str(tmpdir)
+    capabilities.clear()
+
+
+@pytest.fixture
+def probes(request, monkeypatch):
+    calls = []
+    original = capabilities.probe
+
+    def probe(vim):
+        calls.append(vim)
+        return original(vim)
+    monkeypatch.setattr(capabilities, 'probe', probe)
+    return calls
+
+
+def test_capabilities():
+    caps = Capabilities(801, 1234, ['job', 'channel'], ['strlen'])
+    assert caps.at_least(801)
+    assert caps.at_least(801, 1234)
+    assert not caps.at_least(801, 1235)
+    assert not caps.at_least(802)
+    assert caps.job and caps.channel and not caps.terminal
+    assert caps.exists('strlen')
+    assert not caps.exists('strwidth')
+    assert Capabilities.from_dict(caps.as_dict()).as_dict() == caps.as_dict()
+
+
+def test_probe(vim):
+    caps = capabilities.probe(vim)
+    assert caps.version == int(vim.echo('v:version'))
+    assert caps.patch > 0
+    assert caps.has('eval')
+    assert caps.has('terminal') == (vim.echo("has('terminal')") == '1')
+    assert caps.exists('strlen')
+    assert not any(name[0].isupper() for name in caps.functions)
+    # autoload functions of headlessvim itself
+    assert vim.echo("exists('*headlessvim#state')") == '1'
+    assert not caps.exists('headlessvim')
+
+
+def test_cached_in_process(cache, vim, probes):
+    caps = vim.capabilities
+    assert vim.capabilities is caps
+    assert len(probes) == 1
+
+
+def test_cached_on_disk(cache, vim, probes):
+    caps = vim.capabilities
+    capabilities.clear()
+    assert vim.capabilities.as_dict() == caps.as_dict()
+    assert len(probes) == 1
+    assert len(os.listdir(cache)) == 1
+
+
+def test_cache_invalidated_by_mtime(cache, vim, probes):
+    vim.capabilities
+    capabilities.clear()
+    stat = os.stat(vim.executable)
+    path = capabilities._path(vim.executable)
+    with open(path) as f:
+        data = f.read()
+    with open(path, 'w') as f:
+        f.write(data.replace(repr(stat.st_mtime), '0'))
+    vim.capabilities
+    assert len(probes) == 2
+
+
+def test_cache_invalidated_by_format(cache, vim, probes):
+    vim.capabilities
+    capabilities.clear()
+    path = capabilities._path(vim.executable)
+    with open(path) as f:
+        data = json.load(f)
+    data['format'] -= 1
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    vim.capabilities
+    assert len(probes) == 2
+
+
+def test_cache_disabled(cache, vim, probes, monkeypatch):
+    monkeypatch.setenv('HEADLESSVIM_CACHE_DIR', '')
+    assert capabilities.cache_directory() is None
+    vim.capabilities
+    assert os.listdir(cache) == []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+
+from headlessvim.events import Event
+
+
+def names(events):
+    return [event.name for event in events]
+
+
+def test_text_changed(vim):
+    events = vim.events(['TextChanged'])
+    vim.send_keys('ispam\nham\033')
+    changes = events.poll()
+    assert changes
+    assert changes[-1] == Event('TextChanged', 1, 1, 2, (2, 3), 'n', '')
+    assert events.poll() == []
+
+
+def test_default_events(vim):
+    events = vim.events()
+    vim.send_keys('ispam\nham\033k')
+    vim.command('new', False)
+    received = names(events)
+    for name in ('TextChanged', 'CursorMoved', 'BufEnter'):
+        assert name in received
+    if vim.echo("exists('##ModeChanged')") == '1':
+        assert 'ModeChanged' in received
+
+
+def test_same_stream(vim):
+    assert vim.events(['BufEnter']) is vim.events()
+
+
+def test_callback(vim):
+    received = []
+    events = vim.events(['BufEnter'], received.append)
+    vim.command('new', False)
+    assert names(received) == ['BufEnter']
+    assert names(events) == ['BufEnter']
+    events.unsubscribe(received.append)
+    vim.command('new', False)
+    assert len(received) == 1
+
+
+def test_close(vim):
+    events = vim.events(['BufEnter'])
+    path = events.path
+    events.close()
+    assert events.closed
+    assert not os.path.exists(path)
+    assert vim.command('autocmd headlessvim_events') == \
+        '--- Autocommands ---'
+    vim.command('new', False)
+    assert vim.is_alive()
+    assert not vim.events(['BufEnter']).closed
+
+
+def test_reset(vim):
+    events = vim.events(['BufEnter'])
+    vim.reset()
+    assert events.closed
+
+
+def test_flood(vim):
+    received = []
+    vim.events(['BufEnter'], received.append)
+    # records are much larger than the buffer of the FIFO
+    vim.command('for i in range(20000) | doautocmd BufEnter | endfor', False)
+    assert vim.echo('"alive"') == 'alive'
+    assert len(received) == 20000
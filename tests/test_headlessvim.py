@@ -2,16 +2,13 @@
 # -*- coding:utf-8 -*-
 
 import os
+import subprocess
+import sys
 
 import mock
 import pytest
 
-from headlessvim import Vim, open
-
-
-@pytest.fixture
-def env(request):
-    return dict(os.environ, LANG='C')
+from headlessvim import Stats, Vim, messages, open
 
 
 @pytest.fixture
@@ -167,6 +164,14 @@ def test_screen_size_setter(vim):
     vim.screen_size = screen_size
     assert vim.screen_size == screen_size
     assert all(len(line) == screen_size[0] for line in vim.display_lines())
+    assert vim.echo('&columns') == str(screen_size[0])
+    assert vim.echo('&lines') == str(screen_size[1])
+
+
+def test_screen_size_open(env):
+    with open(env=env, size=(100, 30)) as vim:
+        assert vim.echo('&columns') == '100'
+        assert vim.echo('&lines') == '30'
 
 
 def test_timeout(vim):
@@ -176,3 +181,142 @@ def test_timeout(vim):
 def test_timeout_setter(vim):
     vim.timeout = 10
     assert vim.timeout == 10
+
+
+def test_stats_disabled(vim):
+    assert vim.stats is None
+
+
+def test_stats(env):
+    with open(env=env, stats=True) as vim:
+        stats = vim.stats
+        assert isinstance(stats, Stats)
+        assert stats.spawn_time > 0
+        assert stats.histogram('spawn').count == 1
+        vim.command('echo 0')
+        assert stats.histogram('command').count == 1
+        assert stats.bytes_read > 0
+        assert stats.bytes_written > 0
+        assert stats.selects > 0
+        assert stats.idle_time > 0
+        assert stats.parse_time > 0
+
+
+def test_stats_shared(env):
+    stats = Stats()
+    with open(env=env, stats=stats) as vim:
+        vim.echo('0')
+    with open(env=env, stats=stats) as vim:
+        vim.echo('0')
+    assert stats.histogram('spawn').count == 2
+    assert stats.histogram('echo').count == 2
+
+
+def test_reset(vim, plugin_dir):
+    vim.command('tabnew | split', False)
+    vim.runtimepath.append(plugin_dir)
+    vim.reset()
+    assert vim.echo('tabpagenr("$")') == '1'
+    assert vim.echo('winnr("$")') == '1'
+    assert plugin_dir not in vim.runtimepath
+
+
+def test_reset_state(vim):
+    vim.command('set number shiftwidth=4 | setlocal wrap!', False)
+    vim.command('let @a = "spam" | let @/ = "ham" | let v:errmsg = "egg"',
+                False)
+    vim.reset()
+    assert vim.echo('&number . &shiftwidth . &wrap') == '081'
+    assert vim.echo('@a . @/ . v:errmsg') == ''
+
+
+def test_screen_array(vim):
+    array = vim.screen_array(use_numpy=False)
+    assert array.size == vim.screen_size
+    assert len(array.chars) == 80 * 24
+    lines = vim.display_lines()
+    assert array.chars[80] == ord(lines[1][0])
+
+
+def test_screen_hash(vim):
+    screen_hash = vim.screen_hash()
+    assert screen_hash == vim.screen_hash()
+    vim.command('call setline(1, "spam")', False)
+    vim.command('redraw!', False)
+    assert screen_hash != vim.screen_hash()
+    assert len(vim.screen_line_hashes()) == 24
+
+
+def test_screen_row(vim):
+    assert vim.screen_row(1) == vim.display_lines()[1]
+    assert vim.screen_row(-1) == vim.display_lines()[-1]
+
+
+def test_screen_region(vim):
+    assert vim.screen_region(1, 0, 3, 1) == ['~', '~']
+
+
+def test_screen_find(vim):
+    matches = vim.screen_find('VIM - Vi IMproved')
+    assert len(matches) == 1
+    line, column, text = matches[0]
+    assert vim.screen_row(line)[column:].startswith(text)
+
+
+def test_profile_lean(env):
+    with open(env=env, profile='lean', stats=True) as lean:
+        lean.send_keys('ispam\033')
+        assert lean.display_lines()[0].strip() == 'spam'
+        assert lean.echo('&lazyredraw') == '1'
+        assert lean.echo('&term') == 'ansi'
+        lean_bytes = lean.stats.bytes_read
+    with open(env=env, stats=True) as default:
+        default.send_keys('ispam\033')
+        default_bytes = default.stats.bytes_read
+    assert lean_bytes < default_bytes
+
+
+def test_profile_invalid(env, tmpdir):
+    path = tmpdir.join('vim.log')
+    with pytest.raises(ValueError):
+        open(env=env, profile='invalid-profile', record=str(path))
+    assert not path.check()
+
+
+def test_spawn_failure(env):
+    logs = []
+    message_log = messages.MessageLog
+
+    def open_log(*args):
+        logs.append(message_log(*args))
+        return logs[-1]
+    with mock.patch('headlessvim.messages.MessageLog', open_log):
+        with mock.patch('headlessvim.process.Process', side_effect=OSError):
+            with pytest.raises(OSError):
+                open(env=env)
+    assert not os.path.exists(logs[0].path)
+
+
+def test_adaptive_timeout(env):
+    with open(env=env, adaptive_timeout=True) as vim:
+        adaptive = vim.adaptive_timeout
+        assert adaptive.maximum == vim.timeout
+        for i in range(10):
+            assert vim.echo(str(i)) == str(i)
+        assert adaptive.minimum <= adaptive.quiescence <= adaptive.maximum
+        assert adaptive.as_dict()['first_byte_samples'] > 0
+
+
+def test_adaptive_timeout_disabled(vim):
+    assert vim.adaptive_timeout is None
+
+
+def test_lazy_import():
+    code = ('import sys, headlessvim; '
+            'print(sorted(set(sys.modules) & set(sys.argv[1:])))')
+    modules = ['multiprocessing', 'headlessvim.batch', 'headlessvim.pool',
+               'headlessvim.monitor', 'headlessvim.server']
+    process = subprocess.Popen([sys.executable, '-c', code] + modules,
+                               stdout=subprocess.PIPE)
+    output = process.communicate()[0]
+    assert output.strip() == b'[]'
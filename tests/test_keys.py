@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import struct
+
+import pytest
+
+import headlessvim
+from headlessvim import keys
+
+
+@pytest.yield_fixture
+def clear(request):
+    keys.clear()
+    yield
+    keys.clear()
+
+
+@pytest.mark.parametrize('notation, data', [
+    ('spam', b'spam'),
+    ('<Esc>', b'\x1b'),
+    ('<CR><Enter><Return><NL>', b'\r\r\r\n'),
+    ('<lt>Esc><Bar><Bslash><Space><Tab>', b'<Esc>|\\ \t'),
+    ('<C-w>j<c-W>', b'\x17j\x17'),
+    ('<C-[><C-Space><C-?>', b'\x1b\x00\x7f'),
+    ('<M-x><A-x><C-M-a>', b'\x1bx\x1bx\x1b\x01'),
+    ('<S-a>', b'A'),
+    ('<spam><1><C-1><S-Esc>', b'<spam><1><C-1><S-Esc>'),
+    (u'<M-あ>', b'\x1b' + u'あ'.encode('utf-8')),
+])
+def test_compile(notation, data):
+    assert keys.compile(notation, 'xterm').data == data
+
+
+@pytest.mark.parametrize('notation, data', [
+    ('<Up><Down><Right><Left>', b'\x1bOA\x1bOB\x1bOC\x1bOD'),
+    ('<F1><F5><F12>', b'\x1bOP\x1b[15~\x1b[24~'),
+    ('<PageUp><PageDown><Del><S-Tab>', b'\x1b[5~\x1b[6~\x1b[3~\x1b[Z'),
+])
+def test_compile_special_keys(notation, data, clear):
+    assert keys.compile(notation, 'no-such-terminal').data == data
+
+
+def test_compile_cache(clear):
+    macro = keys.compile('<Esc>', 'xterm')
+    assert keys.compile('<Esc>', 'xterm') is macro
+    assert keys.compile(macro) is macro
+    assert keys.compile('<Esc>', 'vt100') is not macro
+
+
+def test_terminal_keys(clear, monkeypatch):
+    def read_terminfo(term):
+        return {'up': b'\x1b[A', 'bs': b'\x08'}
+    monkeypatch.setattr(keys, '_read_terminfo', read_terminfo)
+    assert keys.compile('<Up><BS><Down>', 'spam').data == b'\x1b[A\x08\x1bOB'
+
+
+def test_parse_terminfo():
+    table = b'\x1b[A\x00'
+    offsets = [-1] * 88
+    offsets[87] = 0
+    data = (struct.pack('<6h', 0o432, 5, 1, 1, 88, len(table)) +
+            b'spam\x00' + b'\x00' + b'\x00\x00' +
+            struct.pack('<88h', *offsets) + table)
+    assert keys._parse_terminfo(data) == {'up': b'\x1b[A'}
+    with pytest.raises(ValueError):
+        keys._parse_terminfo(b'\x00' * 12)
+
+
+def test_key_macro():
+    macro = keys.compile('dd', 'xterm') * 2 + '<CR>'
+    assert macro.notation == 'dddd<CR>'
+    assert macro.data == b'dddd\r'
+    assert macro.term == 'xterm'
+    assert len(macro) == 5
+    assert macro == keys.compile('dddd\r', 'xterm')
+    assert 2 * keys.compile('x') == keys.compile('xx')
+
+
+def test_feed(vim):
+    vim.feed('ispam<CR>ham<Esc>')
+    vim.feed(vim.compile_keys('<Up>0x') * 2)
+    assert vim.echo('getline(1, 2)') == "['am', 'ham']"
+
+
+def test_compile_keys(vim):
+    macro = vim.compile_keys('<Esc>')
+    assert isinstance(macro, headlessvim.KeyMacro)
+    assert macro.data == b'\x1b'
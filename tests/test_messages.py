@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+
+import pytest
+
+import headlessvim
+from headlessvim.messages import Message, MessageLog, VimError
+
+
+@pytest.fixture
+def vim(request, vim):
+    if vim.echo("exists('##SafeState')") != '1':
+        pytest.skip('SafeState is not supported')
+    return vim
+
+
+@pytest.yield_fixture
+def log(request):
+    log = MessageLog()
+    yield log
+    log.close()
+
+
+def test_message_log(log):
+    with open(log.path, 'wb') as f:
+        f.write(b'{"kind": "message", "text": "spam"}\n{"kind": "err')
+    assert log.messages() == [Message(1, 'message', 'spam')]
+    with open(log.path, 'ab') as f:
+        f.write(b'or", "text": "ham"}\n')
+    assert log.messages(1) == [Message(2, 'error', 'ham')]
+    assert log.errors() == [Message(2, 'error', 'ham')]
+    assert log.sequence == 2
+
+
+def test_message_log_empty(log):
+    assert log.messages() == []
+    log.close()
+    assert not os.path.exists(os.path.dirname(log.path))
+
+
+def test_messages(vim):
+    vim.command('echomsg "spam"', False)
+    vim.command('echoerr "ham"', False)
+    vim.command('silent! nosuchcommand', False)
+    messages = vim.messages()
+    assert [(m.kind, m.text) for m in messages] == [
+        ('message', 'spam'),
+        ('error', 'ham'),
+        ('error', 'E492: Not an editor command: nosuchcommand'),
+    ]
+    assert [m.sequence for m in messages] == [1, 2, 3]
+    assert vim.messages(2) == messages[2:]
+    assert vim.errors() == messages[1:]
+
+
+def test_messages_capture(vim):
+    assert vim.command('nosuchcommand') == \
+        'E492: Not an editor command: nosuchcommand'
+    assert len(vim.errors()) == 1
+
+
+def test_raise_on_error(vim, env):
+    vim = headlessvim.open(env=env, raise_on_error=True)
+    try:
+        vim.command('echomsg "spam"', False)
+        with pytest.raises(VimError) as e:
+            vim.command('nosuchcommand', False)
+        assert [error.text for error in e.value.errors] == \
+            ['E492: Not an editor command: nosuchcommand']
+        vim.command('echomsg "ham"', False)
+    finally:
+        vim.close()
+
+
+def test_exception(vim):
+    assert vim.command('throw "spam"').endswith(
+        'E605: Exception not caught: spam')
+    assert [(m.kind, m.text) for m in vim.errors()] == [('exception', 'spam')]
+
+
+def test_arguments_end(env, tmpdir):
+    path = str(tmpdir.join('spam.txt'))
+    vim = headlessvim.open(env=env, args=headlessvim.Vim.default_args +
+                           ' -- ' + path)
+    try:
+        assert vim.echo('argv()') == "['{0}']".format(path)
+        vim.command('echomsg "spam"', False)
+        assert [m.text for m in vim.messages()] == ['spam']
+    finally:
+        vim.close()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+import time
+
+import pytest
+
+import headlessvim
+from headlessvim.monitor import Monitor, Usage, read_usage
+
+
+pytestmark = pytest.mark.skipif(not os.path.isdir('/proc/self'),
+                                reason='/proc is not available')
+
+
+def test_read_usage():
+    usage = read_usage(os.getpid())
+    assert usage.rss > 0
+    assert usage.peak_rss >= usage.rss
+    assert usage.cpu_time > 0
+    assert usage.fds >= 3
+
+
+def test_read_usage_not_found():
+    with pytest.raises(EnvironmentError):
+        read_usage(2 ** 22 + 1)
+
+
+def test_resource_usage(env):
+    with headlessvim.open(env=env) as vim:
+        assert vim.monitor is None
+        assert vim.pid != os.getpid()
+        usage = vim.resource_usage()
+        assert isinstance(usage, Usage)
+        assert usage.rss > 0
+
+
+def test_monitor(env):
+    monitor = Monitor(interval=0.01, maxlen=100)
+    vim = headlessvim.open(env=env, monitor=monitor)
+    try:
+        vim.command('let g:spam = repeat("x", 1 << 20)', False)
+        time.sleep(0.1)
+    finally:
+        vim.close()
+    samples = monitor.samples
+    count = len(samples)
+    assert count >= 2
+    assert samples == sorted(samples, key=lambda usage: usage.time)
+    assert samples[-1].rss > samples[0].rss
+    assert [value for _, value in monitor.series('fds')] == \
+        [usage.fds for usage in samples]
+    assert len(monitor.as_dict()['rss']) == count
+    time.sleep(0.05)
+    assert len(monitor.samples) == count
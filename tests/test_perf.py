@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import json
+
+import pytest
+
+from headlessvim import perf
+
+
+@pytest.fixture
+def output(request, tmpdir):
+    return str(tmpdir.join('perf.json'))
+
+
+@pytest.mark.parametrize('name', sorted(perf.GENERATORS))
+def test_generators(name):
+    generator = perf.GENERATORS[name]
+    assert len(generator(1000)) == 1000
+    assert generator(100) == generator(100)
+
+
+@pytest.mark.parametrize('complexity, function', perf.COMPLEXITIES)
+def test_fit(complexity, function):
+    sizes = [1000, 10000, 100000]
+    times = [function(size) / function(sizes[-1]) for size in sizes]
+    assert perf.fit(sizes, times)[0] == complexity
+
+
+def test_fit_exponent():
+    _, exponent = perf.fit([10, 100, 1000], [0.01, 1.0, 100.0])
+    assert exponent == pytest.approx(2.0)
+
+
+def test_fit_single_line():
+    complexity, exponent = perf.fit([1, 1], [0.001, 0.002])
+    assert complexity in dict(perf.COMPLEXITIES)
+    assert exponent == 0.0
+
+
+def test_scale():
+    scaling = perf.scale('%s/spam/ham/ge', sizes=[2e3, 1e3], repeat=2)
+    assert scaling.command == '%s/spam/ham/ge'
+    assert [point.size for point in scaling.points] == [1000, 2000]
+    assert scaling.points[0].summary['count'] == 2
+    assert scaling.as_dict()['complexity'] == scaling.complexity
+
+
+def test_scale_buffer():
+    def generator(size):
+        return ['spam'] * size
+    scaling = perf.scale('if line("$") != 100 || getline(1) !=# "spam" | '
+                         'throw "unexpected" | endif',
+                         sizes=[100], generator=generator, repeat=1)
+    assert len(scaling.points) == 1
+
+
+def test_scale_unknown_generator():
+    with pytest.raises(ValueError):
+        perf.scale('echo', generator='unknown')
+
+
+def test_scale_error():
+    with pytest.raises(RuntimeError):
+        perf.scale('nosuchcommand', sizes=[10], repeat=1)
+
+
+def test_main(output):
+    assert perf.main(['-s', '10,20', '-n', '1', '-g', 'code',
+                      '-o', output, 'normal! G']) == 0
+    with open(output) as f:
+        result = json.load(f)
+    assert [point['size'] for point in result['points']] == [10, 20]
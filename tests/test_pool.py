@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from headlessvim import Pool, Vim
+
+
+@pytest.yield_fixture
+def pool(request, env):
+    pool = Pool(size=1, env=env)
+    yield pool
+    pool.close()
+
+
+def test_acquire(pool):
+    vim = pool.acquire()
+    assert isinstance(vim, Vim)
+    assert vim.is_alive()
+    vim.close()
+
+
+def test_release_reuse(pool):
+    vim = pool.acquire()
+    pool.release(vim)
+    assert pool.idle == 1
+    assert pool.acquire() is vim
+    assert pool.idle == 0
+    vim.close()
+
+
+def test_release_full(pool):
+    vims = [pool.acquire(), pool.acquire()]
+    for vim in vims:
+        pool.release(vim)
+    assert pool.idle == 1
+    assert not vims[1].is_alive()
+    vims[0].close()
+
+
+def test_release_reset(pool):
+    vim = pool.acquire()
+    vim.send_keys('ispam\033')
+    pool.release(vim)
+    vim = pool.acquire()
+    assert vim.display_lines()[0].strip() == ''
+    vim.close()
+
+
+def test_release_dead(pool):
+    vim = pool.acquire()
+    vim.close()
+    pool.release(vim)
+    assert pool.idle == 0
+
+
+def test_release_crashed(pool):
+    vim = pool.acquire()
+    os.kill(vim.pid, signal.SIGKILL)
+    while vim.is_alive():
+        time.sleep(0.01)
+    pool.release(vim)
+    assert pool.idle == 0
+    assert vim._tempfile.closed
+    assert not os.path.exists(vim._messages.path)
+
+
+def test_acquire_crashed(pool):
+    vim = pool.acquire()
+    pool.release(vim)
+    os.kill(vim.pid, signal.SIGKILL)
+    while vim.is_alive():
+        time.sleep(0.01)
+    other = pool.acquire()
+    assert other is not vim
+    assert vim._tempfile.closed
+    other.close()
+
+
+def test_fill(pool):
+    pool.fill()
+    assert pool.idle == pool.size
+
+
+def test_vim(pool):
+    with pool.vim() as vim:
+        assert vim.echo('0') == '0'
+    assert pool.idle == 1
+
+
+def test_close(pool):
+    vim = pool.acquire()
+    pool.close()
+    pool.release(vim)
+    assert not vim.is_alive()
+    with pytest.raises(ValueError):
+        pool.acquire()
+
+
+def test_limit(env):
+    pool = Pool(size=1, limit=1, env=env)
+    try:
+        vim = pool.acquire()
+        taken = []
+        thread = threading.Thread(target=lambda: taken.append(pool.acquire()))
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive()
+        assert pool.acquired == 1
+        pool.release(vim)
+        thread.join(10)
+        assert taken == [vim]
+        pool.release(vim)
+        assert pool.acquired == 0
+    finally:
+        pool.close()
+
+
+def test_limit_close(env):
+    pool = Pool(size=1, limit=1, env=env)
+    vim = pool.acquire()
+    errors = []
+
+    def acquire():
+        try:
+            pool.acquire()
+        except ValueError as e:
+            errors.append(e)
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    pool.close()
+    thread.join(10)
+    assert len(errors) == 1
+    pool.release(vim)
+    assert not vim.is_alive()
@@ -1,11 +1,16 @@
 #!/usr/bin/env python
 # -*- coding:utf-8 -*-
 
+import fcntl
 import os
+import struct
+import termios
 
 import pytest
 
-from headlessvim.process import Process
+from headlessvim import process as process_module
+from headlessvim.process import Process, find_executable
+from headlessvim.stats import Stats
 
 
 @pytest.fixture
@@ -13,11 +18,6 @@ def default_args(request):
     return '-N -i NONE -n -u NONE'
 
 
-@pytest.fixture
-def env(request):
-    return dict(os.environ, LANG='C')
-
-
 @pytest.fixture
 def unterminated_process(request, default_args, env):
     return Process('vim', default_args, env)
@@ -53,9 +53,78 @@ def test_args(process, default_args):
     assert process.args == default_args
 
 
+def test_find_executable(monkeypatch):
+    calls = []
+
+    def which(name):
+        calls.append(name)
+        return '/usr/bin/' + name
+    monkeypatch.setattr(process_module, '_EXECUTABLES', {})
+    monkeypatch.setattr(process_module, '_which', which)
+    monkeypatch.setenv('PATH', '/usr/bin')
+    assert find_executable('vim') == '/usr/bin/vim'
+    assert find_executable('vim') == '/usr/bin/vim'
+    assert calls == ['vim']
+    monkeypatch.setenv('PATH', '/usr/local/bin:/usr/bin')
+    find_executable('vim')
+    assert calls == ['vim', 'vim']
+
+
+def test_find_executable_not_found():
+    assert find_executable('headlessvim-not-found') is None
+
+
+@pytest.mark.parametrize('posix_spawn', [True, False])
+def test_spawn(monkeypatch, default_args, env, posix_spawn):
+    if not posix_spawn:
+        monkeypatch.setattr(process_module, '_posix_spawn', None)
+    elif process_module._posix_spawn is None:
+        pytest.skip('os.posix_spawn is not available')
+    process = Process('vim', default_args, env)
+    assert process.is_alive()
+    # a session leader controlled by the terminal
+    assert os.getsid(process.pid) == process.pid
+    assert os.tcgetpgrp(process.stdout.fileno()) == process.pid
+    process.terminate()
+    assert not process.is_alive()
+
+
 def test_stdin(process):
     assert hasattr(process.stdin, 'read')
 
 
 def test_stdout(process):
     assert hasattr(process.stdout, 'write')
+
+
+def test_stats(default_args, env):
+    stats = Stats()
+    process = Process('vim', default_args, env, stats)
+    try:
+        assert stats.spawn_time > 0
+        process.check_readable(0)
+        assert stats.selects == 1
+    finally:
+        process.terminate()
+
+
+def get_window_size(process):
+    winsize = fcntl.ioctl(process.stdout.fileno(), termios.TIOCGWINSZ,
+                          b'\0' * 8)
+    lines, columns, _, _ = struct.unpack('HHHH', winsize)
+    return (columns, lines)
+
+
+def test_window_size(default_args, env):
+    process = Process('vim', default_args, env, size=(100, 30))
+    try:
+        assert process.window_size == (100, 30)
+        assert get_window_size(process) == (100, 30)
+    finally:
+        process.terminate()
+
+
+def test_set_window_size(process):
+    process.set_window_size((120, 40))
+    assert process.window_size == (120, 40)
+    assert get_window_size(process) == (120, 40)
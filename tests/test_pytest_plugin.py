@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from headlessvim.pytest_plugin import pool_size
+
+pytest_plugins = 'pytester'
+
+
+@pytest.fixture
+def plugin_args(request):
+    return ['-p', 'headlessvim.pytest_plugin', '-p', 'no:cacheprovider']
+
+
+@pytest.mark.parametrize('concurrency, workers, sizes', [
+    (0, 1, [1]),
+    (0, 4, [1, 1, 1, 1]),
+    (8, 4, [2, 2, 2, 2]),
+    (2, 4, [1, 1, 0, 0]),
+    (5, 2, [3, 2]),
+])
+def test_pool_size(concurrency, workers, sizes):
+    assert [pool_size(concurrency, workers, worker)
+            for worker in range(workers)] == sizes
+
+
+def test_vim_fixture(testdir, plugin_args):
+    testdir.makepyfile('''
+        def test_first(vim):
+            vim.command('call setline(1, "spam")', False)
+            assert vim.echo('getline(1)') == 'spam'
+
+        def test_second(vim, vim_pool):
+            assert vim.echo('getline(1)') == ''
+            assert vim_pool.idle == 0
+    ''')
+    result = testdir.runpytest(*plugin_args)
+    result.assert_outcomes(passed=2)
+
+
+def test_vim_factory(testdir, plugin_args):
+    testdir.makepyfile('''
+        def test_factory(vim_factory):
+            vim = vim_factory()
+            other = vim_factory(timeout=0.5)
+            assert vim is not other
+            assert other.timeout == 0.5
+    ''')
+    result = testdir.runpytest(*plugin_args)
+    result.assert_outcomes(passed=1)
+
+
+def test_overhead_report(testdir, plugin_args):
+    testdir.makepyfile('''
+        def test_spam(vim):
+            pass
+    ''')
+    result = testdir.runpytest('--vim-overhead', '5', *plugin_args)
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(['*headlessvim overhead*',
+                                 '*s *test_overhead_report.py::test_spam'])
+
+
+def test_trace_section(testdir, plugin_args):
+    testdir.makepyfile('''
+        def test_spam(vim):
+            vim.command('let g:spam = 1', False)
+            assert False
+    ''')
+    result = testdir.runpytest(*plugin_args)
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(['*headlessvim trace*',
+                                 "*command 'let g:spam = 1'"])
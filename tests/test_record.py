@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import io
+
+import pytest
+
+from headlessvim import open, replay
+from headlessvim.record import READ, RESIZE, WRITE, Recorder, Replay
+
+
+@pytest.fixture
+def log(request):
+    f = io.BytesIO()
+    recorder = Recorder(f, (10, 3), 'utf-8')
+    recorder.read(b'spam')
+    recorder.write(b'ham')
+    recorder.read(b'\r\n\xe3\x81')
+    recorder.read(b'\x82')
+    recorder.resize((20, 4))
+    recorder.close()
+    f.seek(0)
+    return f
+
+
+@pytest.fixture
+def log_replay(request, log):
+    return Replay(log)
+
+
+def test_records(log_replay):
+    kinds = [record.kind for record in log_replay.records]
+    assert kinds == [READ, WRITE, READ, READ, RESIZE]
+    times = [record.time for record in log_replay.records]
+    assert times == sorted(times)
+
+
+def test_header(log_replay):
+    assert log_replay.size == (10, 3)
+    assert log_replay.encoding == 'utf-8'
+
+
+def test_len(log_replay):
+    assert len(log_replay) == 3
+
+
+def test_seek(log_replay):
+    assert log_replay.display_lines()[0].strip() == ''
+    log_replay.seek(1)
+    assert log_replay.display_lines()[0].strip() == 'spam'
+    log_replay.seek(-1)
+    assert log_replay.display_lines()[1].strip() == u'あ'
+    log_replay.seek(0)
+    assert log_replay.frame == 0
+    assert log_replay.display_lines()[0].strip() == ''
+
+
+def test_seek_out_of_range(log_replay):
+    with pytest.raises(IndexError):
+        log_replay.seek(4)
+
+
+def test_play(log_replay):
+    assert list(log_replay.play()) == [1, 2, 3]
+    assert log_replay.frame == 3
+
+
+def test_play_speed(log_replay):
+    assert list(log_replay.play(speed=1000.0)) == [1, 2, 3]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Replay(io.BytesIO(b'spam'))
+
+
+def test_record_vim(env, tmpdir):
+    path = str(tmpdir.join('vim.log'))
+    with open(env=env, record=path) as vim:
+        vim.command('call setline(1, "spam")', False)
+        vim.screen_size = (100, 30)
+        vim.command('redraw!', False)
+        expected = vim.display_lines()
+    log_replay = replay(path)
+    log_replay.seek(len(log_replay))
+    assert log_replay.display_lines() == expected
+    assert any(record.kind == RESIZE for record in log_replay.records)
+
+
+def test_record_events(env, tmpdir):
+    path = str(tmpdir.join('vim.log'))
+    with open(env=env, record=path) as vim:
+        vim.events(['BufEnter'])
+        vim.command('for i in range(3000) | doautocmd BufEnter | endfor',
+                    False)
+    reads = [record for record in replay(path).records
+             if record.kind == READ]
+    assert reads
+    assert all(record.data for record in reads)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from headlessvim.runner import Outcome, Report
+
+
+SOURCE = '''
+let g:log = []
+function! SetUp()
+  call add(g:log, 'SetUp')
+endfunction
+function! TearDown()
+  call add(g:log, 'TearDown')
+endfunction
+function! Test_pass()
+  for i in range(100)
+    call assert_equal(i, i)
+  endfor
+endfunction
+function! Test_fail()
+  call assert_equal(1, 2)
+  call assert_true(0)
+endfunction
+function! Test_throw()
+  throw 'spam'
+endfunction
+function! Helper()
+endfunction
+'''
+
+
+def test_run_script(vim):
+    report = vim.run_script(SOURCE)
+    names = [outcome.name for outcome in report.outcomes]
+    assert names == ['Test_fail', 'Test_pass', 'Test_throw']
+    assert not report.passed
+    fail, passed, thrown = report.outcomes
+    assert len(fail.errors) == 2
+    assert 'Expected 1 but got 2' in fail.errors[0]
+    assert passed.errors == []
+    assert thrown.errors[0].endswith('spam')
+    assert report.failures == [fail, thrown]
+    assert all(outcome.time >= 0 for outcome in report.outcomes)
+    assert report.time >= sum(outcome.time for outcome in report.outcomes)
+    assert vim.echo('len(g:log)') == '6'
+    assert vim.echo('v:errors') == '[]'
+
+
+def test_run_script_path(vim, tmpdir):
+    path = tmpdir.join('test_spam.vim')
+    path.write(SOURCE)
+    report = vim.run_script(str(path), pattern='^Test_pass$')
+    assert report.passed
+    assert [outcome.name for outcome in report.outcomes] == ['Test_pass']
+
+
+def test_run_script_error(vim):
+    with pytest.raises(RuntimeError):
+        vim.run_script('call nosuchfunction()')
+
+
+def test_run_script_timeout(vim):
+    with pytest.raises(RuntimeError):
+        vim.run_script('function! Test_spam()\n'
+                       '  call getchar()\n'
+                       'endfunction\n', timeout=1.0)
+    assert vim.echo('"alive"') == 'alive'
+
+
+def test_report():
+    report = Report([Outcome('Test_spam', [], 0.5)], 1.0)
+    assert report.passed
+    assert report.as_dict() == {
+        'tests': [{'name': 'Test_spam', 'errors': [], 'time': 0.5}],
+        'time': 1.0,
+    }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pyte
+import pytest
+
+from headlessvim import screen
+
+
+@pytest.fixture
+def pyte_screen(request):
+    pyte_screen = pyte.Screen(4, 2)
+    stream = pyte.Stream()
+    stream.attach(pyte_screen)
+    stream.feed(u'\033[1;31mab\033[0m\033[7;44mc\033[0m\r\nあ')
+    return pyte_screen
+
+
+def test_to_array(pyte_screen):
+    array = screen.to_array(pyte_screen, use_numpy=False)
+    assert array.size == (4, 2)
+    assert array.cursor == (1, 1)
+    assert list(array.chars) == [ord(c) for c in u'abc あ   ']
+    red = screen.COLORS.index('red')
+    blue = screen.COLORS.index('blue')
+    assert list(array.fg[:4]) == [red, red, 0, 0]
+    assert list(array.bg[:4]) == [0, 0, blue, 0]
+    assert list(array.attrs[:4]) == [screen.BOLD, screen.BOLD,
+                                     screen.REVERSE, 0]
+
+
+def test_to_array_numpy(pyte_screen):
+    numpy = pytest.importorskip('numpy')
+    array = screen.to_array(pyte_screen, use_numpy=True)
+    assert array.chars.shape == (2, 4)
+    assert array.chars[0, 0] == ord('a')
+    assert numpy.count_nonzero(array.attrs) == 3
+
+
+def test_to_array_numpy_unavailable(pyte_screen, monkeypatch):
+    monkeypatch.setattr(screen, 'numpy', None)
+    with pytest.raises(ImportError):
+        screen.to_array(pyte_screen, use_numpy=True)
+    assert screen.to_array(pyte_screen).chars[0] == ord('a')
+
+
+@pytest.fixture
+def cached_screen(request):
+    return screen.Screen(4, 3)
+
+
+@pytest.fixture
+def stream(request, cached_screen):
+    stream = pyte.Stream()
+    stream.attach(cached_screen)
+    return stream
+
+
+def test_screen_display(cached_screen, stream):
+    stream.feed(u'ab\r\ncd')
+    assert cached_screen.display == [u'ab  ', u'cd  ', u'    ']
+    assert not cached_screen.dirty
+    stream.feed(u'\r\n\033[2Jx')
+    assert cached_screen.display[0] == u'    '
+
+
+def test_screen_line_hashes(cached_screen, stream):
+    hashes = cached_screen.line_hashes()
+    assert hashes == [screen.line_hash(u'    ')] * 3
+    stream.feed(u'ab')
+    assert cached_screen.line_hashes()[0] == screen.line_hash(u'ab  ')
+    assert cached_screen.line_hashes()[1:] == hashes[1:]
+
+
+def test_screen_fingerprint(cached_screen, stream):
+    blank = cached_screen.fingerprint()
+    stream.feed(u'ab')
+    changed = cached_screen.fingerprint()
+    assert changed != blank
+    assert changed == screen.fingerprint(
+        [screen.line_hash(line) for line in cached_screen.display])
+    stream.feed(u'\r\033[K')
+    assert cached_screen.fingerprint() == blank
+
+
+def test_screen_resize(cached_screen, stream):
+    cached_screen.display
+    cached_screen.resize(5, 6)
+    assert cached_screen.display == [u' ' * 6] * 5
+
+
+def test_screen_line(cached_screen, stream):
+    cached_screen.display
+    stream.feed(u'ab\r\ncd')
+    assert cached_screen.line(1) == u'cd  '
+    assert cached_screen.dirty == set([0])
+    assert cached_screen.line(-3) == u'ab  '
+    with pytest.raises(IndexError):
+        cached_screen.line(3)
+
+
+def test_screen_region(cached_screen, stream):
+    stream.feed(u'abcd\r\nefgh\r\nijkl')
+    assert cached_screen.region(0, 1, 2, 3) == [u'bc', u'fg']
+    assert cached_screen.region(1, 2, 10, 10) == [u'gh', u'kl']
+
+
+def test_screen_find(cached_screen, stream):
+    stream.feed(u'ab a\r\nxa')
+    assert cached_screen.find(u'a') == [(0, 0, u'a'), (0, 3, u'a'),
+                                        (1, 1, u'a')]
+    assert cached_screen.find(u'z') == []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import threading
+
+import pytest
+
+from headlessvim.__main__ import main
+from headlessvim.server import Client, RemoteVim, Server, ServerError
+
+
+@pytest.fixture
+def path(request, tmpdir):
+    return str(tmpdir.join('headlessvim.sock'))
+
+
+@pytest.yield_fixture
+def server(request, path, env):
+    server = Server(path, 1, env=env)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.yield_fixture
+def client(request, server, path):
+    client = Client(path)
+    yield client
+    client.close()
+
+
+def test_open(client):
+    vim = client.open()
+    assert isinstance(vim, RemoteVim)
+    vim.close()
+
+
+def test_command(client):
+    with client.open() as vim:
+        assert vim.command('echo "spam"') == 'spam'
+        assert vim.command('let g:spam = 1', False) is None
+        assert vim.eval('g:spam') == '1'
+
+
+def test_display(client):
+    with client.open() as vim:
+        vim.send_keys(':call setline(1, "spam")\n')
+        assert 'spam' in vim.display_lines()[0]
+        assert len(vim.display().splitlines()) == 24
+
+
+def test_reuse(client, server):
+    with client.open() as vim:
+        vim.command('call setline(1, "spam")', False)
+    assert server.pool.idle == 1
+    with client.open() as vim:
+        assert vim.eval('getline(1)') == ''
+
+
+def test_unknown_method(client):
+    with client.open() as vim:
+        with pytest.raises(ServerError) as e:
+            client.call('spam', session=vim.session)
+        assert e.value.type == 'ValueError'
+
+
+def test_unknown_session(client):
+    with pytest.raises(ServerError):
+        client.call('eval', session=42, expr='0')
+
+
+def test_disconnect(server, path):
+    client = Client(path)
+    client.open()
+    client.close()
+    with Client(path) as client:
+        with client.open() as vim:
+            assert vim.eval('0') == '0'
+
+
+def test_main_usage():
+    assert main([]) == 2
+    assert main(['spam']) == 2
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import json
+import os
+
+import pytest
+
+from headlessvim.snapshot import SnapshotMismatch, Snapshots
+
+
+@pytest.fixture
+def directory(request, tmpdir):
+    return str(tmpdir.join('snapshots'))
+
+
+@pytest.fixture
+def snapshots(request, directory):
+    return Snapshots(directory, update=False)
+
+
+@pytest.fixture
+def vim(request, vim):
+    vim.command('call setline(1, "spam")', False)
+    vim.command('redraw!', False)
+    return vim
+
+
+def test_save_and_match(snapshots, vim):
+    snapshots.assert_match(vim, 'spam')
+    assert os.path.exists(snapshots.path('spam'))
+    snapshots.assert_match(vim, 'spam')
+
+
+def test_file_format(snapshots, vim):
+    snapshots.save(vim, 'spam')
+    with open(snapshots.path('spam')) as f:
+        data = json.load(f)
+    assert data['size'] == [80, 24]
+    assert data['lines'] == vim.display_lines()
+
+
+def test_mismatch(snapshots, vim):
+    snapshots.save(vim, 'spam')
+    vim.command('call setline(1, "ham")', False)
+    vim.command('redraw!', False)
+    with pytest.raises(SnapshotMismatch) as e:
+        snapshots.assert_match(vim, 'spam')
+    assert e.value.rows == [0]
+    assert '- spam' in str(e.value)
+    assert '+ ham' in str(e.value)
+
+
+def test_update(directory, snapshots, vim):
+    snapshots.save(vim, 'spam')
+    vim.command('call setline(1, "ham")', False)
+    vim.command('redraw!', False)
+    Snapshots(directory, update=True).assert_match(vim, 'spam')
+    Snapshots(directory, update=False).assert_match(vim, 'spam')
+
+
+def test_load_missing(snapshots):
+    assert snapshots.load('missing') is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+
+def test_state_options(vim):
+    vim.command('set shiftwidth=4 | setlocal filetype=vim', False)
+    state = vim.state(options=['shiftwidth', 'filetype', 'nosuchoption'],
+                      variables=None, registers=False, layout=False)
+    assert state['options'] == {
+        'shiftwidth': 4,
+        'filetype': 'vim',
+        'nosuchoption': None,
+    }
+    assert state['variables'] == {}
+    assert state['registers'] == {}
+    assert 'layout' not in state
+
+
+def test_state_variables(vim):
+    vim.command('let g:spam = [1, "ham"] | let g:Egg = function("tr") | '
+                'let b:bacon = {"x": 1.5}', False)
+    state = vim.state(variables=['g:', 'b:'], registers=False, layout=False)
+    assert state['variables']['g:']['spam'] == [1, 'ham']
+    assert 'Egg' not in state['variables']['g:']
+    assert state['variables']['b:']['bacon'] == {'x': 1.5}
+
+
+def test_state_registers(vim):
+    vim.send_keys('ispam\033yy"ayiw')
+    registers = vim.state(registers=True, layout=False)['registers']
+    assert registers['0'] == {'value': 'spam\n', 'type': 'V'}
+    assert registers['a'] == {'value': 'spam', 'type': 'v'}
+    assert registers['.'] == {'value': 'spam', 'type': 'v'}
+    assert 'b' not in registers
+    assert list(vim.state(registers='a')['registers']) == ['a']
+
+
+def test_state_layout(vim):
+    vim.command('vsplit | tabnew', False)
+    layout = vim.state(registers=False)['layout']
+    assert [tab['tabnr'] for tab in layout['tabs']] == [1, 2]
+    assert len(layout['windows']) == 3
+    assert 'variables' not in layout['windows'][0]
+    assert layout['tree'] == ['leaf', layout['window']]
+    assert layout['tab'] == 2
+    assert layout['buffer'] == 2
+    assert layout['mode'] == 'n'
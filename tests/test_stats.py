@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import mock
+import pytest
+
+from headlessvim.stats import Histogram, Stats, measure
+
+
+@pytest.fixture
+def histogram(request):
+    return Histogram()
+
+
+@pytest.fixture
+def stats(request):
+    return Stats()
+
+
+def test_histogram_empty(histogram):
+    assert histogram.count == 0
+    assert histogram.mean is None
+    assert histogram.min is None
+    assert histogram.max is None
+
+
+def test_histogram_add(histogram):
+    histogram.add(0.0005)
+    histogram.add(0.2)
+    histogram.add(100)
+    assert histogram.count == 3
+    assert histogram.min == 0.0005
+    assert histogram.max == 100
+    counts = histogram.counts
+    assert counts[0] == 1
+    assert counts[Histogram.bounds.index(0.25)] == 1
+    assert counts[-1] == 1
+
+
+def test_histogram_reset(histogram):
+    histogram.add(1)
+    histogram.reset()
+    assert histogram.count == 0
+    assert sum(histogram.counts) == 0
+
+
+def test_record(stats):
+    stats.record('command', 0.5)
+    stats.record('command', 1.5)
+    assert stats.operations == ['command']
+    assert stats.histogram('command').count == 2
+    assert stats.histogram('command').mean == 1.0
+
+
+def test_hook(stats):
+    hook = mock.MagicMock()
+    stats.add_hook(hook)
+    stats.record('echo', 0.1)
+    hook.assert_called_once_with('echo', 0.1)
+    stats.remove_hook(hook)
+    stats.record('echo', 0.1)
+    assert hook.call_count == 1
+
+
+def test_measure(stats):
+    with measure(stats, 'spam'):
+        pass
+    assert stats.histogram('spam').count == 1
+
+
+def test_measure_none():
+    with measure(None, 'spam'):
+        pass
+
+
+def test_reset(stats):
+    stats.bytes_read = 10
+    stats.record('command', 0.1)
+    stats.reset()
+    assert stats.bytes_read == 0
+    assert stats.operations == []
+
+
+def test_as_dict(stats):
+    stats.record('command', 0.1)
+    d = stats.as_dict()
+    assert d['operations']['command']['count'] == 1
+    assert d['bytes_read'] == 0
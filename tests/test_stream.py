@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import time
+
+
+def test_stream_command(vim):
+    lines = vim.stream_command('for i in range(3) | echo i | endfor')
+    assert list(lines) == ['0', '1', '2']
+
+
+def test_stream_command_no_prompt(vim):
+    lines = list(vim.stream_command('for i in range(100) | echo i | endfor'))
+    assert len(lines) == 100
+    assert vim.echo('"spam"') == 'spam'
+
+
+def test_stream_command_shell(vim):
+    lines = vim.stream_command('echo spam; sleep 1; echo ham', shell=True)
+    start = time.time()
+    assert next(lines) == 'spam'
+    assert time.time() - start < 1
+    assert list(lines) == ['ham']
+
+
+def test_stream_command_cancel(vim):
+    lines = vim.stream_command('echo spam; sleep 30', shell=True)
+    start = time.time()
+    assert next(lines) == 'spam'
+    lines.close()
+    assert time.time() - start < 10
+    assert vim.echo('"ham"') == 'ham'
+
+
+def test_stream_command_error(vim):
+    assert list(vim.stream_command('nosuchcommand')) == []
+    # dismiss the hit-enter prompt
+    vim.echo('0')
+    assert 'E492' in vim.errors()[-1].text
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from headlessvim.syntax import Span
+
+
+@pytest.fixture
+def vim(request, vim):
+    vim.command('syntax on | setfiletype vim', False)
+    vim.send_keys('ilet g:spam = 1\n\n" ham\033')
+    return vim
+
+
+def test_syntax_spans(vim):
+    spans = vim.syntax_spans()
+    assert [line for line, _ in spans] == [1, 2, 3]
+    assert spans[0][1][0] == Span(1, 3, 'vimLet')
+    assert spans[1][1] == []
+    assert spans[2][1] == [Span(1, 5, 'vimLineComment')]
+
+
+def test_syntax_spans_range(vim):
+    assert vim.syntax_spans(start=3) == vim.syntax_spans()[2:]
+    assert vim.syntax_spans(start='.', end='.') == vim.syntax_spans()[2:]
+    assert vim.syntax_spans(start=1, end=1) == vim.syntax_spans()[:1]
+
+
+def test_syntax_spans_translate(vim):
+    spans = vim.syntax_spans(end=1, translate=True)
+    assert spans[0][1][0] == Span(1, 3, 'Statement')
+
+
+def test_syntax_spans_buffer(vim):
+    expected = vim.syntax_spans()
+    vim.command('new', False)
+    assert vim.syntax_spans(buffer=1) == expected
+    assert vim.echo("bufnr('%')") == '2'
+
+
+def test_syntax_spans_error(vim):
+    with pytest.raises(RuntimeError) as e:
+        vim.syntax_spans(buffer=99)
+    assert 'E86' in str(e.value)
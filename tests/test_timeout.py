@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from headlessvim.timeout import AdaptiveTimeout
+
+
+@pytest.fixture
+def adaptive(request):
+    return AdaptiveTimeout(minimum=0.01, maximum=1.0, percentile=0.5,
+                           factor=2.0, window=10, warmup=3)
+
+
+def test_warmup(adaptive):
+    assert adaptive.first_byte == 1.0
+    assert adaptive.quiescence == 1.0
+    adaptive.observe_gap(0.1)
+    adaptive.observe_gap(0.1)
+    assert adaptive.quiescence == 1.0
+    adaptive.observe_gap(0.1)
+    assert adaptive.quiescence == pytest.approx(0.2)
+
+
+def test_bounds(adaptive):
+    for _ in range(3):
+        adaptive.observe_gap(0.0001)
+        adaptive.observe_first_byte(10)
+    assert adaptive.quiescence == 0.01
+    assert adaptive.first_byte == 1.0
+
+
+def test_window(adaptive):
+    for _ in range(10):
+        adaptive.observe_first_byte(0.4)
+    for _ in range(10):
+        adaptive.observe_first_byte(0.1)
+    assert adaptive.first_byte == pytest.approx(0.2)
+
+
+def test_observe_timeout(adaptive):
+    for _ in range(3):
+        adaptive.observe_first_byte(0.01)
+    learned = adaptive.first_byte
+    for _ in range(10):
+        adaptive.observe_timeout()
+    assert adaptive.first_byte > learned
+
+
+def test_reset(adaptive):
+    for _ in range(3):
+        adaptive.observe_gap(0.1)
+    adaptive.reset()
+    assert adaptive.quiescence == 1.0
+    assert adaptive.as_dict()['gap_samples'] == 0
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'minimum': 0},
+    {'minimum': 2, 'maximum': 1},
+    {'percentile': 0},
+    {'percentile': 1.5},
+])
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        AdaptiveTimeout(**kwargs)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import os
+import signal
+import zlib
+
+import six
+
+import headlessvim
+from headlessvim import trace
+
+
+def test_record():
+    t = trace.Trace(maxlen=2)
+    t.record('command', text='spam')
+    t.record_keys(b'ham')
+    t.record('wait', duration=0.5, bytes_read=10)
+    assert len(t) == 2
+    keys, wait = t.entries
+    assert keys.operation == 'send_keys'
+    assert keys.size == 3
+    assert keys.digest == zlib.crc32(b'ham') & 0xffffffff
+    assert wait.duration == 0.5
+    assert wait.bytes_read == 10
+    assert t.maxlen == 2
+    t.clear()
+    assert t.entries == []
+
+
+def test_format():
+    t = trace.Trace()
+    t.record('command', text='spam')
+    t.record_keys(b'ham')
+    t.record('wait', duration=0.5, bytes_read=10)
+    lines = t.format().splitlines()
+    assert lines[0].endswith("command 'spam'")
+    assert lines[1].endswith('send_keys size=3 crc32={0:08x}'.format(
+        zlib.crc32(b'ham') & 0xffffffff))
+    assert lines[2].endswith('wait duration=0.500000 bytes_read=10')
+    assert t.as_dict()['entries'][0]['text'] == 'spam'
+
+
+def test_install_signal_handler():
+    t = trace.Trace()
+    t.record('command', text='spam')
+    output = six.StringIO()
+    previous = trace.install_signal_handler(signal.SIGUSR1, output)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+    assert "command 'spam'" in output.getvalue()
+
+
+def test_vim_trace(vim):
+    vim.send_keys('ispam\033')
+    vim.echo('1')
+    operations = [entry.operation for entry in vim.trace.entries]
+    assert operations[0] == 'spawn'
+    assert 'echo' in operations
+    keys = [entry for entry in vim.trace.entries
+            if entry.digest == zlib.crc32(b'ispam\033') & 0xffffffff]
+    assert keys[0].size == 6
+    waits = [entry for entry in vim.trace.entries
+             if entry.operation == 'wait']
+    assert sum(entry.bytes_read for entry in waits) > 0
+
+
+def test_vim_trace_disabled():
+    vim = headlessvim.open(trace=False)
+    try:
+        vim.echo('1')
+        assert vim.trace is None
+    finally:
+        vim.close()
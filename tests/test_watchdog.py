@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+
+import resource
+
+import pytest
+
+import headlessvim
+from headlessvim.watchdog import LimitExceeded, Operation, Watchdog
+
+
+@pytest.fixture
+def open_vim(request, env):
+    def open_vim(**kwargs):
+        vim = headlessvim.open(env=env, **kwargs)
+        request.addfinalizer(vim.close)
+        return vim
+    return open_vim
+
+
+def test_rlimits():
+    watchdog = Watchdog(cpu_time=10, address_space=1 << 30)
+    assert watchdog.rlimits() == [
+        (resource.RLIMIT_CPU, (10, 10)),
+        (resource.RLIMIT_AS, (1 << 30, 1 << 30)),
+    ]
+    assert Watchdog().rlimits() == []
+
+
+def test_operation_output_bytes():
+    operation = Operation(Watchdog(output_bytes=10))
+    operation.feed(10)
+    with pytest.raises(LimitExceeded) as e:
+        operation.feed(1)
+    assert e.value.reason == 'output_bytes'
+    assert operation.bytes_read == 11
+
+
+def test_operation_time():
+    operation = Operation(Watchdog(operation_time=0))
+    with pytest.raises(LimitExceeded) as e:
+        operation.feed(0)
+    assert e.value.reason == 'operation_time'
+
+
+def test_disabled(open_vim):
+    vim = open_vim()
+    assert vim.watchdog is None
+    assert open_vim(watchdog=True).watchdog.respawn is False
+
+
+def test_prompt(open_vim):
+    vim = open_vim(watchdog=True)
+    with pytest.raises(LimitExceeded) as e:
+        vim.command('echo "spam\\nham"', False)
+    assert e.value.reason == 'prompt'
+    assert not e.value.respawned
+    assert not vim.is_alive()
+
+
+def test_unresponsive_respawn(open_vim):
+    vim = open_vim(watchdog=Watchdog(respawn=True))
+    vim.command('while 1 | endwhile', False)
+    with pytest.raises(LimitExceeded) as e:
+        vim.echo('0')
+    assert e.value.reason == 'unresponsive'
+    assert e.value.respawned
+    assert vim.echo('"spam"') == 'spam'
+
+
+def test_operation_time_respawn(open_vim):
+    vim = open_vim(watchdog=Watchdog(operation_time=3, respawn=True))
+    with pytest.raises(LimitExceeded) as e:
+        vim.command('while 1 | redraw! | endwhile', False)
+    assert e.value.reason == 'operation_time'
+    assert vim.echo('"spam"') == 'spam'
+
+
+def test_output_bytes(open_vim):
+    vim = open_vim(watchdog=Watchdog(output_bytes=10000))
+    with pytest.raises(LimitExceeded) as e:
+        vim.command('for i in range(10000) | echo i | endfor', False)
+    assert e.value.reason == 'output_bytes'
+    assert not vim.is_alive()
+
+
+def test_cpu_time(open_vim):
+    vim = open_vim(watchdog=Watchdog(cpu_time=1))
+    vim.command('while 1 | endwhile', False)
+    with pytest.raises(LimitExceeded) as e:
+        vim.wait(2)
+    assert e.value.reason == 'exited'